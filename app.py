@@ -1,61 +1,81 @@
+import functools
+import logging
 import os
+import queue
+import time
 import numpy as np
-from PIL import Image
-import tensorflow as tf
-from tensorflow.keras.models import load_model
-from tensorflow.keras.preprocessing.image import img_to_array
-from tensorflow.keras.applications.mobilenet_v2 import preprocess_input
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify, make_response
 from flask_cors import CORS
+from src.config import Config
+from src.Component.serving_runtime import BackgroundLoader, load_serving_runtime
+from src.Component.image_preprocessing import IMAGE_SIZE, preprocess_image, scale_for_mobilenet
+from src.Component.prediction_cache import PredictionCache
+from src.Component.batch_upload import UploadTooLarge, expand_uploads, decode_batch
+from src.Component.metrics import (
+    CONTENT_TYPE, REGISTRY, REQUEST_LATENCY, REQUESTS, STAGE_LATENCY, UPLOAD_BYTES
+)
+from src.utils import format_prediction
 
 # Initialize Flask app
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
 # Constants
-MODEL_PATH = 'models/model.h5'
-IMAGE_SIZE = (150, 150)
-CLASSES = ['Cat', 'Dog']
+CONFIG = Config()
+SERVING_CONFIG = CONFIG['serving']
 
-# Global model variable
+# Global inference engine (traced and warmed-up model)
 model = None
+batcher = None
+cache = None
+
+def _install_runtime(runtime):
+    global model, batcher, cache
+    model, batcher, cache = runtime.engine, runtime.batcher, runtime.cache
+
+# TensorFlow is only imported by the loader, so importing this module is cheap
+loader = BackgroundLoader(load_serving_runtime, CONFIG, on_ready=_install_runtime)
 
 def load_classifier_model():
-    """Load the trained model from disk."""
-    global model
-    try:
-        model = load_model(MODEL_PATH)
-        print("Model loaded successfully.")
-    except Exception as e:
-        print(f"Error loading model: {e}")
-        model = None
+    """Load the trained model from disk and start the micro-batching worker (blocking)."""
+    loader.load()
 
-def preprocess_image(image):
-    """
-    Preprocess the image to match model requirements:
-    1. Resize to (150, 150)
-    2. Convert to array
-    3. Expand dimensions (batch size 1)
-    4. Apply MobileNetV2 preprocessing
-    """
-    # Resize
-    if image.mode != "RGB":
-        image = image.convert("RGB")
-    
-    image = image.resize(IMAGE_SIZE)
-    
-    # Convert to array
-    img_array = img_to_array(image)
-    
-    # Expand dims to make it (1, 150, 150, 3)
-    img_array = np.expand_dims(img_array, axis=0)
-    
-    # Preprocess
-    img_processed = preprocess_input(img_array)
-    
-    return img_processed
+def start_loading():
+    """Load the model on a background thread; the server answers /healthz and /readyz meanwhile."""
+    loader.start()
+
+@app.before_request
+def _start_loading_once():
+    # WSGI servers and `flask run` never reach __main__ below, so the first request each
+    # process serves starts the load; a no-op once it has started (serve.py loads up front)
+    start_loading()
+
+def not_ready():
+    """The response for model-backed endpoints while the model is loading or after it failed to load."""
+    g.outcome = 'not_ready'
+    if loader.state == 'failed':
+        return jsonify({'error': f"Model failed to load: {loader.error}"}), 500
+    return jsonify({'error': 'Model is loading, try again shortly'}), 503, {'Retry-After': '1'}
+
+# Status code -> outcome label for the request counter
+OUTCOMES = {200: 'ok', 400: 'bad_request', 413: 'bad_request', 429: 'busy', 503: 'busy'}
+
+def instrumented(endpoint):
+    """Record end-to-end latency and outcome of a view; views may set g.outcome to refine it."""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            g.outcome = None
+            response = make_response(view(*args, **kwargs))
+            REQUEST_LATENCY.labels(endpoint).observe(time.perf_counter() - started)
+            REQUESTS.labels(endpoint, g.outcome or OUTCOMES.get(response.status_code, 'error')).inc()
+            return response
+        return wrapper
+    return decorator
 
 @app.route('/predict', methods=['POST'])
+@instrumented('predict')
 def predict():
     if 'file' not in request.files:
         return jsonify({'error': 'No file part'}), 400
@@ -65,31 +85,130 @@ def predict():
     if file.filename == '':
         return jsonify({'error': 'No selected file'}), 400
     
-    if model is None:
-        return jsonify({'error': 'Model not loaded'}), 500
+    if model is None or batcher is None:
+        return not_ready()
 
+    stage = STAGE_LATENCY.time
     try:
-        image = Image.open(file.stream)
-        processed_image = preprocess_image(image)
+        with stage('read'):
+            data = file.read()
+        UPLOAD_BYTES.observe(len(data))
+
+        if cache is not None:
+            cache_key = PredictionCache.content_key(data)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                g.outcome = 'cache_hit'
+                return jsonify(cached)
+
+        processed_image = preprocess_image(data, stage_timer=stage)
         
-        prediction = model.predict(processed_image)
+        # One row of a micro-batch shared with concurrent requests
+        with stage('inference'):
+            prediction = batcher.predict(processed_image, timeout=SERVING_CONFIG['predict_timeout'])
         
         # Output is binary: < 0.5 is Class 0 (Cat), > 0.5 is Class 1 (Dog)
-        score = float(prediction[0][0])
-        predicted_class = CLASSES[1] if score > 0.5 else CLASSES[0]
-        confidence = score if score > 0.5 else 1 - score
-        
-        return jsonify({
-            'class': predicted_class,
-            'confidence': float(confidence),
-            'score': score
-        })
+        result = format_prediction(prediction[0])
+        if cache is not None:
+            cache.put(cache_key, result)
+        with stage('encode'):
+            return jsonify(result)
+
+    except queue.Full:
+        return jsonify({'error': 'Server busy, try again later'}), 503
+    except TimeoutError:
+        return jsonify({'error': 'Prediction timed out, try again later'}), 503
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/predict/batch', methods=['POST'])
+@instrumented('predict_batch')
+def predict_batch():
+    """
+    Classify many images in one request.
+
+    Accepts either several multipart files under `files` (or `file`) or a
+    single zip/tar archive of images. Results come back in input order;
+    files that fail to decode get an inline `error` instead of a prediction.
+    """
+    files = request.files.getlist('files') or request.files.getlist('file')
+    files = [f for f in files if f.filename != '']
+    if not files:
+        return jsonify({'error': 'No file part'}), 400
+
+    if model is None:
+        return not_ready()
+
+    max_files = SERVING_CONFIG['max_batch_files']
+    if len(files) > max_files:
+        return jsonify({'error': f"Too many files (max {max_files})"}), 413
+
+    try:
+        try:
+            entries = expand_uploads(
+                [(f.filename, f.read()) for f in files],
+                max_files=max_files,
+                max_bytes=SERVING_CONFIG['max_batch_mb'] * 2**20,
+            )
+        except UploadTooLarge as e:
+            return jsonify({'error': str(e)}), 413
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        for _, data in entries:
+            UPLOAD_BYTES.observe(len(data))
+
+        batch, ok_indices, errors = decode_batch(
+            entries, IMAGE_SIZE, max_workers=SERVING_CONFIG['decode_workers']
+        )
+
+        # Preprocess once over the whole stack, then run chunked forward passes
+        batch = scale_for_mobilenet(batch)
+        chunk = SERVING_CONFIG['batch_chunk_size']
+        scores = np.empty(len(batch), dtype=np.float32)
+        for start in range(0, len(batch), chunk):
+            scores[start:start + chunk] = model.predict(batch[start:start + chunk])[:, 0]
+
+        results = [None] * len(entries)
+        for row, i in enumerate(ok_indices):
+            results[i] = {'filename': entries[i][0], **format_prediction(scores[row])}
+        for i, err in errors.items():
+            results[i] = {'filename': entries[i][0], 'error': err}
+
+        return jsonify({'results': results, 'count': len(results), 'errors': len(errors)})
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/stats', methods=['GET'])
+def stats():
+    """Queue depth and achieved batch sizes of the micro-batcher, plus cache counters."""
+    if batcher is None:
+        return not_ready()
+    stats = {'batcher': batcher.stats()}
+    if cache is not None:
+        stats['cache'] = cache.stats()
+    return jsonify(stats)
+
+@app.route('/healthz', methods=['GET'])
+def healthz():
+    """Liveness: the process is up and serving HTTP, whatever the model's load state."""
+    return jsonify({'status': 'ok', 'model': loader.status()})
+
+@app.route('/readyz', methods=['GET'])
+def readyz():
+    """Readiness: 200 once the model is loaded and warmed up, 503 while loading or after a failed load."""
+    status = {**loader.status(), 'model_path': SERVING_CONFIG['model_path']}
+    return jsonify(status), 200 if loader.ready else 503
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus text exposition of per-stage latencies, request outcomes and model stats."""
+    return Response(REGISTRY.render(), content_type=CONTENT_TYPE)
+
 if __name__ == '__main__':
-    # Load model on startup
-    load_classifier_model()
+    logging.basicConfig(level=logging.INFO, format="[%(asctime)s] %(levelname)s - %(message)s")
+    # Start loading before the first request, only in the process that serves (not the debug reloader's parent)
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_loading()
     # Run app
     app.run(debug=True, host='0.0.0.0', port=5000)
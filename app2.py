@@ -1,9 +1,7 @@
 import streamlit as st
-import tensorflow as tf
-from tensorflow.keras.models import load_model
-from tensorflow.keras.preprocessing.image import img_to_array
-from tensorflow.keras.applications.mobilenet_v2 import preprocess_input
-import numpy as np
+from src.config import Config
+from src.Component.serving_runtime import BackgroundLoader
+from src.Component.image_preprocessing import preprocess_image
 from PIL import Image
 
 # Set page config
@@ -14,54 +12,39 @@ st.set_page_config(
 )
 
 # Constants
-MODEL_PATH = 'models/model.h5'
-IMAGE_SIZE = (150, 150)
+CONFIG = Config()
+MODEL_PATH = CONFIG['serving']['model_path']
 CLASSES = ['Cat', 'Dog']
 
+def _load_engine():
+    # TensorFlow is imported on the loader thread, not while the page first renders
+    from src.Component.inference_engine import load_inference_engine
+
+    return load_inference_engine(MODEL_PATH, CONFIG['inference'])
+
 @st.cache_resource
-def load_classifier_model():
-    """Load the trained model from disk."""
-    try:
-        model = load_model(MODEL_PATH)
-        return model
-    except Exception as e:
-        st.error(f"Error loading model: {e}")
-        return None
+def model_loader():
+    """Start loading the traced, warmed-up inference engine in the background, once per server."""
+    return BackgroundLoader(_load_engine).start()
 
-def preprocess_image(image):
-    """
-    Preprocess the image to match model requirements:
-    1. Resize to (150, 150)
-    2. Convert to array
-    3. Expand dimensions (batch size 1)
-    4. Apply MobileNetV2 preprocessing
-    """
-    # Resize
-    if image.mode != "RGB":
-        image = image.convert("RGB")
-    
-    image = image.resize(IMAGE_SIZE)
-    
-    # Convert to array
-    img_array = img_to_array(image)
-    
-    # Expand dims to make it (1, 150, 150, 3)
-    img_array = np.expand_dims(img_array, axis=0)
-    
-    # Preprocess
-    img_processed = preprocess_input(img_array)
-    
-    return img_processed
+def load_classifier_model():
+    """Wait for the background load; returns the engine, or None if it failed."""
+    loader = model_loader()
+    if not loader.ready:
+        with st.spinner("Loading model..."):
+            loader.wait()
+    if loader.state == 'failed':
+        st.error(f"Error loading model: {loader.error}")
+    return loader.result
 
 def main():
     st.title("🐱 Cat vs Dog Classifier 🐶")
     st.markdown("Upload an image to see if it's a **Cat** or a **Dog**!")
 
-    # Load model
-    with st.spinner("Loading model..."):
-        model = load_classifier_model()
-
-    if model is None:
+    # The model keeps loading while the page renders; it is only awaited on Predict
+    loader = model_loader()
+    if loader.state == 'failed':
+        st.error(f"Error loading model: {loader.error}")
         st.warning("Model could not be loaded. Please check if 'models/model.h5' exists.")
         return
 
@@ -76,9 +59,12 @@ def main():
             
             # Predict button
             if st.button('Predict'):
+                model = load_classifier_model()
+                if model is None:
+                    return
                 with st.spinner('Analyzing...'):
                     # Preprocess
-                    processed_image = preprocess_image(image)
+                    processed_image = preprocess_image(uploaded_file.getvalue())
                     
                     # Predict
                     prediction = model.predict(processed_image)
@@ -0,0 +1,205 @@
+"""
+Asyncio/ASGI serving mode for the Cat vs Dog classifier.
+
+Same /predict request/response contract as app.py, but:
+  * uploads are read without blocking the event loop;
+  * image decoding runs in a bounded thread or process pool;
+  * inference runs on the micro-batcher's dedicated worker thread;
+  * when either stage is saturated the request gets 429 instead of queueing;
+  * the model loads in the background, so the server accepts connections
+    (and answers /healthz and /readyz) right away.
+
+Run with:
+    uvicorn app_async:app --host 0.0.0.0 --port 5000
+"""
+import asyncio
+import multiprocessing
+import queue
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+from starlette.applications import Starlette
+from starlette.exceptions import HTTPException
+from starlette.formparsers import MultiPartException
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from src.config import Config
+from src.Component.image_preprocessing import preprocess_image
+from src.Component.metrics import (
+    CONTENT_TYPE, REGISTRY, REQUEST_LATENCY, REQUESTS, STAGE_LATENCY, UPLOAD_BYTES
+)
+from src.Component.prediction_cache import PredictionCache
+from src.Component.serving_runtime import BackgroundLoader, load_serving_runtime
+from src.utils import format_prediction
+
+CONFIG = Config()
+SERVING_CONFIG = CONFIG['serving']
+ASYNC_CONFIG = SERVING_CONFIG['async']
+
+runtime = None
+decode_pool = None
+decode_slots = None
+
+
+def _install_runtime(loaded):
+    global runtime
+    runtime = loaded
+
+
+loader = BackgroundLoader(load_serving_runtime, CONFIG, on_ready=_install_runtime)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """Start loading the model on a background thread and size the decode pool."""
+    global decode_pool, decode_slots
+    loader.start()
+
+    if ASYNC_CONFIG['decode_executor'] == 'process':
+        # Spawned, not forked: the loader thread may already be importing TensorFlow
+        decode_pool = ProcessPoolExecutor(
+            max_workers=SERVING_CONFIG['decode_workers'], mp_context=multiprocessing.get_context('spawn'))
+    else:
+        decode_pool = ThreadPoolExecutor(max_workers=SERVING_CONFIG['decode_workers'])
+    decode_slots = asyncio.Semaphore(ASYNC_CONFIG['max_pending_decodes'])
+    try:
+        yield
+    finally:
+        decode_pool.shutdown(wait=False, cancel_futures=True)
+        if runtime is not None:
+            runtime.stop()
+
+
+def busy():
+    return JSONResponse({'error': 'Server busy, try again later'}, status_code=429)
+
+
+def not_ready():
+    """The response for model-backed endpoints while the model is loading or after it failed to load."""
+    if loader.state == 'failed':
+        return JSONResponse({'error': f"Model failed to load: {loader.error}"}, status_code=500)
+    return JSONResponse({'error': 'Model is loading, try again shortly'}, status_code=503,
+                        headers={'Retry-After': '1'})
+
+
+# Status code -> outcome label for the request counter
+OUTCOMES = {200: 'ok', 400: 'bad_request', 429: 'busy', 503: 'not_ready'}
+
+
+async def predict(request):
+    started = time.perf_counter()
+    response, outcome = await _predict(request)
+    REQUEST_LATENCY.labels('predict').observe(time.perf_counter() - started)
+    REQUESTS.labels('predict', outcome or OUTCOMES.get(response.status_code, 'error')).inc()
+    return response
+
+
+async def _predict(request):
+    """Returns (response, outcome) where outcome refines the status-code label, or None."""
+    stage = STAGE_LATENCY.time
+    try:
+        with stage('read'):
+            form = await request.form()
+    except HTTPException as e:
+        return JSONResponse({'error': e.detail}, status_code=400), None
+    except MultiPartException as e:
+        return JSONResponse({'error': e.message}, status_code=400), None
+    if 'file' not in form:
+        return JSONResponse({'error': 'No file part'}, status_code=400), None
+
+    file = form['file']
+
+    if not getattr(file, 'filename', ''):
+        return JSONResponse({'error': 'No selected file'}, status_code=400), None
+
+    if runtime is None:
+        return not_ready(), None
+
+    try:
+        with stage('read'):
+            data = await file.read()
+        UPLOAD_BYTES.observe(len(data))
+        loop = asyncio.get_running_loop()
+        cache = runtime.cache
+        if cache is not None:
+            # Hashing the upload and the sqlite lookup stay off the event loop
+            cache_key, cached = await loop.run_in_executor(None, _cache_lookup, cache, data)
+            if cached is not None:
+                return JSONResponse(cached), 'cache_hit'
+
+        # Bounded decode stage: reject rather than pile up behind slow uploads
+        if decode_slots.locked():
+            return busy(), None
+        async with decode_slots:
+            with stage('decode'):
+                processed_image = await loop.run_in_executor(decode_pool, preprocess_image, data)
+
+        # Inference stage: the batcher's queue bound is the backpressure signal
+        try:
+            future = runtime.batcher.submit(processed_image)
+        except queue.Full:
+            return busy(), None
+        with stage('inference'):
+            try:
+                prediction = await asyncio.wait_for(
+                    asyncio.wrap_future(future), SERVING_CONFIG['predict_timeout'])
+            except TimeoutError:
+                return JSONResponse({'error': 'Prediction timed out, try again later'}, status_code=503), 'timeout'
+
+        result = format_prediction(prediction[0])
+        if cache is not None:
+            await loop.run_in_executor(None, cache.put, cache_key, result)
+        with stage('encode'):
+            return JSONResponse(result), None
+
+    except Exception as e:
+        return JSONResponse({'error': str(e)}, status_code=500), None
+
+
+def _cache_lookup(cache, data):
+    """(content key, cached result or None) for an upload; blocking, run in the default executor."""
+    cache_key = PredictionCache.content_key(data)
+    return cache_key, cache.get(cache_key)
+
+
+async def stats(request):
+    if runtime is None:
+        return not_ready()
+    return JSONResponse(runtime.stats())
+
+
+async def healthz(request):
+    """Liveness: the event loop is up and serving HTTP, whatever the model's load state."""
+    return JSONResponse({'status': 'ok', 'model': loader.status()})
+
+
+async def readyz(request):
+    """Readiness: 200 once the model is loaded and warmed up, 503 while loading or after a failed load."""
+    status = {**loader.status(), 'model_path': SERVING_CONFIG['model_path']}
+    return JSONResponse(status, status_code=200 if loader.ready else 503)
+
+
+async def metrics(request):
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
+app = Starlette(
+    routes=[
+        Route('/predict', predict, methods=['POST']),
+        Route('/stats', stats, methods=['GET']),
+        Route('/healthz', healthz, methods=['GET']),
+        Route('/readyz', readyz, methods=['GET']),
+        Route('/metrics', metrics, methods=['GET']),
+    ],
+    middleware=[Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])],
+    lifespan=lifespan,
+)
+
+if __name__ == '__main__':
+    import uvicorn
+
+    uvicorn.run(app, host='0.0.0.0', port=5000)
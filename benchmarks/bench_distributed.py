@@ -0,0 +1,89 @@
+"""
+How training throughput scales with the number of local MultiWorkerMirroredStrategy workers.
+
+Each run launches N worker processes on this machine (each pinned to its own
+CPU slice, as src/Pipeline/distributed_train.py does) that train
+MobileNetV2Model on in-memory synthetic batches, so the numbers measure
+compute plus gradient all-reduce, not JPEG decoding. The per-worker batch is
+fixed, so the global batch grows with N.
+
+Usage:
+    python benchmarks/bench_distributed.py --workers 1 2 4 --steps 20
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import tensorflow as tf
+from src.Component.cpu_affinity import available_cpus
+from src.Component.distributed_training import MultiWorkerTrainer, configure_from_env, launch_local_workers
+from src.Component.training_options import training_options
+from src.Pipeline.fine_tune_model import MobileNetV2Model
+
+
+def synthetic_dataset(batch_size, seed):
+    rng = np.random.default_rng(seed)
+    images = rng.uniform(-1, 1, (4 * batch_size, 150, 150, 3)).astype(np.float32)
+    labels = rng.integers(0, 2, 4 * batch_size).astype(np.float32)
+    dataset = tf.data.Dataset.from_tensor_slices((images, labels)).batch(batch_size).cache().repeat()
+    options = tf.data.Options()
+    options.experimental_distribute.auto_shard_policy = tf.data.experimental.AutoShardPolicy.OFF
+    return dataset.with_options(options)
+
+
+def run_worker(args):
+    configure_from_env()
+    strategy = tf.distribute.MultiWorkerMirroredStrategy()
+    global_batch = args.batch_size * strategy.num_replicas_in_sync
+    options = training_options({'batch_size': global_batch, 'base_batch_size': args.batch_size})
+    dataset = strategy.distribute_datasets_from_function(
+        lambda ctx: synthetic_dataset(args.batch_size, ctx.input_pipeline_id))
+    with strategy.scope():
+        model = MobileNetV2Model(weights=None, options=options).model
+    # Epoch 1 includes tracing and the first collective setup; the last epoch is reported
+    _, throughput = MultiWorkerTrainer(model, strategy).fit(
+        dataset, epochs=2, steps_per_epoch=args.steps, global_batch_size=global_batch, verbose=False)
+    if strategy.cluster_resolver.task_id == 0:
+        Path(os.environ['BENCH_RESULT']).write_text(json.dumps(throughput[-1]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--batch-size', type=int, default=32, help='Per-worker batch size')
+    parser.add_argument('--steps', type=int, default=20, help='Steps per epoch')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        return run_worker(args)
+
+    results = []
+    for workers in args.workers:
+        result_path = Path(tempfile.mkdtemp()) / 'result.json'
+        command = [sys.executable, str(Path(__file__).resolve()), '--worker',
+                   '--batch-size', str(args.batch_size), '--steps', str(args.steps)]
+        codes = launch_local_workers(command, workers, env={'BENCH_RESULT': str(result_path)})
+        if any(codes):
+            raise RuntimeError(f"{workers} workers failed with exit codes {codes}")
+        result = json.loads(result_path.read_text())
+        results.append({'workers': workers, 'global_batch_size': args.batch_size * workers,
+                        'images_per_second': result['images_per_second']})
+        print(f"{workers:>3} workers  {result['images_per_second']:>8.1f} img/s", flush=True)
+
+    base = results[0]['images_per_second'] / results[0]['workers']
+    for result in results:
+        result['speedup'] = round(result['images_per_second'] / results[0]['images_per_second'], 2)
+        result['scaling_efficiency'] = round(result['images_per_second'] / (base * result['workers']), 2)
+    print(json.dumps({'cpus': len(available_cpus()), 'per_worker_batch_size': args.batch_size,
+                      'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
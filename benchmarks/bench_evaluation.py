@@ -0,0 +1,90 @@
+"""
+Test-set evaluation cost: decoding per run vs the cached, streaming evaluation engine.
+
+  * generator: the previous PredictionPipeline flow, i.e. flow_from_directory
+    decoding every JPEG, then engine.predict per batch, for each model;
+  * cold: EvaluationSet.refresh (decode once into uint8 shards) + one
+    evaluate_models pass over all models;
+  * warm: the same pass on an unchanged split (nothing is decoded).
+
+Usage:
+    python benchmarks/bench_evaluation.py --test-dir data/processed/cat-dog-split/test --models models/model.h5
+    python benchmarks/bench_evaluation.py --synthetic 2000 --stand-ins 3   # offline
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+from tensorflow.keras.applications.mobilenet_v2 import preprocess_input
+from tensorflow.keras.preprocessing.image import ImageDataGenerator
+from benchmarks.bench_feature_cache import synthetic_split
+from benchmarks.load_test import build_stand_in_model
+from src.Component.evaluation import EvaluationSet, evaluate_models
+from src.Component.inference_engine import load_inference_engine
+
+
+def run_generator(test_dir, engines, batch_size):
+    started = time.perf_counter()
+    for engine in engines.values():
+        test = ImageDataGenerator(preprocessing_function=preprocess_input).flow_from_directory(
+            str(test_dir), target_size=(150, 150), batch_size=batch_size, class_mode='binary', shuffle=False
+        )
+        np.concatenate([engine.predict(test[i][0]) for i in range(len(test))])
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--test-dir', help='Directory with <class>/ subdirectories')
+    parser.add_argument('--synthetic', type=int, help='Generate a synthetic split with this many images instead')
+    parser.add_argument('--models', nargs='*', default=[], help='Model files to evaluate')
+    parser.add_argument('--stand-ins', type=int, default=0, help='Also evaluate this many tiny random models')
+    parser.add_argument('--batch-size', type=int, default=64)
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp())
+    if args.synthetic:
+        _, test_dir = synthetic_split(workdir / 'split', args.synthetic)
+    else:
+        test_dir = Path(args.test_dir or project_root / 'data' / 'processed' / 'cat-dog-split' / 'test')
+    model_paths = [*args.models, *(build_stand_in_model(workdir / f'stand_in_{i}.h5', seed=i)
+                                   for i in range(args.stand_ins))]
+    if not model_paths:
+        parser.error('pass --models and/or --stand-ins')
+    engines = {str(path): load_inference_engine(path) for path in model_paths}
+
+    generator_seconds = run_generator(test_dir, engines, args.batch_size)
+
+    evaluation_set = EvaluationSet(workdir / 'eval_cache')
+    started = time.perf_counter()
+    evaluation_set.refresh(str(test_dir))
+    evaluate_models(engines, evaluation_set, args.batch_size)
+    cold_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    evaluation_set.refresh(str(test_dir))
+    results = evaluate_models(engines, evaluation_set, args.batch_size)
+    warm_seconds = time.perf_counter() - started
+
+    print(json.dumps({
+        'cpus': len(os.sched_getaffinity(0)),
+        'images': len(evaluation_set),
+        'models': len(engines),
+        'generator_seconds': round(generator_seconds, 3),
+        'cold_seconds': round(cold_seconds, 3),
+        'warm_seconds': round(warm_seconds, 3),
+        'warm_speedup': round(generator_seconds / warm_seconds, 2),
+        'accuracy': {name: metrics['accuracy'] for name, metrics in results.items()},
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+Wall-clock and accuracy: current ModelTrain flow vs frozen-backbone feature-cache training.
+
+  * baseline: MobileNetV2Model fitted on ImageDataGenerator.flow_from_directory
+    iterators, exactly as ModelTrain/DataGenerator do (every epoch decodes,
+    augments and runs the full backbone);
+  * feature cache: FeatureCacheTrain, i.e. one pass of the frozen prefix
+    (plus augmented variants) into a float16 cache, then epochs over the
+    trainable suffix only.
+
+Both train for the same epochs and steps and are scored on the same test split.
+
+Usage:
+    python benchmarks/bench_feature_cache.py --split-dir data/processed/cat-dog-split --epochs 10
+    python benchmarks/bench_feature_cache.py --synthetic 400 --epochs 3 --weights none   # offline
+"""
+import argparse
+import copy
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+from PIL import Image
+from tensorflow.keras.applications.mobilenet_v2 import preprocess_input
+from tensorflow.keras.preprocessing.image import ImageDataGenerator
+from src.Component.tf_data_pipeline import list_split_files, split_subset
+from src.config import Config
+from src.Pipeline.feature_cache_train import FeatureCacheTrain
+from src.Pipeline.fine_tune_model import MobileNetV2Model
+
+
+def synthetic_split(root, count, seed=0):
+    """A learnable stand-in: warm-tinted 'cats' and cool-tinted 'dogs' with random texture, 80/20 split."""
+    rng = np.random.default_rng(seed)
+    for i in range(count):
+        cls = ('Cat', 'Dog')[i % 2]
+        split = 'test' if i % 5 == 0 else 'train'
+        tint = np.array([170, 110, 70] if cls == 'Cat' else [70, 110, 170], dtype=np.float32)
+        pixels = np.clip(tint + rng.normal(0, 45, (240, 320, 3)), 0, 255).astype(np.uint8)
+        directory = root / split / cls
+        directory.mkdir(parents=True, exist_ok=True)
+        Image.fromarray(pixels).save(directory / f'{i}.jpg', quality=90)
+    return root / 'train', root / 'test'
+
+
+def run_baseline(train_dir, test_dir, weights, epochs, batch_size):
+    """The current flow: DataGenerator's Keras iterators + MobileNetV2Model.fit."""
+    model = MobileNetV2Model(weights=weights).model
+    datagen = ImageDataGenerator(
+        preprocessing_function=preprocess_input, rotation_range=10, zoom_range=0.2,
+        horizontal_flip=True, validation_split=0.2,
+    )
+    options = dict(target_size=(150, 150), batch_size=batch_size, class_mode='binary')
+    train = datagen.flow_from_directory(str(train_dir), subset='training', **options)
+    validation = datagen.flow_from_directory(str(train_dir), subset='validation', **options)
+    test = ImageDataGenerator(preprocessing_function=preprocess_input).flow_from_directory(
+        str(test_dir), shuffle=False, **options
+    )
+    started = time.perf_counter()
+    model.fit(
+        train, epochs=epochs, validation_data=validation,
+        validation_steps=max(1, validation.samples // batch_size),
+        steps_per_epoch=max(1, train.samples // batch_size), verbose=0,
+    )
+    seconds = time.perf_counter() - started
+    _, accuracy = model.evaluate(test, verbose=0)
+    return {'seconds': seconds, 'test_accuracy': float(accuracy)}
+
+
+def run_feature_cache(train_dir, test_dir, weights, epochs, batch_size, variants, cache_dir):
+    config = Config()
+    config.config = copy.deepcopy(config.config)
+    config.config['feature_cache'].update({'cache_dir': str(cache_dir), 'variants': variants})
+    trainer = FeatureCacheTrain(config, weights=weights)
+    filepaths, labels, _ = list_split_files(str(train_dir))
+    test_files, test_labels, _ = list_split_files(str(test_dir))
+    splits = {
+        'train': split_subset(filepaths, labels, 0.2, 'training'),
+        'validation': split_subset(filepaths, labels, 0.2, 'validation'),
+        'test': (test_files, test_labels),
+    }
+    _, report = trainer.train(splits, epochs=epochs, batch_size=batch_size)
+    report['seconds'] = report['cache_seconds'] + report['train_seconds']
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--split-dir', help='Directory with train/<class>/ and test/<class>/')
+    parser.add_argument('--synthetic', type=int, help='Generate this many synthetic images instead')
+    parser.add_argument('--epochs', type=int, default=10)
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--variants', type=int, default=4)
+    parser.add_argument('--weights', default='imagenet', help="'imagenet' or 'none' (random init, offline)")
+    args = parser.parse_args()
+    weights = None if args.weights == 'none' else args.weights
+
+    workdir = Path(tempfile.mkdtemp())
+    if args.synthetic:
+        train_dir, test_dir = synthetic_split(workdir / 'split', args.synthetic)
+    else:
+        split_dir = Path(args.split_dir or project_root / 'data' / 'processed' / 'cat-dog-split')
+        train_dir, test_dir = split_dir / 'train', split_dir / 'test'
+
+    baseline = run_baseline(train_dir, test_dir, weights, args.epochs, args.batch_size)
+    cached = run_feature_cache(train_dir, test_dir, weights, args.epochs, args.batch_size, args.variants,
+                               workdir / 'feature_cache')
+    print(json.dumps({
+        'cpus': len(os.sched_getaffinity(0)),
+        'epochs': args.epochs,
+        'weights': args.weights,
+        'baseline': baseline,
+        'feature_cache': cached,
+        'speedup_total': baseline['seconds'] / cached['seconds'],
+        'speedup_per_epoch': baseline['seconds'] / cached['train_seconds'],
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
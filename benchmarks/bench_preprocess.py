@@ -0,0 +1,114 @@
+"""
+Micro-benchmark: legacy per-app preprocess_image vs src.Component.image_preprocessing.
+
+Times both paths on a directory of images (or synthetic phone-sized JPEGs)
+and checks that the outputs agree:
+  * full decode (use_draft=False) must match the legacy path to float precision;
+  * reduced JPEG decode (use_draft=True) must stay within --tolerance mean abs
+    difference on MobileNetV2's [-1, 1] scale.
+
+Usage:
+    python benchmarks/bench_preprocess.py [--images DIR] [--count 20] [--repeat 3]
+"""
+import argparse
+import io
+import json
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+from PIL import Image
+from tensorflow.keras.applications.mobilenet_v2 import preprocess_input
+from tensorflow.keras.preprocessing.image import img_to_array
+from src.Component.image_preprocessing import IMAGE_SIZE, preprocess_image
+
+
+def legacy_preprocess_image(image):
+    """The function previously copy-pasted into app.py and app2.py."""
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    image = image.resize(IMAGE_SIZE)
+    img_array = img_to_array(image)
+    img_array = np.expand_dims(img_array, axis=0)
+    return preprocess_input(img_array)
+
+
+def synthetic_jpegs(count, size=(4032, 3024), seed=0):
+    """Smooth gradients plus noise, encoded like a phone camera JPEG."""
+    rng = np.random.default_rng(seed)
+    width, height = size
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    blobs = []
+    for _ in range(count):
+        fx, fy, phase = rng.uniform(0.001, 0.01, 2).tolist() + [rng.uniform(0, 6.28)]
+        base = 127 + 100 * np.sin(x * fx + phase)[..., None] * np.cos(y * fy)[..., None]
+        pixels = np.clip(base + rng.normal(0, 12, (height, width, 3)), 0, 255).astype(np.uint8)
+        buffer = io.BytesIO()
+        Image.fromarray(pixels).save(buffer, format='JPEG', quality=90)
+        blobs.append(buffer.getvalue())
+    return blobs
+
+
+def load_images(directory, count):
+    files = sorted(p for p in Path(directory).rglob('*') if p.suffix.lower() in ('.jpg', '.jpeg', '.png'))
+    return [p.read_bytes() for p in files[:count]]
+
+
+def time_per_image(fn, blobs, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for data in blobs:
+            fn(data)
+        best = min(best, time.perf_counter() - started)
+    return best / len(blobs) * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--images', help='Directory of images (default: synthetic 12 MP JPEGs)')
+    parser.add_argument('--count', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--tolerance', type=float, default=0.05,
+                        help='Max mean abs difference allowed for the reduced-decode path')
+    args = parser.parse_args()
+
+    blobs = load_images(args.images, args.count) if args.images else synthetic_jpegs(args.count)
+    if not blobs:
+        sys.exit(f"No images found in {args.images}")
+
+    paths = {
+        'legacy': lambda data: legacy_preprocess_image(Image.open(io.BytesIO(data))),
+        'shared_full_decode': lambda data: preprocess_image(data, use_draft=False),
+        'shared_reduced_decode': lambda data: preprocess_image(data),
+    }
+    timings = {name: time_per_image(fn, blobs, args.repeat) for name, fn in paths.items()}
+
+    full_max_diff, draft_mean_diffs, draft_max_diff = 0.0, [], 0.0
+    for data in blobs:
+        reference = paths['legacy'](data)
+        full_max_diff = max(full_max_diff, float(np.abs(paths['shared_full_decode'](data) - reference).max()))
+        diff = np.abs(paths['shared_reduced_decode'](data) - reference)
+        draft_mean_diffs.append(float(diff.mean()))
+        draft_max_diff = max(draft_max_diff, float(diff.max()))
+
+    report = {
+        'images': len(blobs),
+        'ms_per_image': timings,
+        'speedup_vs_legacy': {name: timings['legacy'] / t for name, t in timings.items()},
+        'full_decode_max_abs_diff': full_max_diff,
+        'reduced_decode_mean_abs_diff': float(np.mean(draft_mean_diffs)),
+        'reduced_decode_max_abs_diff': draft_max_diff,
+        'tolerance': args.tolerance,
+    }
+    report['ok'] = full_max_diff <= 1e-5 and report['reduced_decode_mean_abs_diff'] <= args.tolerance
+    print(json.dumps(report, indent=2))
+    sys.exit(0 if report['ok'] else 1)
+
+
+if __name__ == '__main__':
+    main()
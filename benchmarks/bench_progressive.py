@@ -0,0 +1,107 @@
+"""
+Time-to-target-accuracy: fixed 150x150 training vs a progressive-resolution schedule.
+
+  * fixed: every epoch at 150x150 with training.batch_size, as ModelTrain does;
+  * progressive: ProgressiveTrain's stages (progressive.stages, or --stages).
+
+Both runs read ImageDataGenerator.flow_from_directory iterators decoded at
+each stage's size, start from the same seed, and are scored after every
+epoch by the 150x150 model on the same validation subset. The clock is
+paused while scoring.
+
+Usage:
+    python benchmarks/bench_progressive.py --split-dir data/processed/cat-dog-split --target 0.95
+    python benchmarks/bench_progressive.py --synthetic 600 --weights none --target 0.9 \
+        --fixed-epochs 6 --stages 96:3:64 128:2:48 150:1:32   # offline
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import tensorflow as tf
+from tensorflow.keras.applications.mobilenet_v2 import preprocess_input
+from tensorflow.keras.preprocessing.image import ImageDataGenerator
+from benchmarks.bench_feature_cache import synthetic_split
+from src.config import Config
+from src.Pipeline.fine_tune_model import IMAGE_SIZE
+from src.Pipeline.progressive_train import ProgressiveTrain
+
+
+def directory_data(train_dir):
+    """stage_data() and full-size validation over flow_from_directory, with DataGenerator's augmentation."""
+    datagen = ImageDataGenerator(
+        preprocessing_function=preprocess_input, rotation_range=10, zoom_range=0.2,
+        horizontal_flip=True, validation_split=0.2,
+    )
+
+    def stage_data(image_size, batch_size):
+        train = datagen.flow_from_directory(str(train_dir), target_size=(image_size, image_size),
+                                            batch_size=batch_size, class_mode='binary', subset='training')
+        return train, max(1, train.samples // batch_size)
+
+    validation = datagen.flow_from_directory(str(train_dir), target_size=(IMAGE_SIZE, IMAGE_SIZE), batch_size=32,
+                                             class_mode='binary', subset='validation', shuffle=False)
+    return stage_data, (validation, max(1, -(-validation.samples // 32)))
+
+
+def parse_stage(text):
+    image_size, epochs, batch_size = (int(v) for v in text.split(':'))
+    return {'image_size': image_size, 'epochs': epochs, 'batch_size': batch_size}
+
+
+def run(schedule, weights, train_dir, target):
+    tf.keras.utils.set_random_seed(0)
+    trainer = ProgressiveTrain(Config(), weights=weights, schedule=schedule)
+    stage_data, validation = directory_data(train_dir)
+    report = trainer.train(stage_data, validation, target)
+    return {key: report[key] for key in
+            ('stages', 'seconds_to_target', 'epochs_to_target', 'train_seconds', 'final_val_accuracy', 'epochs')}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--split-dir', help='Directory with train/<class>/')
+    parser.add_argument('--synthetic', type=int, help='Generate this many synthetic images instead')
+    parser.add_argument('--weights', default='imagenet', help="'imagenet' or 'none' (random init, offline)")
+    parser.add_argument('--target', type=float, help='Validation accuracy to time (default: progressive.target_accuracy)')
+    parser.add_argument('--fixed-epochs', type=int, help='Epochs of the fixed run (default: training.epochs)')
+    parser.add_argument('--stages', nargs='+', type=parse_stage, help='size:epochs:batch_size per stage')
+    args = parser.parse_args()
+    weights = None if args.weights == 'none' else args.weights
+
+    config = Config()
+    target = args.target if args.target is not None else config['progressive']['target_accuracy']
+    if args.synthetic:
+        train_dir, _ = synthetic_split(Path(tempfile.mkdtemp()) / 'split', args.synthetic)
+    else:
+        train_dir = Path(args.split_dir or project_root / 'data' / 'processed' / 'cat-dog-split') / 'train'
+
+    fixed_schedule = [{
+        'image_size': IMAGE_SIZE,
+        'epochs': args.fixed_epochs or config['training']['epochs'],
+        'batch_size': config['training']['batch_size'],
+    }]
+    fixed = run(fixed_schedule, weights, train_dir, target)
+    progressive = run(args.stages or config['progressive']['stages'], weights, train_dir, target)
+
+    speedup = None
+    if fixed['seconds_to_target'] and progressive['seconds_to_target']:
+        speedup = round(fixed['seconds_to_target'] / progressive['seconds_to_target'], 2)
+    print(json.dumps({
+        'cpus': len(os.sched_getaffinity(0)),
+        'weights': args.weights,
+        'target_accuracy': target,
+        'fixed': fixed,
+        'progressive': progressive,
+        'time_to_target_speedup': speedup,
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
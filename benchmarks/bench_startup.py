@@ -0,0 +1,138 @@
+"""
+Cold-start time of the Flask serving app: time to listening, ready and first prediction.
+
+Each mode starts a fresh server process and polls it. The measured times are
+`listening` (first 200 from /healthz), `ready` (first 200 from /readyz) and
+`first_prediction` (first 200 from /predict), all from process start:
+
+  * blocking_h5: the previous startup; load the h5 model, then listen;
+  * background_h5: listen at once, load the h5 model on a background thread;
+  * background_graph_cold: the same with inference.graph_cache, first start
+    (loads the h5 model and writes the frozen graph);
+  * background_graph: the same, later starts (loads the frozen graph).
+
+Usage:
+    python benchmarks/bench_startup.py --model models/model.h5 --repeats 3
+    python benchmarks/bench_startup.py --stand-in --repeats 3   # offline, untrained MobileNetV2
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.load_test import HttpTarget, multipart_body, sample_jpeg
+
+MODES = ('blocking_h5', 'background_h5', 'background_graph_cold', 'background_graph')
+
+SERVER = """
+import logging, sys
+logging.basicConfig(level=logging.INFO)
+import app
+model_path, graph_cache, blocking, port = sys.argv[1:]
+app.CONFIG['serving']['model_path'] = model_path
+app.CONFIG['inference']['graph_cache'] = graph_cache == '1'
+if blocking == '1':
+    app.load_classifier_model()
+else:
+    app.start_loading()
+app.app.run(host='127.0.0.1', port=int(port), threaded=True)
+"""
+
+
+def get_status(url):
+    try:
+        with urllib.request.urlopen(url, timeout=5) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except OSError:
+        return None
+
+
+def clear_graph_cache(model_path):
+    for suffix in ('.graph.pb', '.graph.json'):
+        Path(f'{model_path}{suffix}').unlink(missing_ok=True)
+
+
+def run_once(mode, model_path, port, payload, timeout):
+    """Start one server in `mode`; returns {milestone: seconds since process start}."""
+    if mode == 'background_graph_cold':
+        clear_graph_cache(model_path)
+    graph_cache = '1' if mode.startswith('background_graph') else '0'
+    blocking = '1' if mode == 'blocking_h5' else '0'
+    base_url = f'http://127.0.0.1:{port}'
+    target = HttpTarget(base_url)
+
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, '-c', SERVER, str(model_path), graph_cache, blocking, str(port)],
+        cwd=project_root, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    times = {}
+    try:
+        deadline = time.monotonic() + timeout
+        while 'first_prediction' not in times:
+            if process.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError(f"Server in mode {mode} did not serve a prediction (reached {times})")
+            if 'listening' not in times and get_status(base_url + '/healthz') == 200:
+                times['listening'] = time.perf_counter() - started
+            if 'listening' in times and 'ready' not in times and get_status(base_url + '/readyz') == 200:
+                times['ready'] = time.perf_counter() - started
+            if 'ready' in times and target.post(*payload) == 200:
+                times['first_prediction'] = time.perf_counter() - started
+            time.sleep(0.02)
+    finally:
+        process.terminate()
+        process.wait(timeout=60)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', default='models/model.h5')
+    parser.add_argument('--stand-in', action='store_true',
+                        help='Serve an untrained MobileNetV2 of the production architecture instead of --model')
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--port', type=int, default=5058)
+    parser.add_argument('--timeout', type=float, default=300.0)
+    args = parser.parse_args()
+
+    if args.stand_in:
+        from src.Pipeline.fine_tune_model import MobileNetV2Model
+
+        args.model = str(Path(tempfile.mkdtemp()) / 'stand_in.h5')
+        MobileNetV2Model(weights=None).model.save(args.model)
+    model_path = Path(args.model).resolve()
+
+    payload = multipart_body('file', 'sample.jpg', sample_jpeg())
+    results = {}
+    for mode in args.modes:
+        runs = [run_once(mode, model_path, args.port, payload, args.timeout) for _ in range(args.repeats)]
+        results[mode] = {
+            milestone: round(statistics.median(run[milestone] for run in runs), 3)
+            for milestone in ('listening', 'ready', 'first_prediction')
+        }
+        print(f"{mode:>22}: " + ', '.join(f"{k} {v:.2f}s" for k, v in results[mode].items()), file=sys.stderr)
+
+    print(json.dumps({
+        'cpus': len(os.sched_getaffinity(0)),
+        'model': str(model_path),
+        'model_mb': round(model_path.stat().st_size / 2**20, 1),
+        'repeats': args.repeats,
+        'results': results,
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Training throughput (images/s) of MobileNetV2Model for each combination of
+mixed precision, XLA and steps_per_execution.
+
+Batches come from in-memory synthetic tensors, so the numbers measure the
+train step itself and not JPEG decoding. Each combination runs one untimed
+warm-up epoch (tracing/XLA compilation) and then a timed epoch.
+
+Usage:
+    python benchmarks/bench_training.py
+    python benchmarks/bench_training.py --batch-sizes 32 64 --steps 32 --steps-per-execution 1 8
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import tensorflow as tf
+from src.Component.training_options import PRECISIONS, cpu_supports_bf16, training_options
+from src.Pipeline.fine_tune_model import MobileNetV2Model
+
+
+def synthetic_dataset(batch_size, seed=0):
+    rng = np.random.default_rng(seed)
+    images = rng.uniform(-1, 1, (4 * batch_size, 150, 150, 3)).astype(np.float32)
+    labels = rng.integers(0, 2, 4 * batch_size).astype(np.float32)
+    return tf.data.Dataset.from_tensor_slices((images, labels)).batch(batch_size, drop_remainder=True).cache().repeat()
+
+
+def measure(weights, precision, jit_compile, steps_per_execution, batch_size, steps):
+    options = training_options({
+        'batch_size': batch_size, 'base_batch_size': 32, 'mixed_precision': precision,
+        'jit_compile': jit_compile, 'steps_per_execution': steps_per_execution,
+    })
+    model = MobileNetV2Model(weights=weights, options=options).model
+    dataset = synthetic_dataset(batch_size)
+    model.fit(dataset, epochs=1, steps_per_epoch=steps, verbose=0)  # trace / compile
+    started = time.perf_counter()
+    history = model.fit(dataset, epochs=1, steps_per_epoch=steps, verbose=0)
+    seconds = time.perf_counter() - started
+    return {
+        'precision': precision,
+        'jit_compile': jit_compile,
+        'steps_per_execution': steps_per_execution,
+        'batch_size': batch_size,
+        'learning_rate': options['learning_rate'],
+        'images_per_second': round(steps * batch_size / seconds, 1),
+        'loss': round(float(history.history['loss'][-1]), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[32])
+    parser.add_argument('--steps', type=int, default=16, help='Timed steps per combination')
+    parser.add_argument('--steps-per-execution', type=int, nargs='+', default=[1, 8])
+    parser.add_argument('--precisions', nargs='+', default=list(PRECISIONS))
+    parser.add_argument('--weights', default='none', help="'imagenet' or 'none' (speed does not depend on weights)")
+    args = parser.parse_args()
+    weights = None if args.weights == 'none' else args.weights
+
+    results = []
+    for precision, jit_compile, spe, batch_size in itertools.product(
+            args.precisions, (False, True), args.steps_per_execution, args.batch_sizes):
+        result = measure(weights, precision, jit_compile, spe, batch_size, args.steps)
+        print(f"{precision:>15}  jit={str(jit_compile):5}  spe={spe:<3} batch={batch_size:<4} "
+              f"{result['images_per_second']:>8.1f} img/s", flush=True)
+        results.append(result)
+
+    baseline = next((r for r in results if r['precision'] == 'float32' and not r['jit_compile']
+                     and r['steps_per_execution'] == 1), results[0])
+    for result in results:
+        result['speedup'] = round(result['images_per_second'] / baseline['images_per_second'], 2)
+    print(json.dumps({
+        'cpus': len(os.sched_getaffinity(0)),
+        'cpu_bf16': cpu_supports_bf16(),
+        'results': results,
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
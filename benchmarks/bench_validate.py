@@ -0,0 +1,103 @@
+"""
+Cold vs warm corrupted-image scan: legacy serial verify() vs ImageValidator.
+
+  * legacy: the old DataTransformation.remove_corrupted_images loop (serial
+    PIL verify(), no cache, report-only here);
+  * cold: ImageValidator with an empty verification cache (full parallel decode);
+  * warm: the same validator again, served from the cache.
+
+Nothing is moved: the validator runs with quarantine disabled, so this is
+safe to point at the real dataset.
+
+Usage:
+    python benchmarks/bench_validate.py                        # data/raw/PetImages
+    python benchmarks/bench_validate.py --synthetic 2000 [--corrupt 20]
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+from PIL import Image
+from src.Component.image_validator import IMAGE_EXTENSIONS, ImageValidator
+
+
+def legacy_scan(directories):
+    """The previous serial loop, counting instead of deleting."""
+    bad = 0
+    for directory in directories:
+        for root, _, files in os.walk(directory):
+            for file in files:
+                if file.lower().endswith(IMAGE_EXTENSIONS):
+                    try:
+                        img = Image.open(os.path.join(root, file))
+                        img.verify()
+                    except (IOError, SyntaxError, Image.UnidentifiedImageError):
+                        bad += 1
+    return bad
+
+
+def synthetic_dataset(root, count, corrupt, size=(500, 375), seed=0):
+    """PetImages-sized JPEGs in Cat/ and Dog/, with `corrupt` truncated files that still pass verify()."""
+    rng = np.random.default_rng(seed)
+    directories = [root / 'Cat', root / 'Dog']
+    for directory in directories:
+        directory.mkdir(parents=True)
+    for i in range(count):
+        buffer = io.BytesIO()
+        Image.fromarray(rng.integers(0, 255, (size[1], size[0], 3), dtype=np.uint8)).save(buffer, format='JPEG')
+        data = buffer.getvalue()
+        if i < corrupt:
+            data = data[:len(data) // 2]
+        (directories[i % 2] / f'{i}.jpg').write_bytes(data)
+    return directories
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - started, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--images', default=str(project_root / 'data' / 'raw' / 'PetImages'))
+    parser.add_argument('--synthetic', type=int, help='Benchmark on this many generated images instead')
+    parser.add_argument('--corrupt', type=int, default=10, help='Truncated images among --synthetic')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp())
+    if args.synthetic:
+        directories = synthetic_dataset(workdir / 'images', args.synthetic, args.corrupt)
+    else:
+        directories = [Path(args.images) / 'Cat', Path(args.images) / 'Dog']
+        if not all(d.is_dir() for d in directories):
+            sys.exit(f"Expected Cat/ and Dog/ under {args.images}")
+
+    legacy_seconds, legacy_bad = timed(legacy_scan, directories)
+    validator = ImageValidator(workdir / 'cache.json', workdir / 'quarantine', args.workers, quarantine=False)
+    cold_seconds, cold = timed(validator.scan, directories)
+    warm_seconds, warm = timed(validator.scan, directories)
+
+    print(json.dumps({
+        'images': cold['files'],
+        'cpus': len(os.sched_getaffinity(0)),
+        'legacy_serial_verify': {'seconds': legacy_seconds, 'bad': legacy_bad},
+        'cold_scan': {'seconds': cold_seconds, 'decoded': cold['checked'], 'bad': cold['bad']},
+        'warm_scan': {'seconds': warm_seconds, 'decoded': warm['checked'], 'bad': warm['bad']},
+        'cold_speedup_vs_legacy': legacy_seconds / cold_seconds if cold_seconds else None,
+        'warm_speedup_vs_legacy': legacy_seconds / warm_seconds if warm_seconds else None,
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Throughput vs worker count for serve.py on a CPU-only machine.
+
+For each worker count, starts `serve.py --workers N`, waits until every
+worker is ready, then drives /predict with a fixed number of concurrent
+clients for a fixed duration and records requests/second.
+
+Usage:
+    python benchmarks/bench_workers.py --model models/model.h5 --workers 1 2 4 8 [--duration 20]
+    python benchmarks/bench_workers.py --stand-in --workers 1 2 4   # offline, tiny random model
+"""
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.load_test import HttpTarget, LoadRunner, build_stand_in_model, multipart_body, sample_jpeg
+
+
+def drive(base_url, payloads, concurrency, duration):
+    """Closed-loop load: `concurrency` clients posting back-to-back for `duration` seconds."""
+    runner = LoadRunner(HttpTarget(base_url), payloads)
+    started = time.perf_counter()
+    runner.closed_loop(concurrency, duration)
+    return runner.report(time.perf_counter() - started)
+
+
+def run_point(args, workers, payloads):
+    ready_file = Path(tempfile.mkdtemp()) / 'ready'
+    command = [
+        sys.executable, str(project_root / 'serve.py'),
+        '--workers', str(workers), '--port', str(args.port), '--host', '127.0.0.1',
+        '--model', args.model, '--ready-file', str(ready_file),
+    ]
+    process = subprocess.Popen(command, cwd=project_root, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + args.startup_timeout
+        while not ready_file.exists():
+            if process.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError(f"serve.py with {workers} workers did not become ready")
+            time.sleep(0.2)
+        url = f'http://127.0.0.1:{args.port}'
+        drive(url, payloads, args.concurrency, min(3.0, args.duration))  # warm-up
+        report = drive(url, payloads, args.concurrency, args.duration)
+        return {
+            'workers': workers,
+            'requests_per_second': report['throughput_rps'],
+            'error_rate': report['error_rate'],
+            'latency_ms': report['latency_ms'],
+        }
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', default='models/model.h5')
+    parser.add_argument('--stand-in', action='store_true', help='Serve a tiny random model instead of --model')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--duration', type=float, default=20.0)
+    parser.add_argument('--port', type=int, default=5057)
+    parser.add_argument('--startup-timeout', type=float, default=300.0)
+    args = parser.parse_args()
+
+    if args.stand_in:
+        args.model = str(build_stand_in_model(Path(tempfile.mkdtemp()) / 'stand_in.h5'))
+
+    payloads = [multipart_body('file', f'sample_{i}.jpg', sample_jpeg(seed=i)) for i in range(8)]
+    results = []
+    for workers in args.workers:
+        point = run_point(args, workers, payloads)
+        results.append(point)
+        print(f"{workers:>3} workers: {point['requests_per_second']:8.1f} req/s "
+              f"(p99 {point['latency_ms'].get('p99', 0):.1f} ms, error rate {point['error_rate']:.3f})", file=sys.stderr)
+
+    base = results[0]['requests_per_second'] or 1.0
+    for point in results:
+        point['scaling_vs_first'] = point['requests_per_second'] / base
+    print(json.dumps({'cpus': len(os.sched_getaffinity(0)), 'concurrency': args.concurrency, 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
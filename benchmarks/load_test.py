@@ -0,0 +1,272 @@
+"""
+Load generator and latency benchmark for the prediction service.
+
+Replays a directory of images (or synthetic JPEGs) against /predict and
+reports throughput, latency percentiles and error rate as JSON.
+
+Targets:
+  * in-process (default): imports app.py and drives it through Flask's test
+    client, so no server or network is needed;
+  * --url http://host:port: any running server (app.py, app_async.py, serve.py).
+
+Load shapes:
+  * closed loop (default): --concurrency clients each send back-to-back;
+  * open loop: --rate R requests/second with fixed or Poisson arrivals.
+    Latency is measured from each request's scheduled send time, so a
+    backed-up server is not hidden by coordinated omission.
+
+With --stand-in (or when models/model.h5 is missing in-process) the app
+serves a tiny randomly initialised model with the same input/output
+signature, so the harness runs fully offline on any CPU-only machine.
+
+Usage:
+    python benchmarks/load_test.py --stand-in --concurrency 8 --duration 10
+    python benchmarks/load_test.py --url http://127.0.0.1:5000 --rate 50 --arrival poisson
+    python benchmarks/load_test.py --write-stand-in /tmp/stand_in.h5   # for serve.py --model
+"""
+import argparse
+import io
+import json
+import random
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+from PIL import Image
+
+
+def build_stand_in_model(path, input_shape=(150, 150, 3), seed=0):
+    """Save a tiny randomly initialised binary classifier with the production model's signature."""
+    import tensorflow as tf
+
+    tf.keras.utils.set_random_seed(seed)
+    inputs = tf.keras.Input(shape=input_shape)
+    x = tf.keras.layers.Conv2D(8, 3, strides=2, activation='relu')(inputs)
+    x = tf.keras.layers.GlobalAveragePooling2D()(x)
+    outputs = tf.keras.layers.Dense(1, activation='sigmoid')(x)
+    tf.keras.Model(inputs, outputs).save(str(path))
+    return path
+
+
+def sample_jpeg(size=(640, 480), seed=0):
+    rng = np.random.default_rng(seed)
+    buffer = io.BytesIO()
+    Image.fromarray(rng.integers(0, 255, (size[1], size[0], 3), dtype=np.uint8)).save(buffer, format='JPEG')
+    return buffer.getvalue()
+
+
+def load_images(directory, limit=None):
+    files = sorted(p for p in Path(directory).rglob('*') if p.suffix.lower() in ('.jpg', '.jpeg', '.png', '.webp'))
+    return [(p.name, p.read_bytes()) for p in files[:limit]]
+
+
+def multipart_body(field, filename, data):
+    boundary = uuid.uuid4().hex
+    body = (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+        f'Content-Type: application/octet-stream\r\n\r\n'
+    ).encode() + data + f'\r\n--{boundary}--\r\n'.encode()
+    return body, f'multipart/form-data; boundary={boundary}'
+
+
+class HttpTarget:
+    """POST to a running server over HTTP."""
+
+    def __init__(self, base_url, timeout=30.0):
+        self.url = base_url.rstrip('/') + '/predict'
+        self.timeout = timeout
+
+    def post(self, body, content_type):
+        request = urllib.request.Request(self.url, data=body, headers={'Content-Type': content_type})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+
+class InProcessTarget:
+    """Drive app.py through Flask's test client, one client per thread."""
+
+    def __init__(self, model_path):
+        import app as flask_app
+
+        flask_app.CONFIG['serving']['model_path'] = str(model_path)
+        flask_app.load_classifier_model()
+        if flask_app.model is None:
+            raise RuntimeError(f"app.py could not load {model_path}")
+        self.app = flask_app.app
+        self._local = threading.local()
+
+    def post(self, body, content_type):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        return client.post('/predict', data=body, content_type=content_type).status_code
+
+
+def percentiles(latencies):
+    if not latencies:
+        return {}
+    values = np.asarray(latencies) * 1000.0
+    return {
+        'mean': float(values.mean()),
+        'p50': float(np.percentile(values, 50)),
+        'p95': float(np.percentile(values, 95)),
+        'p99': float(np.percentile(values, 99)),
+        'max': float(values.max()),
+    }
+
+
+class LoadRunner:
+    """Sends requests built from `payloads` and collects per-request latency and status."""
+
+    def __init__(self, target, payloads):
+        self.target = target
+        self.payloads = payloads
+        self.latencies = []
+        self.statuses = {}
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    def _record(self, latency, status):
+        with self._lock:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            if status == 200:
+                self.latencies.append(latency)
+            else:
+                self.failures += 1
+
+    def _send(self, index, scheduled_at):
+        body, content_type = self.payloads[index % len(self.payloads)]
+        try:
+            status = self.target.post(body, content_type)
+        except Exception:
+            status = 'exception'
+        self._record(time.perf_counter() - scheduled_at, status)
+
+    def closed_loop(self, concurrency, duration, max_requests=None):
+        deadline = time.perf_counter() + duration
+        counter = iter(range(max_requests if max_requests else sys.maxsize))
+        counter_lock = threading.Lock()
+
+        def client():
+            while time.perf_counter() < deadline:
+                with counter_lock:
+                    index = next(counter, None)
+                if index is None:
+                    return
+                self._send(index, time.perf_counter())
+
+        threads = [threading.Thread(target=client) for _ in range(concurrency)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    def open_loop(self, rate, duration, concurrency, arrival='fixed', max_requests=None, seed=0):
+        rng = random.Random(seed)
+        started = time.perf_counter()
+        next_at = started
+        index = 0
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            while next_at - started < duration and (not max_requests or index < max_requests):
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(self._send, index, next_at)
+                index += 1
+                next_at += rng.expovariate(rate) if arrival == 'poisson' else 1.0 / rate
+
+    def report(self, elapsed, **settings):
+        total = sum(self.statuses.values())
+        return {
+            **settings,
+            'requests': total,
+            'elapsed_seconds': elapsed,
+            'throughput_rps': len(self.latencies) / elapsed if elapsed else 0.0,
+            'error_rate': self.failures / total if total else 0.0,
+            'status_counts': {str(k): v for k, v in sorted(self.statuses.items(), key=lambda kv: str(kv[0]))},
+            'latency_ms': percentiles(self.latencies),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='Base URL of a running server (default: drive app.py in-process)')
+    parser.add_argument('--images', help='Directory of images to replay (default: synthetic JPEGs)')
+    parser.add_argument('--synthetic-count', type=int, default=16)
+    parser.add_argument('--model', default=str(project_root / 'models' / 'model.h5'))
+    parser.add_argument('--stand-in', action='store_true', help='Serve a tiny random model (in-process only)')
+    parser.add_argument('--write-stand-in', metavar='PATH', help='Only write the stand-in model to PATH and exit')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--rate', type=float, help='Open-loop arrival rate in requests/second')
+    parser.add_argument('--arrival', choices=('fixed', 'poisson'), default='fixed')
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--requests', type=int, help='Stop after this many requests')
+    parser.add_argument('--warmup', type=float, default=2.0, help='Seconds of unrecorded warm-up load')
+    parser.add_argument('--output', help='Also write the JSON report here')
+    args = parser.parse_args()
+
+    if args.write_stand_in:
+        build_stand_in_model(args.write_stand_in)
+        print(args.write_stand_in)
+        return
+
+    if args.images:
+        images = load_images(args.images)
+        if not images:
+            sys.exit(f"No images found in {args.images}")
+    else:
+        images = [(f'synthetic_{i}.jpg', sample_jpeg(seed=i)) for i in range(args.synthetic_count)]
+    payloads = [multipart_body('file', name, data) for name, data in images]
+
+    if args.url:
+        target = HttpTarget(args.url)
+        model_used = None
+    else:
+        model_used = Path(args.model)
+        if args.stand_in or not model_used.exists():
+            model_used = build_stand_in_model(Path(tempfile.mkdtemp()) / 'stand_in.h5')
+        target = InProcessTarget(model_used)
+
+    if args.warmup > 0:
+        LoadRunner(target, payloads).closed_loop(args.concurrency, args.warmup)
+
+    runner = LoadRunner(target, payloads)
+    started = time.perf_counter()
+    if args.rate:
+        runner.open_loop(args.rate, args.duration, args.concurrency, args.arrival, args.requests)
+    else:
+        runner.closed_loop(args.concurrency, args.duration, args.requests)
+    elapsed = time.perf_counter() - started
+
+    report = runner.report(
+        elapsed,
+        target=args.url or 'in-process',
+        model=str(model_used) if model_used else None,
+        mode='open-loop' if args.rate else 'closed-loop',
+        rate=args.rate,
+        arrival=args.arrival if args.rate else None,
+        concurrency=args.concurrency,
+        images=len(payloads),
+    )
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,279 @@
+"""
+Production launcher: import once, fork N pinned Flask workers on one socket.
+
+The parent process imports the serving stack (TensorFlow, Keras, NumPy,
+Flask and app.py) before forking, so every worker starts without paying for
+the imports. After the fork, each worker first pins itself to a disjoint
+slice of the CPUs and caps TensorFlow's intra/inter-op thread counts to that
+slice, so N workers never oversubscribe the machine. It then loads its own
+copy of the model: the TensorFlow runtime is not fork-safe, so the weights
+are not shared between workers.
+
+Workers are recycled gracefully: after `max_requests` requests, or on
+SIGHUP to the parent (rolling restart), a worker stops accepting, drains
+its in-flight requests and exits, and the parent forks a replacement.
+
+Usage:
+    python serve.py --workers 8 --port 5000 [--max-requests 10000]
+"""
+import argparse
+import logging
+import os
+import random
+import select
+import signal
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+# Heavy imports happen here, in the parent, so workers inherit them. app.py
+# defers TensorFlow to its model loader, so it is imported explicitly.
+import app as flask_app
+import src.Component.inference_engine  # noqa: F401
+from src.Component.cpu_affinity import available_cpus, configure_worker_threads, cpu_slices
+from src.config import Config
+
+LAUNCHER_CONFIG = Config()['serving']['launcher']
+
+
+class _RequestCounter:
+    """WSGI middleware that counts requests and triggers recycling after `max_requests`."""
+
+    def __init__(self, wsgi_app, max_requests, on_limit):
+        self.wsgi_app = wsgi_app
+        self.max_requests = max_requests
+        self.on_limit = on_limit
+        self.handled = 0
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, environ, start_response):
+        with self._lock:
+            self.in_flight += 1
+        try:
+            return self.wsgi_app(environ, start_response)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.handled += 1
+                limit_hit = self.max_requests and self.handled == self.max_requests
+            if limit_hit:
+                self.on_limit()
+
+
+def run_worker(index, listen_fd, cpus, args, ready_fd):
+    """Entry point of a forked worker; never returns."""
+    from werkzeug.serving import make_server
+
+    configure_worker_threads(cpus, args.inter_op_threads)
+    flask_app.load_classifier_model()
+    if flask_app.model is None:
+        os._exit(3)
+
+    server = None
+    stopping = threading.Event()
+
+    def graceful_stop(*_):
+        if not stopping.is_set():
+            stopping.set()
+            threading.Thread(target=server.shutdown, daemon=True).start()
+
+    # Jitter the recycle point so workers don't all restart at once
+    max_requests = args.max_requests
+    if max_requests:
+        max_requests += random.randint(0, max(1, max_requests // 10))
+    counter = _RequestCounter(flask_app.app.wsgi_app, max_requests, graceful_stop)
+    flask_app.app.wsgi_app = counter
+
+    server = make_server(args.host, args.port, flask_app.app, threaded=True, fd=listen_fd)
+    signal.signal(signal.SIGTERM, graceful_stop)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    os.write(ready_fd, b'1')
+    os.close(ready_fd)
+    logging.info(f"Worker {index} (pid {os.getpid()}) serving on CPUs {cpus}")
+    server.serve_forever()
+
+    # Drain in-flight requests before exiting
+    deadline = time.monotonic() + args.graceful_timeout
+    while counter.in_flight and time.monotonic() < deadline:
+        time.sleep(0.05)
+    flask_app.batcher.stop()
+    logging.info(f"Worker {index} (pid {os.getpid()}) exiting after {counter.handled} requests")
+    os._exit(0)
+
+
+class Launcher:
+    """Parent process: owns the listening socket and keeps N workers alive."""
+
+    def __init__(self, args):
+        self.args = args
+        self.cpus = available_cpus()
+        self.slices = cpu_slices(self.cpus, args.workers)
+        self.workers = {}          # pid -> (index, started_at)
+        self.ready_count = 0
+        self.stopping = False
+        self.recycle_requested = False
+        self.failures = [0] * args.workers
+        self.respawn_at = {}       # index -> monotonic time its replacement is due
+
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind((args.host, args.port))
+        self.sock.listen(args.backlog)
+        self.sock.set_inheritable(True)
+        self.ready_r, self.ready_w = os.pipe()
+
+    def spawn(self, index):
+        pid = os.fork()
+        if pid == 0:
+            os.close(self.ready_r)
+            try:
+                run_worker(index, self.sock.fileno(), self.slices[index], self.args, self.ready_w)
+            except Exception as e:
+                logging.error(f"Worker {index} crashed: {e}")
+            os._exit(1)
+        self.workers[pid] = (index, time.monotonic())
+        return pid
+
+    def _on_sigterm(self, *_):
+        self.stopping = True
+
+    def _on_sighup(self, *_):
+        self.recycle_requested = True
+
+    def rolling_restart(self):
+        """Replace workers one at a time, waiting for each replacement to be ready."""
+        logging.info("Rolling restart of all workers")
+        for pid, (index, _) in list(self.workers.items()):
+            if self.stopping:
+                return
+            self.spawn(index)
+            self._wait_ready(self.ready_count + 1, timeout=self.args.graceful_timeout * 4)
+            self._terminate(pid)
+
+    def _terminate(self, pid):
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    def _drain_ready_pipe(self, timeout):
+        readable, _, _ = select.select([self.ready_r], [], [], timeout)
+        if readable:
+            self.ready_count += len(os.read(self.ready_r, 1024))
+
+    def _wait_ready(self, count, timeout):
+        deadline = time.monotonic() + timeout
+        while self.ready_count < count and time.monotonic() < deadline and not self.stopping:
+            self._drain_ready_pipe(0.1)
+            self._reap()
+
+    def _reap(self):
+        """Collect exited workers and schedule their replacements; never blocks."""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            index, started = self.workers.pop(pid, (None, 0.0))
+            if index is None or self.stopping:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            delay = 0
+            if code != 0 and time.monotonic() - started < 10:
+                # Back off a crash-looping worker without holding up the others
+                self.failures[index] += 1
+                delay = min(30, 2 ** self.failures[index])
+                logging.error(f"Worker {index} (pid {pid}) failed with {code}; respawning in {delay}s")
+            else:
+                self.failures[index] = 0
+            self.respawn_at[index] = time.monotonic() + delay
+        self._respawn_due()
+
+    def _respawn_due(self):
+        now = time.monotonic()
+        running = {i for i, _ in self.workers.values()}
+        for index, due in list(self.respawn_at.items()):
+            if self.stopping or due > now:
+                continue
+            del self.respawn_at[index]
+            if index not in running:
+                self.spawn(index)
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self._on_sigterm)
+        signal.signal(signal.SIGINT, self._on_sigterm)
+        signal.signal(signal.SIGHUP, self._on_sighup)
+
+        logging.info(f"Starting {self.args.workers} workers on {self.args.host}:{self.args.port}")
+        for index in range(self.args.workers):
+            self.spawn(index)
+
+        self._wait_ready(self.args.workers, timeout=300)
+        print(f"{self.ready_count}/{self.args.workers} workers ready on {self.args.host}:{self.args.port}")
+        if self.args.ready_file:
+            Path(self.args.ready_file).write_text(str(os.getpid()))
+
+        while not self.stopping:
+            if self.recycle_requested:
+                self.recycle_requested = False
+                self.rolling_restart()
+            self._drain_ready_pipe(0.5)
+            self._reap()
+
+        logging.info("Shutting down workers")
+        for pid in list(self.workers):
+            self._terminate(pid)
+        deadline = time.monotonic() + self.args.graceful_timeout
+        while self.workers and time.monotonic() < deadline:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid:
+                self.workers.pop(pid, None)
+            else:
+                time.sleep(0.05)
+        for pid in list(self.workers):
+            os.kill(pid, signal.SIGKILL)
+        self.sock.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Multi-process Cat vs Dog serving launcher")
+    parser.add_argument('--workers', type=int, default=LAUNCHER_CONFIG['workers'] or None,
+                        help='Number of worker processes (default: one per 4 CPUs)')
+    parser.add_argument('--host', default=LAUNCHER_CONFIG['host'])
+    parser.add_argument('--port', type=int, default=LAUNCHER_CONFIG['port'])
+    parser.add_argument('--model', help='Override serving.model_path')
+    parser.add_argument('--inter-op-threads', type=int, default=LAUNCHER_CONFIG['inter_op_threads'])
+    parser.add_argument('--max-requests', type=int, default=LAUNCHER_CONFIG['max_requests'],
+                        help='Recycle a worker after this many requests (0 = never)')
+    parser.add_argument('--graceful-timeout', type=float, default=LAUNCHER_CONFIG['graceful_timeout'])
+    parser.add_argument('--backlog', type=int, default=2048)
+    parser.add_argument('--ready-file', help='Write the launcher pid here once every worker is ready')
+    args = parser.parse_args(argv)
+    if not args.workers:
+        args.workers = max(1, len(available_cpus()) // 4)
+    return args
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format="[%(asctime)s] %(process)d %(levelname)s - %(message)s")
+    args = parse_args(argv)
+    if args.model:
+        flask_app.CONFIG['serving']['model_path'] = args.model
+
+    Launcher(args).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+import io
+import logging
+import os
+import tarfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src.Component.image_preprocessing import decode_image
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.bmp', '.gif')
+
+
+def _is_image_name(name):
+    base = os.path.basename(name)
+    return not base.startswith('.') and base.lower().endswith(IMAGE_EXTENSIONS)
+
+
+def _check_member_name(name):
+    """Refuse absolute or `..` member names; they are echoed back as result filenames."""
+    parts = name.replace('\\', '/').split('/')
+    if name.startswith(('/', '\\')) or '..' in parts or ':' in parts[0]:
+        raise ValueError(f"Unsafe path in archive: {name!r}")
+
+
+class UploadTooLarge(ValueError):
+    """A batch upload over the file-count or uncompressed-size limit (HTTP 413)."""
+
+
+def _check_limits(count, total_bytes, max_files, max_bytes):
+    if max_files is not None and count > max_files:
+        raise UploadTooLarge(f"Too many files (max {max_files})")
+    if max_bytes is not None and total_bytes > max_bytes:
+        raise UploadTooLarge(f"Upload too large (max {max_bytes} bytes uncompressed)")
+
+
+def _extract_zip(data, max_files=None, max_bytes=None):
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        members = [m for m in archive.infolist() if not m.is_dir() and _is_image_name(m.filename)]
+        for m in members:
+            _check_member_name(m.filename)
+        # Checked against the central directory before anything is decompressed;
+        # zipfile never inflates a member past its declared file_size
+        _check_limits(len(members), sum(m.file_size for m in members), max_files, max_bytes)
+        members.sort(key=lambda m: m.filename)
+        return [(m.filename, archive.read(m)) for m in members]
+
+
+def _extract_tar(data, max_files=None, max_bytes=None):
+    with tarfile.open(fileobj=io.BytesIO(data), mode='r:*') as archive:
+        members, total_bytes, scanned = [], 0, 0
+        # Headers are scanned one at a time, so a huge member count fails fast
+        for m in archive:
+            scanned += 1
+            if m.isfile() and _is_image_name(m.name):
+                _check_member_name(m.name)
+                members.append(m)
+                total_bytes += m.size
+            # Directories and skipped members are bounded too
+            _check_limits(len(members), total_bytes, max_files, max_bytes)
+            if max_files is not None and scanned > 2 * max_files + 64:
+                raise UploadTooLarge(f"Too many archive entries (max {max_files} files)")
+        members.sort(key=lambda m: m.name)
+        return [(m.name, archive.extractfile(m).read()) for m in members]
+
+
+def expand_uploads(uploads, max_files=None, max_bytes=None):
+    """
+    Turn a list of (filename, bytes) uploads into a flat list of image entries.
+
+    A single zip or tar upload is expanded into its image members (sorted by
+    member name so the response order is stable); anything else is passed
+    through unchanged and left for the decoder to accept or reject.
+
+    Raises:
+        ValueError: an archive member with an absolute or `..` path.
+        UploadTooLarge: more than `max_files` images, or more than `max_bytes`
+            of them uncompressed. Archives are checked from their member
+            headers before any member is read.
+    """
+    if len(uploads) == 1:
+        name, data = uploads[0]
+        if zipfile.is_zipfile(io.BytesIO(data)):
+            return _extract_zip(data, max_files, max_bytes)
+        try:
+            return _extract_tar(data, max_files, max_bytes)
+        except tarfile.TarError:
+            pass
+    _check_limits(len(uploads), sum(len(data) for _, data in uploads), max_files, max_bytes)
+    return list(uploads)
+
+
+def decode_batch(entries, image_size, max_workers=None):
+    """
+    Decode many images in parallel straight into one preallocated array.
+
+    Args:
+        entries: List of (filename, bytes).
+        image_size: Target (width, height) for every image.
+        max_workers: Thread pool size; PIL releases the GIL while decoding.
+
+    Returns:
+        (batch, ok_indices, errors) where `batch` is an (N, H, W, 3) uint8 array
+        of the decodable images, `ok_indices` maps each batch row back to its
+        position in `entries`, and `errors` maps failed positions to a message.
+    """
+    width, height = image_size
+    buffer = np.empty((len(entries), height, width, 3), dtype=np.uint8)
+
+    def _decode(i):
+        try:
+            decode_image(entries[i][1], image_size, out=buffer[i])
+            return None
+        except Exception as e:
+            return str(e)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(_decode, range(len(entries))))
+
+    ok_indices = [i for i, err in enumerate(results) if err is None]
+    errors = {i: err for i, err in enumerate(results) if err is not None}
+
+    # Only compact (copy) when some rows failed
+    batch = buffer[ok_indices] if errors else buffer
+
+    if errors:
+        logging.info(f"Batch decode: {len(ok_indices)} ok, {len(errors)} failed")
+    return batch, ok_indices, errors
@@ -0,0 +1,26 @@
+import os
+
+
+def available_cpus():
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def cpu_slices(cpus, workers):
+    """Split the CPU list into `workers` contiguous, disjoint slices (shared round-robin if fewer CPUs)."""
+    if workers > len(cpus):
+        return [[cpus[i % len(cpus)]] for i in range(workers)]
+    per_worker = len(cpus) // workers
+    return [cpus[i * per_worker:(i + 1) * per_worker] for i in range(workers)]
+
+
+def configure_worker_threads(cpus, inter_op_threads):
+    """Pin this process to `cpus` and size TensorFlow's pools to match. Must run before the model loads."""
+    if hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, cpus)
+    os.environ['OMP_NUM_THREADS'] = str(len(cpus))
+    import tensorflow as tf
+
+    tf.config.threading.set_intra_op_parallelism_threads(len(cpus))
+    tf.config.threading.set_inter_op_parallelism_threads(inter_op_threads)
@@ -6,20 +6,25 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from kaggle.api.kaggle_api_extended import KaggleApi
 import stat
+import time
 import logging
+from src.Component.dataset_sources import (
+    HttpSource, KaggleSource, LocalSource, count_images, extract_dataset, file_sha256, read_marker, write_marker
+)
+from src.config import Config
 from src.Exception import CustomException as cuexc
 
 
 class DownloadData:
-    """Class to handle dataset downloading from Kaggle"""
+    """Class to handle dataset downloading from Kaggle or a local/HTTP mirror"""
     
-    def __init__(self):
-        """Initialize the downloader with kaggle credentials"""
+    def __init__(self, config=None):
+        """Initialize the downloader with kaggle credentials and the configured source"""
+        self.download_config = (config or Config()).config.get('download', {})
         self.KAGGLE_CONFIG_DIR = Path.home() / '.kaggle'
         self.KAGGLE_JSON_FILE_PATH = self.KAGGLE_CONFIG_DIR / 'kaggle.json'
-        self.DATASET_NAME = 'shaunthesheep/microsoft-catsvsdogs-dataset'
+        self.DATASET_NAME = self.download_config.get('dataset', 'shaunthesheep/microsoft-catsvsdogs-dataset')
         
         # Use absolute path based on project root
         project_root = Path(__file__).parent.parent.parent
@@ -43,6 +48,9 @@ class DownloadData:
         os.environ['KAGGLE_CONFIG_DIR'] = str(self.KAGGLE_CONFIG_DIR)
         
         try:
+            # Imported here: importing the kaggle package authenticates as a side effect
+            from kaggle.api.kaggle_api_extended import KaggleApi
+
             self.api = KaggleApi()
             self.api.authenticate()
             logging.info("✓ API successfully authenticated")
@@ -51,6 +59,12 @@ class DownloadData:
     
     def is_dataset_complete(self):
         """Check if dataset is already downloaded and complete"""
+        # O(1): a finished download leaves a completion marker with its file counts
+        marker = read_marker(self.DATASET_EXTRACT_PATH)
+        if marker is not None:
+            counts = marker['counts']
+            return True, f"Dataset complete - Cats: {counts['Cat']}, Dogs: {counts['Dog']}, Total: {sum(counts.values())}"
+
         logging.info("Checking if dataset exists...")
         
         # Check if extract path exists
@@ -76,11 +90,8 @@ class DownloadData:
         logging.info(f"Both Cat and Dog folders found")
         
         # Count files in each folder (support multiple formats)
-        cat_files = list(cat_folder.glob('*.*'))
-        dog_files = list(dog_folder.glob('*.*'))
-        
-        cat_count = len([f for f in cat_files if f.suffix.lower() in ['.jpg', '.jpeg', '.png']])
-        dog_count = len([f for f in dog_files if f.suffix.lower() in ['.jpg', '.jpeg', '.png']])
+        counts = count_images(self.DATASET_EXTRACT_PATH)
+        cat_count, dog_count = counts['Cat'], counts['Dog']
         
         logging.info(f"Cat images found: {cat_count}")
         logging.info(f"Dog images found: {dog_count}")
@@ -89,10 +100,36 @@ class DownloadData:
             logging.info(f"No images found")
             return False, "No images found in Cat or Dog folder"
         
-        # If all checks pass
+        # If all checks pass; record it so later checks are O(1)
+        write_marker(self.DATASET_EXTRACT_PATH, 'existing', None, counts)
         total_count = cat_count + dog_count
         logging.info(f"Dataset is complete!")
         return True, f"Dataset complete - Cats: {cat_count}, Dogs: {dog_count}, Total: {total_count}"
+
+    def get_source(self):
+        """The configured dataset source: "kaggle", "http" (mirror URL) or "local" (archive or directory)."""
+        kind = self.download_config.get('source', 'kaggle')
+        if kind == 'kaggle':
+            return KaggleSource(self, self.DATASET_NAME)
+        if kind == 'http':
+            return HttpSource(self.download_config['url'])
+        if kind == 'local':
+            return LocalSource(self.download_config['path'])
+        raise ValueError(f"Unknown dataset source: {kind!r} (expected 'kaggle', 'http' or 'local')")
+
+    def verify_archive(self, archive):
+        """Check the archive against the configured sha256 (if any) and return its digest."""
+        if archive.is_dir():
+            return None
+        digest = file_sha256(archive)
+        expected = self.download_config.get('sha256')
+        if expected and digest != expected.lower():
+            # A corrupt archive must not be resumed from, so drop it
+            if archive.parent == self.DOWNLOAD_PATH:
+                archive.unlink()
+            raise ValueError(f"Checksum mismatch for {archive}: expected {expected}, got {digest}")
+        logging.info(f"Archive sha256 {digest}" + (" verified" if expected else " (no expected checksum configured)"))
+        return digest
     
     def download_dataset(self):
         """Download and extract the dataset"""
@@ -105,33 +142,33 @@ class DownloadData:
             logging.info(f"{message}")
             logging.info("Download skipped - using existing dataset")
         else:
-            logging.info(f"Downloading: {self.DATASET_NAME}")
             print(f"   Destination: {self.DOWNLOAD_PATH.absolute()}\n")
             
             self.DOWNLOAD_PATH.mkdir(parents=True, exist_ok=True)
             
             try:
-                self.api.dataset_download_files(
-                    self.DATASET_NAME,
-                    path=str(self.DOWNLOAD_PATH),
-                    unzip=True
-                )
+                source = self.get_source()
+                logging.info(f"Downloading: {source.describe()}")
+                archive = Path(source.fetch(self.DOWNLOAD_PATH))
                 logging.info("Download complete!")
-                
-                # Verify download
-                if self.DATASET_EXTRACT_PATH.exists():
-                    file_count = sum([len(files) for r, d, files in os.walk(self.DATASET_EXTRACT_PATH)])
-                    logging.info(f"Dataset verified - {file_count} files found")
-                else:
-                    logging.warning("Dataset folder not found after extraction")
+                digest = self.verify_archive(archive)
+
+                started = time.perf_counter()
+                extract_dataset(archive, self.DATASET_EXTRACT_PATH, self.download_config.get('extract_workers', 8))
+                counts = count_images(self.DATASET_EXTRACT_PATH)
+                write_marker(self.DATASET_EXTRACT_PATH, source.describe(), digest, counts)
+                logging.info(f"Dataset verified - {counts} images extracted in {time.perf_counter() - started:.1f}s")
                     
             except Exception as e:
                 raise cuexc(f"Error downloading: {e}", sys)
     
     def run(self):
         """Run the complete download process"""
-        self.check_kaggle_json()
-        self.authenticate_kaggle()
+        # A complete local dataset needs no credentials or network
+        is_complete, message = self.is_dataset_complete()
+        if is_complete:
+            logging.info(f"{message} - download skipped")
+            return self.DATASET_EXTRACT_PATH
         self.download_dataset()
         return self.DATASET_EXTRACT_PATH
 
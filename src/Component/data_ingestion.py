@@ -5,16 +5,36 @@ import os
 import sys
 from PIL import Image
 import logging
-from src.Component.data_transformation import DataTransformation
+from src.Component.data_stages import build_data_stages, split_listing
+from src.Component.dataset_shards import shard_generators, shard_test_split
+from src.Component.tf_data_pipeline import list_split_files, split_subset, tf_data_generators, tf_data_test_split
+from src.config import Config
+
+FULL_SIZE = (150, 150)
 
 class DataGenerator:
-    def __init__(self):
-        self.data_transformation = DataTransformation()
-        self.train_dir,self.test_dir = self.data_transformation.split_data()
-        self.TARGET_SIZE = (150,150)
-        self.BATCH_SIZE = 32
+    def __init__(self, backend=None, batch_size=None, target_size=None, seed=None, num_shards=1, shard_index=0):
+        # Smaller than FULL_SIZE for the low-resolution stages of progressive training
+        self.TARGET_SIZE = tuple(target_size or FULL_SIZE)
+        self.BATCH_SIZE = batch_size or 32
         self.VALIDATION_SPLIT = 0.2
 
+        # "keras" (ImageDataGenerator), "tfdata" or "shards"
+        self.data_config = Config()['data']
+        self.backend = backend or self.data_config.get('backend', 'keras')
+        # Shuffle and augmentation seed of the tfdata and shards pipelines
+        self.seed = seed if seed is not None else self.data_config.get('seed')
+        # Data-parallel workers: the tfdata/shards train and validation pipelines read only this shard
+        self.num_shards = num_shards
+        self.shard_index = shard_index
+        if self.backend not in ('keras', 'tfdata', 'shards'):
+            raise ValueError(f"Unknown data backend: {self.backend!r} (expected 'keras', 'tfdata' or 'shards')")
+
+        # Nothing is downloaded, validated or split until a generator is requested
+        # Shards are always packed at full size and shrunk on read
+        self.stages = build_data_stages(target_size=FULL_SIZE)
+        self._split = None
+
         self.train_datagen = ImageDataGenerator(
             preprocessing_function = preprocess_input,
             rotation_range = 10,
@@ -23,7 +43,54 @@ class DataGenerator:
             validation_split = self.VALIDATION_SPLIT
         )
 
+    @property
+    def split(self):
+        """Artifacts of the (up-to-date) split stage."""
+        if self._split is None:
+            self._split = self.stages.require('split')
+        return self._split
+
+    @property
+    def train_dir(self):
+        return self.split['train_dir']
+
+    @property
+    def test_dir(self):
+        return self.split['test_dir']
+
+    @property
+    def use_manifest(self):
+        # Without materialised split directories, read the split manifest directly
+        return self.split['materialize'] == 'none'
+
+    def split_files(self, split):
+        return split_listing(self.split, split)
+
+    def file_listing(self, split):
+        """(filepaths, labels, class_indices) of 'train' or 'test', from the manifest or the split directory."""
+        return self.split_files(split) or list_split_files(self.split[f'{split}_dir'])
+
+    def shards_dir(self):
+        """Make sure the shards are packed for the current split and return their root."""
+        self.stages.require('pack')
+        return self.data_config.get('shards_path', 'data/processed/shards')
+
+    def tfdata_cache(self):
+        cache = self.data_config.get('tfdata_cache', True)
+        if isinstance(cache, str) and self.TARGET_SIZE != FULL_SIZE:
+            # An on-disk cache holds decoded images of one size
+            cache = os.path.join(cache, '{}x{}'.format(*self.TARGET_SIZE))
+        return cache
+
     def data_generator(self):
+        if self.backend == 'tfdata':
+            return self.tf_data_generator()
+        if self.backend == 'shards':
+            return self.shard_generator()
+
+        if self.use_manifest:
+            return self.manifest_data_generator()
+
         generator = self.train_datagen
         train_dir = self.train_dir
         test_dir = self.test_dir
@@ -44,21 +111,104 @@ class DataGenerator:
             subset = 'validation'
         )
         logging.info("Validation Generator is complete")
-        test_generator = ImageDataGenerator(preprocessing_function=preprocess_input).flow_from_directory(
-            test_dir,
-            target_size=self.TARGET_SIZE,
-            batch_size=self.BATCH_SIZE,
-            class_mode='binary',
-            shuffle=False
-        )
-        logging.info("Test Generator is complete")
+        test_generator = self.test_generator()
         logging.info("Data generators created successfully")
         logging.info(f"Found {train_generat.samples} training images belonging to {train_generat.num_classes} classes.")
         logging.info(f"Found {validation_generat.samples} validation images belonging to {validation_generat.num_classes} classes.")
-        logging.info(f"Found {test_generator.samples} testing images belonging to {test_generator.num_classes} classes.")
         
         return train_generat, validation_generat, test_generator
 
+    def test_generator(self):
+        """Only the test split, for evaluation: skips listing and preparing the train split."""
+        if self.backend == 'tfdata':
+            test_generator = tf_data_test_split(
+                self.test_dir, self.TARGET_SIZE, self.BATCH_SIZE,
+                cache=self.tfdata_cache(), test_files=self.split_files('test'),
+            )
+        elif self.backend == 'shards':
+            test_generator = shard_test_split(self.shards_dir(), self.BATCH_SIZE, self.TARGET_SIZE)
+        elif self.use_manifest:
+            test_frame, test_classes = self._frame(self.split_files('test'))
+            test_generator = ImageDataGenerator(preprocessing_function=preprocess_input).flow_from_dataframe(
+                test_frame, classes=test_classes, shuffle=False, **self._frame_options()
+            )
+        else:
+            test_generator = ImageDataGenerator(preprocessing_function=preprocess_input).flow_from_directory(
+                self.test_dir,
+                target_size=self.TARGET_SIZE,
+                batch_size=self.BATCH_SIZE,
+                class_mode='binary',
+                shuffle=False
+            )
+        logging.info("Test Generator is complete")
+        logging.info(f"Found {test_generator.samples} testing images belonging to {test_generator.num_classes} classes.")
+        return test_generator
+
+    @staticmethod
+    def _frame(files):
+        import pandas as pd
+
+        filepaths, labels, class_indices = files
+        classes = list(class_indices)
+        return pd.DataFrame({'filename': filepaths, 'class': [classes[i] for i in labels]}), classes
+
+    def _frame_options(self):
+        return dict(
+            x_col='filename', y_col='class', target_size=self.TARGET_SIZE, batch_size=self.BATCH_SIZE,
+            class_mode='binary', validate_filenames=False,
+        )
+
+    def manifest_data_generator(self):
+        """Keras iterators over the split manifest, with the same per-class validation split as flow_from_directory."""
+        filepaths, labels, class_indices = self.split_files('train')
+        train_frame, classes = self._frame(split_subset(filepaths, labels, self.VALIDATION_SPLIT, 'training') + (class_indices,))
+        validation_frame, _ = self._frame(split_subset(filepaths, labels, self.VALIDATION_SPLIT, 'validation') + (class_indices,))
+
+        # Subsets are already split per class, so no `subset=` here
+        train_generat = self.train_datagen.flow_from_dataframe(train_frame, classes=classes, **self._frame_options())
+        validation_generat = self.train_datagen.flow_from_dataframe(validation_frame, classes=classes, **self._frame_options())
+        test_generator = self.test_generator()
+        logging.info(f"Found {train_generat.samples} training images belonging to {train_generat.num_classes} classes.")
+        logging.info(f"Found {validation_generat.samples} validation images belonging to {validation_generat.num_classes} classes.")
+        return train_generat, validation_generat, test_generator
+
+    def tf_data_generator(self):
+        """Same (train, validation, test) triple and class indices, built on parallel tf.data pipelines."""
+        train_ds, validation_ds, test_ds = tf_data_generators(
+            self.train_dir,
+            self.test_dir,
+            target_size=self.TARGET_SIZE,
+            batch_size=self.BATCH_SIZE,
+            validation_split=self.VALIDATION_SPLIT,
+            cache=self.tfdata_cache(),
+            shuffle_buffer=self.data_config.get('shuffle_buffer', 2048),
+            seed=self.seed,
+            train_files=self.split_files('train'),
+            test_files=self.split_files('test'),
+            num_shards=self.num_shards,
+            shard_index=self.shard_index,
+        )
+        logging.info(f"Found {train_ds.samples} training images belonging to {train_ds.num_classes} classes.")
+        logging.info(f"Found {validation_ds.samples} validation images belonging to {validation_ds.num_classes} classes.")
+        logging.info(f"Found {test_ds.samples} testing images belonging to {test_ds.num_classes} classes.")
+        return train_ds, validation_ds, test_ds
+
+    def shard_generator(self):
+        """Same triple, read zero-copy from pre-resized memory-mapped shards (the pack stage refreshes them)."""
+        train_ds, validation_ds, test_ds = shard_generators(
+            self.shards_dir(),
+            batch_size=self.BATCH_SIZE,
+            validation_split=self.VALIDATION_SPLIT,
+            seed=self.seed,
+            target_size=self.TARGET_SIZE,
+            num_shards=self.num_shards,
+            shard_index=self.shard_index,
+        )
+        logging.info(f"Found {train_ds.samples} training images belonging to {train_ds.num_classes} classes.")
+        logging.info(f"Found {validation_ds.samples} validation images belonging to {validation_ds.num_classes} classes.")
+        logging.info(f"Found {test_ds.samples} testing images belonging to {test_ds.num_classes} classes.")
+        return train_ds, validation_ds, test_ds
+
 # if __name__ == "__main__":
 #     import sys
 #     # Add project root to path
@@ -0,0 +1,117 @@
+import os
+
+from src.Component.dataset_sources import MARKER_FILE
+from src.Component.stage_runner import Stage, StageRunner, tree_fingerprint
+from src.config import Config
+
+CLASSES = ('Cat', 'Dog')
+
+
+def split_listing(split_artifacts, split):
+    """
+    (filepaths, labels, class_indices) of `split` when the split is only recorded in
+    the manifest, or None when it is materialised as directories.
+    """
+    if split_artifacts['materialize'] != 'none':
+        return None
+    from src.Component.split_manifest import SplitManifest
+
+    return SplitManifest(split_artifacts['manifest']).split_files(split_artifacts['source_dir'], split)
+
+
+def build_data_stages(config=None, target_size=(150, 150)):
+    """
+    The data pipeline as explicit stages: download -> validate -> split -> pack.
+
+    Components are imported inside each stage, so a consumer that only needs
+    an up-to-date split never imports the Kaggle client or the packer.
+    """
+    config = config or Config()
+    data_config = config['data']
+    download_config = config.config.get('download', {})
+    validation_config = data_config.get('validation', {})
+    runner = StageRunner(data_config.get('stage_state', 'data/processed/stages.json'))
+
+    def download(_):
+        from src.Component.data_download import DownloadData
+
+        return {'dataset_dir': str(DownloadData(config).run())}
+
+    def validate(upstream):
+        from src.Component.image_validator import ImageValidator
+
+        dataset_dir = upstream['download']['dataset_dir']
+        validator = ImageValidator(
+            validation_config.get('cache_path', 'data/processed/validation_cache.json'),
+            validation_config.get('quarantine_dir', 'data/quarantine'),
+            validation_config.get('workers'),
+        )
+        report = validator.scan([os.path.join(dataset_dir, cls) for cls in CLASSES])
+        return {'dataset_dir': dataset_dir, 'bad': report['bad']}
+
+    def split(upstream):
+        from src.Component.data_transformation import DataTransformation
+
+        transformation = DataTransformation(data_path=upstream['validate']['dataset_dir'])
+        train_dir, test_dir = transformation.split_data(validate=False)
+        return {
+            'source_dir': str(transformation.data_path),
+            'manifest': transformation.manifest.manifest_path,
+            'materialize': transformation.materialize,
+            'train_dir': train_dir,
+            'test_dir': test_dir,
+        }
+
+    def split_outputs(artifacts):
+        if artifacts['materialize'] == 'none':
+            return tree_fingerprint(artifacts['manifest'])
+        return tree_fingerprint(artifacts['manifest'], artifacts['train_dir'], artifacts['test_dir'])
+
+    def pack(upstream):
+        from src.Component.dataset_shards import pack_split
+
+        split_artifacts = upstream['split']
+        shards_dir = data_config.get('shards_path', 'data/processed/shards')
+        artifacts = {}
+        for split_name in ('train', 'test'):
+            files = split_listing(split_artifacts, split_name)
+            # Manifest paths are relative to the raw dataset, so shard indices are keyed from there
+            base = split_artifacts['source_dir'] if files else split_artifacts[f'{split_name}_dir']
+            out_dir = os.path.join(shards_dir, split_name)
+            pack_split(base, out_dir, target_size, data_config.get('shard_size', 2048), files=files)
+            artifacts[split_name] = out_dir
+        return artifacts
+
+    runner.add(Stage(
+        'download', download,
+        params={key: download_config.get(key) for key in ('source', 'dataset', 'url', 'path', 'sha256')},
+        # The completion marker stands for the whole download, so this check is O(1)
+        outputs_fingerprint=lambda a: tree_fingerprint(os.path.join(a['dataset_dir'], MARKER_FILE)),
+    ))
+    runner.add(Stage(
+        'validate', validate, deps=('download',),
+        # Catches images added to or removed from the dataset after download
+        outputs_fingerprint=lambda a: tree_fingerprint(a['dataset_dir']),
+    ))
+    runner.add(Stage(
+        'split', split, deps=('validate',),
+        params={
+            'manifest': data_config.get('split_manifest', 'data/processed/split_manifest.csv'),
+            'materialize': data_config.get('split_materialize', 'hardlink'),
+            'train_ratio': 0.8,
+            'seed': 42,
+        },
+        outputs_fingerprint=split_outputs,
+    ))
+    runner.add(Stage(
+        'pack', pack, deps=('split',),
+        params={
+            'target_size': list(target_size),
+            'shard_size': data_config.get('shard_size', 2048),
+            'shards_path': data_config.get('shards_path', 'data/processed/shards'),
+        },
+        outputs_fingerprint=lambda a: tree_fingerprint(
+            *(os.path.join(a[split_name], 'index.json') for split_name in ('train', 'test'))
+        ),
+    ))
+    return runner
@@ -1,15 +1,32 @@
-from src.Component.data_download import DownloadData
+from src.Component.image_validator import ImageValidator
+from src.Component.split_manifest import SplitManifest
+from src.config import Config
 from src.Exception import CustomException as cuexc
 import os
 import logging
 from dataclasses import dataclass
-import sys,random,shutil
-from PIL import Image
+import sys
 
 class DataTransformation:
-    def __init__(self):
-        self.download_data = DownloadData()
-        self.data_path=self.download_data.run()
+    def __init__(self, data_path=None):
+        # The data stages pass the downloaded dataset in; standalone use downloads it here
+        if data_path is None:
+            from src.Component.data_download import DownloadData
+
+            self.download_data = DownloadData()
+            data_path = self.download_data.run()
+        self.data_path = data_path
+        data_config = Config()['data']
+        self.output_dir = 'data/processed/cat-dog-split'
+        self.manifest = SplitManifest(data_config.get('split_manifest', 'data/processed/split_manifest.csv'))
+        # "hardlink", "symlink", "copy" or "none" (readers use the manifest directly)
+        self.materialize = data_config.get('split_materialize', 'hardlink')
+        validation_config = data_config.get('validation', {})
+        self.validator = ImageValidator(
+            validation_config.get('cache_path', 'data/processed/validation_cache.json'),
+            validation_config.get('quarantine_dir', 'data/quarantine'),
+            validation_config.get('workers'),
+        )
     
     def run(self):
         try:
@@ -19,55 +36,34 @@ class DataTransformation:
         except Exception as e:
             raise cuexc(e, sys)
 
-    def remove_corrupted_images(self,directory):
-        print(f"Checking for corrupted images in: {directory}")
-        for root, _, files in os.walk(directory):
-            for file in files:
-                if file.lower().endswith(('.png', '.jpg', '.jpeg')):
-                    filepath = os.path.join(root, file)
-                    try:
-                        img = Image.open(filepath)
-                        img.verify() # Verify if it's a valid image
-                    except (IOError, SyntaxError, Image.UnidentifiedImageError) as e:
-                        print(f"Deleting corrupted image: {filepath} ({e})")
-                        os.remove(filepath)
+    def remove_corrupted_images(self,directories):
+        """Quarantine images that fail to verify or decode; unchanged files are served from the validation cache."""
+        return self.validator.scan(directories)
     
-    def split_data(self):
+    def split_data(self, validate=True):
         try:
             logging.info("Splitting data started")
             source_dir = self.data_path
-            output_dir = 'data/processed/cat-dog-split'
+            output_dir = self.output_dir
             
             #train and test ratio
             train_ratio = 0.8
             test_ratio = 0.2
             
             classes = ['Cat', 'Dog']
-            random.seed(42)
-            for cls in classes:
-                cls_path = os.path.join(source_dir,cls)
-
-                self.remove_corrupted_images(cls_path)
-
-                images = os.listdir(cls_path)
-                random.shuffle(images)
-                
-                train_count = int(len(images)*train_ratio)
-                train_images = images[:train_count]
-                test_images = images[train_count:]
+            if self.manifest.is_current(source_dir, classes, output_dir, self.materialize):
+                logging.info(f"Split manifest {self.manifest.manifest_path} is current, skipping split")
+            else:
+                if validate:
+                    self.remove_corrupted_images([os.path.join(source_dir,cls) for cls in classes])
 
-                train_dir = os.path.join(output_dir,'train',cls)
-                test_dir = os.path.join(output_dir,'test',cls)
-                os.makedirs(train_dir,exist_ok=True)
-                os.makedirs(test_dir,exist_ok=True)
+                self.manifest.build(source_dir, classes, train_ratio=train_ratio, seed=42)
+                self.manifest.write()
+                self.manifest.materialize(source_dir, output_dir, self.materialize)
 
-                for img in train_images:
-                    shutil.copy(os.path.join(cls_path,img),os.path.join(train_dir,img))
-                for img in test_images:
-                    shutil.copy(os.path.join(cls_path,img),os.path.join(test_dir,img))
-
-                logging.info(f"{cls} split completed")
-                logging.info(f"{cls} split completed")
+                for (split, cls), count in sorted(self.manifest.counts().items()):
+                    logging.info(f"{cls} {split}: {count} images")
+                logging.info(f"Split manifest written to {self.manifest.manifest_path} ({self.materialize})")
             logging.info("Data splitting completed")
             
             # Return the parent train and test directories
@@ -79,6 +75,10 @@ class DataTransformation:
         except Exception as e:
             raise cuexc(e,sys)
 
+    def split_files(self, split):
+        """(filepaths, labels, class_indices) of `split` read straight from the manifest."""
+        return self.manifest.split_files(self.data_path, split)
+
 
 # if __name__ == "__main__":
 #     data_transformation = DataTransformation()
@@ -0,0 +1,257 @@
+import hashlib
+import json
+import logging
+import math
+import multiprocessing
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import tensorflow as tf
+from PIL import Image
+
+from src.Component.tf_data_pipeline import (
+    attach_iterator_attributes, build_augmenter, list_split_files, model_input_fn, split_indices
+)
+
+INDEX_FILE = 'index.json'
+LABELS_FILE = 'labels.npy'
+INDEX_VERSION = 1
+
+
+def load_resized(path, target_size):
+    """Decode one image and resize it like flow_from_directory (RGB, nearest-neighbour)."""
+    height, width = target_size
+    with Image.open(path) as image:
+        image = image.convert('RGB')
+        if image.size != (width, height):
+            image = image.resize((width, height), Image.NEAREST)
+        return np.asarray(image, dtype=np.uint8)
+
+
+def _shard_name(shard_id):
+    return f'shard_{shard_id:05d}.npy'
+
+
+def _file_entry(directory, path, label):
+    stat = os.stat(path)
+    return {
+        'path': os.path.relpath(path, directory),
+        'label': int(label),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+    }
+
+
+def _shard_fingerprint(entries, target_size):
+    digest = hashlib.sha1(json.dumps(list(target_size)).encode())
+    for entry in entries:
+        digest.update(f"{entry['path']}\0{entry['size']}\0{entry['mtime_ns']}\n".encode())
+    return digest.hexdigest()
+
+
+def _read_index(out_dir):
+    try:
+        with open(os.path.join(out_dir, INDEX_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_atomic_json(path, payload):
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(payload, f)
+    os.replace(tmp, path)
+
+
+def pack_split(split_dir, out_dir, target_size=(150, 150), shard_size=2048, max_workers=None, files=None):
+    """
+    Pack `split_dir/<class>/*` into pre-resized uint8 shards under `out_dir`.
+
+    Each file is assigned to a shard by a stable hash of its relative path, so
+    adding, removing or touching images only rewrites the shards that contain
+    them. A shard is rebuilt when the (path, size, mtime) fingerprint of its
+    members changes; everything else is reused as is. `files` is an optional
+    (filepaths, labels, class_indices) listing under `split_dir` to pack instead
+    of walking it.
+
+    Layout:
+        shard_XXXXX.npy  (n, H, W, 3) uint8 arrays, readable with mmap
+        labels.npy       int32 label per image, in flow_from_directory order
+        index.json       class indices, per-file shard/offset and shard fingerprints
+
+    Returns:
+        Number of shards rewritten.
+    """
+    target_size = tuple(int(v) for v in target_size)
+    os.makedirs(out_dir, exist_ok=True)
+    filepaths, labels, class_indices = files or list_split_files(split_dir)
+    entries = [_file_entry(split_dir, path, label) for path, label in zip(filepaths, labels)]
+
+    previous = _read_index(out_dir)
+    reusable = (
+        previous is not None
+        and previous.get('version') == INDEX_VERSION
+        and tuple(previous.get('target_size', ())) == target_size
+        # Keep the shard count stable until the split outgrows it
+        and len(entries) <= 2 * previous['num_shards'] * shard_size
+    )
+    num_shards = previous['num_shards'] if reusable else max(1, math.ceil(len(entries) / shard_size))
+    old_shards = {s['name']: s for s in previous['shards']} if reusable else {}
+
+    members = [[] for _ in range(num_shards)]
+    for position, entry in enumerate(entries):
+        members[zlib.crc32(entry['path'].encode()) % num_shards].append(position)
+
+    shards, stale = [], []
+    for shard_id, positions in enumerate(members):
+        name = _shard_name(shard_id)
+        fingerprint = _shard_fingerprint([entries[p] for p in positions], target_size)
+        old = old_shards.get(name)
+        if old is None or old['fingerprint'] != fingerprint or not os.path.exists(os.path.join(out_dir, name)):
+            stale.append(shard_id)
+        shards.append({'name': name, 'count': len(positions), 'fingerprint': fingerprint})
+        for offset, position in enumerate(positions):
+            entries[position]['shard'] = shard_id
+            entries[position]['offset'] = offset
+
+    if stale:
+        logging.info(f"Packing {len(stale)}/{num_shards} shards of {split_dir} into {out_dir}")
+        # Spawned, not forked: TensorFlow is already imported here and its threads do not survive a fork
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            for shard_id in stale:
+                paths = [filepaths[p] for p in members[shard_id]]
+                target = os.path.join(out_dir, _shard_name(shard_id))
+                tmp = f'{target}.tmp'
+                array = np.lib.format.open_memmap(
+                    tmp, mode='w+', dtype=np.uint8, shape=(len(paths), *target_size, 3)
+                )
+                images = pool.map(load_resized, paths, [target_size] * len(paths), chunksize=32)
+                for offset, image in enumerate(images):
+                    array[offset] = image
+                array.flush()
+                del array
+                os.replace(tmp, target)
+
+    np.save(os.path.join(out_dir, LABELS_FILE), labels.astype(np.int32))
+    _write_atomic_json(os.path.join(out_dir, INDEX_FILE), {
+        'version': INDEX_VERSION,
+        'target_size': list(target_size),
+        'class_indices': class_indices,
+        'num_shards': num_shards,
+        'shards': shards,
+        'files': entries,
+    })
+    for name in os.listdir(out_dir):
+        if name.startswith('shard_') and name.endswith('.npy') and int(name[6:11]) >= num_shards:
+            os.remove(os.path.join(out_dir, name))
+    if not stale:
+        logging.info(f"Shards in {out_dir} are up to date ({len(entries)} images)")
+    return len(stale)
+
+
+class ShardStore:
+    """Read-only, memory-mapped view over a directory written by pack_split."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        index = _read_index(directory)
+        if index is None or index.get('version') != INDEX_VERSION:
+            raise FileNotFoundError(f"No shard index found in {directory}; run pack_split first")
+        self.target_size = tuple(index['target_size'])
+        self.class_indices = index['class_indices']
+        self.filenames = [entry['path'] for entry in index['files']]
+        self.labels = np.load(os.path.join(directory, LABELS_FILE))
+        self.shard_ids = np.asarray([entry['shard'] for entry in index['files']], dtype=np.int64)
+        self.offsets = np.asarray([entry['offset'] for entry in index['files']], dtype=np.int64)
+        self.shards = [np.load(os.path.join(directory, s['name']), mmap_mode='r') for s in index['shards']]
+
+    def __len__(self):
+        return len(self.labels)
+
+    def take(self, indices):
+        """Gather images by global index into one (n, H, W, 3) uint8 batch."""
+        indices = np.asarray(indices, dtype=np.int64)
+        out = np.empty((len(indices), *self.target_size, 3), dtype=np.uint8)
+        shard_ids = self.shard_ids[indices]
+        for shard_id in np.unique(shard_ids):
+            rows = np.flatnonzero(shard_ids == shard_id)
+            out[rows] = self.shards[shard_id][self.offsets[indices[rows]]]
+        return out
+
+    def dataset(self, indices, batch_size, training, augmenter=None, seed=None, target_size=None,
+                num_shards=1, shard_index=0):
+        """
+        Batched tf.data pipeline over `indices` of this store.
+
+        Only indices are shuffled; each batch is one gather from the memory-mapped
+        shards, then augmented and scaled like the tf.data backend. A
+        `target_size` other than the packed size resizes each gathered batch.
+        With `num_shards` > 1 only every `num_shards`-th index (from
+        `shard_index`) is used, so data-parallel workers read disjoint images.
+        A seeded training dataset gets `from_batch(n)`, the same stream started
+        at batch `n`; skipping only shuffles indices.
+        """
+        autotune = tf.data.AUTOTUNE
+        indices = np.asarray(indices, dtype=np.int64)
+        split_samples = len(indices)
+        indices = indices[shard_index::num_shards]
+        labels = self.labels[indices]
+        height, width = self.target_size
+
+        def gather(batch_indices, batch_labels):
+            images = tf.numpy_function(self.take, [batch_indices], tf.uint8, stateful=False)
+            images.set_shape((None, height, width, 3))
+            if target_size is not None and tuple(target_size) != self.target_size:
+                images = tf.image.resize(images, target_size, method='nearest')
+            return images, batch_labels
+
+        def from_batch(start_batch=0):
+            # A fresh pipeline each call: iterating a dataset advances its shuffle seed
+            dataset = tf.data.Dataset.from_tensor_slices((indices, labels.astype(np.float32)))
+            if training:
+                dataset = dataset.shuffle(len(indices), seed=seed, reshuffle_each_iteration=True).repeat()
+            dataset = dataset.batch(batch_size, drop_remainder=False)
+            if start_batch:
+                dataset = dataset.skip(start_batch)
+            dataset = dataset.map(gather, num_parallel_calls=autotune, deterministic=not training or seed is not None)
+            return dataset.map(model_input_fn(training, augmenter), num_parallel_calls=autotune).prefetch(autotune)
+
+        dataset = attach_iterator_attributes(
+            from_batch(), labels, self.class_indices, batch_size, [self.filenames[i] for i in indices],
+            num_shards, shard_index, split_samples,
+        )
+        if training and seed is not None:
+            dataset.from_batch = from_batch
+        return dataset
+
+
+def shard_test_split(shards_dir, batch_size, target_size=None):
+    """The packed test split alone: file order, no augmentation, one pass."""
+    store = ShardStore(os.path.join(shards_dir, 'test'))
+    return store.dataset(np.arange(len(store)), batch_size, False, target_size=target_size)
+
+
+def shard_generators(shards_dir, batch_size, validation_split, seed=None, target_size=None, num_shards=1,
+                     shard_index=0):
+    """
+    Return (train, validation, test) datasets read from the memory-mapped shards under `shards_dir`.
+
+    `num_shards`/`shard_index` shard train and validation (see ShardStore.dataset); test is never sharded.
+    """
+    train_store = ShardStore(os.path.join(shards_dir, 'train'))
+    augmenter = build_augmenter(seed=seed)
+    train = train_store.dataset(
+        split_indices(train_store.labels, validation_split, 'training'), batch_size, True, augmenter, seed,
+        target_size, num_shards, shard_index,
+    )
+    # Validation mirrors ImageDataGenerator's subset iterator: shuffled, repeating, and augmented
+    validation = train_store.dataset(
+        split_indices(train_store.labels, validation_split, 'validation'), batch_size, True, augmenter, seed,
+        target_size, num_shards, shard_index,
+    )
+    test = shard_test_split(shards_dir, batch_size, target_size)
+    logging.info(f"Shard pipelines ready: {train.samples} train, {validation.samples} validation, {test.samples} test")
+    return train, validation, test
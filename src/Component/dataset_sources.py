@@ -0,0 +1,272 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tarfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+CLASSES = ('Cat', 'Dog')
+MARKER_FILE = '.complete.json'
+IMAGE_SUFFIXES = ('.jpg', '.jpeg', '.png')
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_complete_zip(path):
+    """True when `path` is a zip with an end-of-archive record and every member passes its CRC check."""
+    try:
+        with zipfile.ZipFile(path) as zf:
+            return zf.testzip() is None
+    except (OSError, zipfile.BadZipFile, EOFError):
+        return False
+
+
+class KaggleSource:
+    """The dataset archive from the Kaggle API (needs ~/.kaggle/kaggle.json)."""
+
+    def __init__(self, downloader, dataset):
+        self.downloader = downloader
+        self.dataset = dataset
+
+    def describe(self):
+        return f'kaggle:{self.dataset}'
+
+    def fetch(self, download_dir):
+        """
+        The downloaded archive. The Kaggle client cannot resume: with force=False
+        it reuses whatever file is on disk, including one cut short by an
+        interrupted download. So an existing archive is only reused when it is
+        a complete, CRC-clean zip; otherwise it is deleted and fetched again.
+        """
+        self.downloader.check_kaggle_json()
+        self.downloader.authenticate_kaggle()
+        archive = Path(download_dir) / f"{self.dataset.split('/')[-1]}.zip"
+        if archive.exists() and not is_complete_zip(archive):
+            logging.warning(f"Discarding incomplete archive {archive} from an interrupted download")
+            archive.unlink()
+        self.downloader.api.dataset_download_files(self.dataset, path=str(download_dir), unzip=False, force=False)
+        if not is_complete_zip(archive):
+            archive.unlink(missing_ok=True)
+            raise ValueError(f"Downloaded archive {archive} is incomplete or corrupt; it was deleted, retry the download")
+        return archive
+
+
+class HttpSource:
+    """An archive on an HTTP(S) mirror, downloaded to a `.part` file and resumed with Range requests."""
+
+    def __init__(self, url, timeout=60.0, chunk_size=1 << 20):
+        self.url = url
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+
+    def describe(self):
+        return self.url
+
+    def fetch(self, download_dir):
+        target = Path(download_dir) / (Path(self.url.split('?')[0]).name or 'dataset.zip')
+        if target.exists():
+            return target
+        part = target.with_name(target.name + '.part')
+        offset = part.stat().st_size if part.exists() else 0
+        request = urllib.request.Request(self.url, headers={'Range': f'bytes={offset}-'} if offset else {})
+        try:
+            response = urllib.request.urlopen(request, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            if e.code != 416:  # Range Not Satisfiable: the .part file is already complete
+                raise
+            os.replace(part, target)
+            return target
+        with response:
+            if offset and response.status != 206:
+                logging.info(f"{self.url} does not support resuming, restarting download")
+                offset = 0
+            elif offset:
+                logging.info(f"Resuming {self.url} at {offset / 2**20:.1f} MB")
+            with open(part, 'ab' if offset else 'wb') as f:
+                for chunk in iter(lambda: response.read(self.chunk_size), b''):
+                    f.write(chunk)
+        os.replace(part, target)
+        return target
+
+
+class LocalSource:
+    """An archive file or an already-extracted dataset directory on local disk (air-gapped nodes, tests)."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def describe(self):
+        return f'local:{self.path}'
+
+    def fetch(self, download_dir):
+        if not self.path.exists():
+            raise FileNotFoundError(f"Local dataset source not found: {self.path}")
+        return self.path
+
+
+def _dataset_root(names):
+    """Archive prefix above the Cat/ and Dog/ folders, e.g. 'PetImages/'."""
+    for name in names:
+        parts = name.split('/')
+        for i, part in enumerate(parts[:-1]):
+            if part in CLASSES:
+                return '/'.join(parts[:i]) + '/' if i else ''
+    raise ValueError("Archive has no Cat/ or Dog/ folder")
+
+
+def _safe_target(out_dir, relative):
+    """`out_dir / relative`, refusing member names that would land outside `out_dir` (zip-slip)."""
+    parts = relative.replace('\\', '/').split('/')
+    if relative.startswith(('/', '\\')) or '..' in parts or ':' in parts[0]:
+        raise ValueError(f"Unsafe path in dataset archive: {relative!r}")
+    target = out_dir / relative
+    if not target.resolve().is_relative_to(out_dir.resolve()):
+        raise ValueError(f"Unsafe path in dataset archive: {relative!r}")
+    return target
+
+
+def _members(names, root):
+    """(archive name, path relative to the dataset root) for every file under the class folders."""
+    members = []
+    for name in names:
+        if name.endswith('/') or not name.startswith(root):
+            continue
+        relative = name[len(root):]
+        if relative.split('/')[0] in CLASSES:
+            members.append((name, relative))
+    return members
+
+
+def _extract_zip(archive, out_dir, workers):
+    with zipfile.ZipFile(archive) as zf:
+        infos = {info.filename: info for info in zf.infolist()}
+    members = _members(list(infos), _dataset_root(list(infos)))
+    # Checked up front, so a hostile archive is rejected before anything is written
+    targets = {name: _safe_target(out_dir, relative) for name, relative in members}
+    local = threading.local()
+
+    def extract(member):
+        name, _ = member
+        target = targets[name]
+        # Resuming an interrupted extraction: keep files that are already complete
+        if target.exists() and target.stat().st_size == infos[name].file_size:
+            return
+        if getattr(local, 'zf', None) is None:
+            local.zf = zipfile.ZipFile(archive)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(target.name + '.tmp')
+        with local.zf.open(name) as src, open(tmp, 'wb') as dst:
+            shutil.copyfileobj(src, dst, 1 << 20)
+        os.replace(tmp, target)
+
+    # zlib releases the GIL, so a thread per core decompresses in parallel
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(extract, members, chunksize=64))
+
+
+def _extract_tar(archive, out_dir):
+    # Streaming mode: one sequential pass, no random access into the (possibly compressed) tarball
+    with tarfile.open(archive, 'r|*') as tf:
+        root = None
+        for info in tf:
+            # Regular files only: symlinks, hardlinks and devices are never recreated
+            if not info.isfile():
+                continue
+            if root is None:
+                # Top-level files (readme, licence) can come before the class folders
+                try:
+                    root = _dataset_root([info.name])
+                except ValueError:
+                    continue
+            if not info.name.startswith(root) or info.name[len(root):].split('/')[0] not in CLASSES:
+                continue
+            target = _safe_target(out_dir, info.name[len(root):])
+            if target.exists() and target.stat().st_size == info.size:
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with tf.extractfile(info) as src, open(target, 'wb') as dst:
+                shutil.copyfileobj(src, dst, 1 << 20)
+    if root is None:
+        raise ValueError("Archive has no Cat/ or Dog/ folder")
+
+
+def _copy_tree(source, out_dir, workers):
+    files = [str(p.relative_to(source)) for cls in CLASSES for p in (source / cls).rglob('*') if p.is_file()]
+
+    def link(relative):
+        target = out_dir / relative
+        if target.exists():
+            return
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(source / relative, target)
+        except OSError:
+            shutil.copy2(source / relative, target)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(link, files, chunksize=256))
+
+
+def extract_dataset(archive, extract_dir, workers=8):
+    """
+    Extract (or hard-link, for a directory source) the Cat/Dog tree of `archive` into `extract_dir`.
+
+    Work goes to `<extract_dir>.partial` and is renamed into place at the end,
+    so an interrupted extraction never looks complete and resumes where it stopped.
+    """
+    archive, extract_dir = Path(archive), Path(extract_dir)
+    partial = extract_dir.with_name(extract_dir.name + '.partial')
+    partial.mkdir(parents=True, exist_ok=True)
+    if archive.is_dir():
+        _copy_tree(archive, partial, workers)
+    elif zipfile.is_zipfile(archive):
+        _extract_zip(archive, partial, workers)
+    elif tarfile.is_tarfile(archive):
+        _extract_tar(archive, partial)
+    else:
+        raise ValueError(f"Unsupported dataset archive: {archive}")
+    if extract_dir.exists():
+        shutil.rmtree(extract_dir)
+    os.replace(partial, extract_dir)
+
+
+def count_images(extract_dir):
+    counts = {}
+    for cls in CLASSES:
+        with os.scandir(Path(extract_dir) / cls) as it:
+            counts[cls] = sum(1 for e in it if e.is_file() and e.name.lower().endswith(IMAGE_SUFFIXES))
+    return counts
+
+
+def write_marker(extract_dir, source, archive_sha256, counts):
+    marker = {
+        'source': source,
+        'archive_sha256': archive_sha256,
+        'counts': counts,
+        'completed_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+    path = Path(extract_dir) / MARKER_FILE
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_text(json.dumps(marker, indent=2))
+    os.replace(tmp, path)
+    return marker
+
+
+def read_marker(extract_dir):
+    try:
+        return json.loads((Path(extract_dir) / MARKER_FILE).read_text())
+    except (OSError, ValueError):
+        return None
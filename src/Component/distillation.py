@@ -0,0 +1,168 @@
+import hashlib
+import json
+import logging
+import os
+import statistics
+import time
+
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras import Input, Model
+from tensorflow.keras.applications import MobileNetV2
+from tensorflow.keras.layers import Activation, Dense, Dropout, GlobalAveragePooling2D, Resizing
+
+from src.Component.evaluation import EvaluationSet
+from src.Component.tf_data_pipeline import model_input_fn
+
+
+def build_student(name='student', alpha=0.35, image_size=96, cut_at=None, weights='imagenet', input_size=150):
+    """
+    Compact MobileNetV2 student with the served model's interface.
+
+    Both returned models take (input_size, input_size, 3) MobileNetV2-scaled
+    images, like models/model.h5; a smaller `image_size` is reached by a
+    Resizing layer inside the model, so /predict keeps decoding at 150x150.
+    `cut_at` names the backbone layer after which the remaining blocks are
+    dropped (a pruned backbone).
+
+    Returns:
+        (logits_model, model): the first outputs logits for the distillation
+        loss; the second shares its layers, ends in a sigmoid and is what gets saved.
+    """
+    inputs = Input(shape=(input_size, input_size, 3))
+    x = Resizing(image_size, image_size)(inputs) if image_size != input_size else inputs
+    backbone = MobileNetV2(alpha=alpha, include_top=False, weights=weights, input_shape=(image_size, image_size, 3))
+    if cut_at:
+        backbone = Model(backbone.input, backbone.get_layer(cut_at).output, name=f'{backbone.name}_to_{cut_at}')
+    x = backbone(x)
+    x = GlobalAveragePooling2D()(x)
+    x = Dropout(0.2)(x)
+    logits = Dense(1, dtype='float32')(x)
+    outputs = Activation('sigmoid', dtype='float32')(logits)
+    return Model(inputs, logits, name=f'{name}_logits'), Model(inputs, outputs, name=name)
+
+
+def _store_fingerprint(store):
+    with open(os.path.join(store.directory, 'index.json'), 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def teacher_soft_labels(teacher, teacher_path, store, batch_size=64):
+    """
+    Teacher probabilities for every image of a packed split, in file order.
+
+    The teacher runs once per image; the result is cached next to the shards
+    until the teacher file or the packed images change, so every student (and
+    every re-run) reuses it.
+    """
+    stat = os.stat(teacher_path)
+    key = {
+        'teacher': os.path.abspath(teacher_path),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'images': _store_fingerprint(store),
+    }
+    labels_path = os.path.join(store.directory, 'soft_labels.npy')
+    key_path = os.path.join(store.directory, 'soft_labels.json')
+    try:
+        with open(key_path) as f:
+            if json.load(f) == key:
+                return np.load(labels_path)
+    except (OSError, ValueError):
+        pass
+
+    started = time.perf_counter()
+    soft = np.concatenate([
+        np.asarray(teacher.predict(images)).reshape(-1)
+        for images, _ in EvaluationSet(store.directory).batches(batch_size)
+    ]).astype(np.float32)
+    np.save(labels_path, soft)
+    with open(key_path, 'w') as f:
+        json.dump(key, f)
+    logging.info(f"Teacher soft labels for {len(soft)} images in {time.perf_counter() - started:.1f}s")
+    return soft
+
+
+def distillation_dataset(store, soft_labels, batch_size, training, augmenter=None, seed=None):
+    """
+    Batches of (images, [true label, teacher probability]) from a packed split.
+
+    Training batches are shuffled, repeat forever and are augmented. The
+    teacher probability belongs to the un-augmented image; the augmentation is
+    mild enough that it stays a good target.
+    """
+    autotune = tf.data.AUTOTUNE
+    targets = np.stack([store.labels, soft_labels], axis=1).astype(np.float32)
+    height, width = store.target_size
+
+    dataset = tf.data.Dataset.from_tensor_slices((np.arange(len(store), dtype=np.int64), targets))
+    if training:
+        dataset = dataset.shuffle(len(store), seed=seed, reshuffle_each_iteration=True).repeat()
+    dataset = dataset.batch(batch_size)
+
+    def gather(indices, batch_targets):
+        images = tf.numpy_function(store.take, [indices], tf.uint8, stateful=False)
+        images.set_shape((None, height, width, 3))
+        return images, batch_targets
+
+    dataset = dataset.map(gather, num_parallel_calls=autotune, deterministic=not training)
+    return dataset.map(model_input_fn(training, augmenter), num_parallel_calls=autotune).prefetch(autotune)
+
+
+def distillation_loss(temperature=2.0, soft_weight=0.7):
+    """
+    Binary knowledge-distillation loss on student logits.
+
+    (1 - soft_weight) * BCE(true label, student) + soft_weight * T^2 *
+    BCE(teacher at temperature T, student at temperature T). The teacher's
+    logit is recovered from its sigmoid probability.
+    """
+    def loss(targets, logits):
+        hard, soft = targets[:, :1], tf.clip_by_value(targets[:, 1:], 1e-6, 1 - 1e-6)
+        teacher_logits = tf.math.log(soft) - tf.math.log1p(-soft)
+        hard_loss = tf.keras.losses.binary_crossentropy(hard, logits, from_logits=True)
+        soft_loss = tf.keras.losses.binary_crossentropy(
+            tf.sigmoid(teacher_logits / temperature), logits / temperature, from_logits=True
+        )
+        return (1 - soft_weight) * hard_loss + soft_weight * temperature ** 2 * soft_loss
+
+    return loss
+
+
+def hard_accuracy(targets, logits):
+    """Accuracy against the true labels (column 0 of the distillation targets)."""
+    return tf.reduce_mean(tf.cast(tf.equal(targets[:, :1], tf.cast(logits > 0, tf.float32)), tf.float32))
+
+
+def measure_latency(engine, batch_size, repeats=30, input_shape=(150, 150, 3)):
+    """Median/p95 wall time of engine.predict on one fixed batch, after a warm-up call."""
+    images = np.random.default_rng(0).uniform(-1, 1, (batch_size, *input_shape)).astype(np.float32)
+    engine.predict(images)
+    times = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        engine.predict(images)
+        times.append(time.perf_counter() - started)
+    times.sort()
+    median = statistics.median(times)
+    return {
+        'p50_ms': round(median * 1000, 3),
+        'p95_ms': round(times[int(0.95 * (len(times) - 1))] * 1000, 3),
+        'images_per_second': round(batch_size / median, 1),
+    }
+
+
+def format_table(rows, batch_sizes):
+    """Accuracy-versus-latency table as aligned plain text."""
+    header = f"{'model':<26}{'params':>10}{'MB':>7}{'accuracy':>10}{'roc_auc':>9}"
+    header += ''.join(f"{f'b{b} p50 ms':>12}{f'b{b} img/s':>11}" for b in batch_sizes)
+    lines = [header]
+    for row in rows:
+        line = f"{row['name']:<26}{row['params'] or '-':>10}{row['size_mb']:>7.1f}"
+        line += f"{row['accuracy']:>10.4f}" if row['accuracy'] is not None else f"{'-':>10}"
+        line += f"{row['roc_auc']:>9.4f}" if row['roc_auc'] is not None else f"{'-':>9}"
+        for b in batch_sizes:
+            latency = row['latency'][str(b)]
+            line += f"{latency['p50_ms']:>12.2f}{latency['images_per_second']:>11.1f}"
+        lines.append(line)
+    return '\n'.join(lines)
@@ -0,0 +1,191 @@
+import json
+import logging
+import os
+import socket
+import subprocess
+import time
+
+import tensorflow as tf
+
+from src.Component.cpu_affinity import available_cpus, configure_worker_threads, cpu_slices
+from src.Component.training_checkpoint import resumable_batches
+
+WORKER_CPUS_ENV = 'WORKER_CPUS'
+
+
+def read_hosts_file(path):
+    """Worker addresses, one 'host:port' per line (blank lines and # comments are ignored)."""
+    with open(path) as f:
+        workers = [line.split('#')[0].strip() for line in f]
+    workers = [w for w in workers if w]
+    if not workers:
+        raise ValueError(f"No workers listed in {path}")
+    return workers
+
+
+def local_cluster(num_workers):
+    """'localhost:<port>' addresses on free ports for `num_workers` workers on this machine."""
+    sockets = []
+    try:
+        for _ in range(num_workers):
+            s = socket.socket()
+            s.bind(('localhost', 0))
+            sockets.append(s)
+        return [f'localhost:{s.getsockname()[1]}' for s in sockets]
+    finally:
+        for s in sockets:
+            s.close()
+
+
+def tf_config(workers, index):
+    """TF_CONFIG value that makes this process worker `index` of `workers` (worker 0 is the chief)."""
+    return json.dumps({'cluster': {'worker': list(workers)}, 'task': {'type': 'worker', 'index': index}})
+
+
+def configure_from_env(inter_op_threads=2):
+    """In a local worker: pin to the CPU slice the launcher assigned and size TensorFlow's pools to it."""
+    cpus = os.environ.get(WORKER_CPUS_ENV)
+    if cpus:
+        configure_worker_threads([int(c) for c in cpus.split(',')], inter_op_threads)
+
+
+def launch_local_workers(command, num_workers, env=None, poll_seconds=0.5):
+    """
+    Run `command` once per local worker, each with its TF_CONFIG and its own CPU slice.
+
+    If a worker fails the others are terminated, since they would block forever
+    in the next all-reduce. Returns the exit codes.
+    """
+    workers = local_cluster(num_workers)
+    slices = cpu_slices(available_cpus(), num_workers)
+    processes = []
+    for index in range(num_workers):
+        worker_env = {
+            **os.environ, **(env or {}),
+            'TF_CONFIG': tf_config(workers, index),
+            WORKER_CPUS_ENV: ','.join(map(str, slices[index])),
+        }
+        processes.append(subprocess.Popen(command, env=worker_env))
+    logging.info(f"Launched {num_workers} local workers on {workers}")
+
+    while any(p.poll() is None for p in processes):
+        if any(p.poll() not in (None, 0) for p in processes):
+            logging.error("A worker failed, stopping the others")
+            for p in processes:
+                if p.poll() is None:
+                    p.terminate()
+        time.sleep(poll_seconds)
+    return [p.returncode for p in processes]
+
+
+def shard_input(data, steps_per_epoch, num_shards, shard_index, seed=0):
+    """
+    This worker's share of a DataGenerator training or validation input.
+
+    Keras image iterators are sharded here, at the source: every worker
+    computes the same seeded epoch order and loads only its slice of each
+    global batch. tf.data pipelines (tfdata/shards backends) must already have
+    been built for this shard with DataGenerator(num_shards=..., shard_index=...),
+    which splits the file/index list before shuffling and decoding, so workers
+    read disjoint images and none decodes the full split.
+    """
+    if isinstance(data, tf.data.Dataset):
+        if (getattr(data, 'num_shards', 1), getattr(data, 'shard_index', 0)) != (num_shards, shard_index):
+            raise ValueError(
+                f"tf.data input was built for shard {getattr(data, 'shard_index', 0)} of "
+                f"{getattr(data, 'num_shards', 1)}, not {shard_index} of {num_shards}; "
+                f"pass num_shards/shard_index to DataGenerator"
+            )
+        dataset = data
+    else:
+        dataset = resumable_batches(data, steps_per_epoch, seed=seed, num_shards=num_shards, shard_index=shard_index)
+    # Already sharded; stop tf.distribute from sharding it again
+    options = tf.data.Options()
+    options.experimental_distribute.auto_shard_policy = tf.data.experimental.AutoShardPolicy.OFF
+    return dataset.with_options(options)
+
+
+class MultiWorkerTrainer:
+    """
+    Synchronous data-parallel training loop for MultiWorkerMirroredStrategy.
+
+    Keras 3's fit() fails with more than one worker: it reduces the first
+    (x, y) batch and every scalar metric with Strategy.reduce(..., axis=0),
+    which the collective all-reduce does not support. This is instead the
+    custom loop of the TensorFlow multi-worker guide. Each replica scales its
+    loss by the global batch, the optimizer all-reduces the gradients, and
+    metrics are read after aggregation across workers.
+    """
+
+    def __init__(self, model, strategy):
+        """`model` must have been built and compiled inside `strategy.scope()`."""
+        self.model = model
+        self.strategy = strategy
+        self.loss_fn = tf.keras.losses.BinaryCrossentropy(reduction=None)
+        with strategy.scope():
+            model.optimizer.build(model.trainable_variables)
+            self.metrics = {
+                'loss': tf.keras.metrics.Mean(name='loss'),
+                'accuracy': tf.keras.metrics.BinaryAccuracy(name='accuracy'),
+                'val_loss': tf.keras.metrics.Mean(name='val_loss'),
+                'val_accuracy': tf.keras.metrics.BinaryAccuracy(name='val_accuracy'),
+            }
+        self._train_step = tf.function(lambda iterator: strategy.run(self._train_replica, args=next(iterator)))
+        self._val_step = tf.function(lambda iterator: strategy.run(self._val_replica, args=next(iterator)))
+
+    def _train_replica(self, x, y):
+        y = tf.reshape(y, (-1, 1))
+        with tf.GradientTape() as tape:
+            predictions = self.model(x, training=True)
+            per_example_loss = self.loss_fn(y, predictions)
+            loss = tf.nn.compute_average_loss(per_example_loss)
+        variables = self.model.trainable_variables
+        self.model.optimizer.apply_gradients(zip(tape.gradient(loss, variables), variables))
+        self.metrics['loss'].update_state(per_example_loss)
+        self.metrics['accuracy'].update_state(y, predictions)
+
+    def _val_replica(self, x, y):
+        y = tf.reshape(y, (-1, 1))
+        predictions = self.model(x, training=False)
+        self.metrics['val_loss'].update_state(self.loss_fn(y, predictions))
+        self.metrics['val_accuracy'].update_state(y, predictions)
+
+    def fit(self, train_ds, epochs, steps_per_epoch, global_batch_size, validation_data=None, validation_steps=None,
+            verbose=True):
+        """
+        Train for `epochs` x `steps_per_epoch` global steps.
+
+        Returns (history, throughput). history maps each metric to its
+        per-epoch values, like keras' History.history. throughput has one entry
+        per epoch with the images per second over all workers during the train
+        steps (validation excluded).
+        """
+        history, throughput = {}, []
+        iterator = iter(train_ds)
+        for epoch in range(epochs):
+            for metric in self.metrics.values():
+                metric.reset_state()
+            started = time.perf_counter()
+            for _ in range(steps_per_epoch):
+                self._train_step(iterator)
+            # Results are read across workers, so this also waits for the last step everywhere
+            logs = {'loss': float(self.metrics['loss'].result()), 'accuracy': float(self.metrics['accuracy'].result())}
+            seconds = time.perf_counter() - started
+            if validation_data is not None:
+                val_iterator = iter(validation_data)
+                for _ in range(validation_steps):
+                    self._val_step(val_iterator)
+                logs['val_loss'] = float(self.metrics['val_loss'].result())
+                logs['val_accuracy'] = float(self.metrics['val_accuracy'].result())
+
+            for key, value in logs.items():
+                history.setdefault(key, []).append(value)
+            throughput.append({
+                'epoch': epoch,
+                'train_seconds': round(seconds, 3),
+                'images_per_second': round(steps_per_epoch * global_batch_size / seconds, 2),
+            })
+            if verbose:
+                logging.info(f"Epoch {epoch + 1}/{epochs}: {throughput[-1]['images_per_second']} img/s across "
+                             f"all workers, " + ', '.join(f"{k}={v:.4f}" for k, v in logs.items()))
+        return history, throughput
@@ -0,0 +1,232 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from tensorflow.keras.applications.mobilenet_v2 import preprocess_input
+
+from src.Component.dataset_shards import ShardStore, pack_split
+
+# Score histogram resolution for ROC/PR; AUC and AP are exact up to ties within 1/SCORE_BINS
+SCORE_BINS = 1000
+CALIBRATION_BINS = 10
+
+
+class StreamingBinaryMetrics:
+    """
+    Binary classification metrics accumulated batch by batch in O(bins) memory.
+
+    Scores are counted into a fixed histogram per true class, from which the
+    ROC and precision-recall curves, AUC and average precision are derived;
+    the confusion matrix at `threshold`, calibration bins, log loss and Brier
+    score are kept as running sums. No per-image predictions are stored.
+    """
+
+    def __init__(self, threshold=0.5, score_bins=SCORE_BINS, calibration_bins=CALIBRATION_BINS):
+        self.threshold = threshold
+        self.score_bins = score_bins
+        self.calibration_bins = calibration_bins
+        self.positive_hist = np.zeros(score_bins, dtype=np.int64)
+        self.negative_hist = np.zeros(score_bins, dtype=np.int64)
+        self.confusion = np.zeros((2, 2), dtype=np.int64)
+        self.calibration_count = np.zeros(calibration_bins, dtype=np.int64)
+        self.calibration_score = np.zeros(calibration_bins)
+        self.calibration_positive = np.zeros(calibration_bins)
+        self.log_loss_sum = 0.0
+        self.brier_sum = 0.0
+        self.count = 0
+
+    def update(self, labels, scores):
+        labels = np.asarray(labels).reshape(-1).astype(np.int64)
+        scores = np.clip(np.asarray(scores, dtype=np.float64).reshape(-1), 0.0, 1.0)
+
+        bins = np.minimum((scores * self.score_bins).astype(np.int64), self.score_bins - 1)
+        self.positive_hist += np.bincount(bins[labels == 1], minlength=self.score_bins)
+        self.negative_hist += np.bincount(bins[labels == 0], minlength=self.score_bins)
+        # Same decision rule as before: positive above the threshold
+        np.add.at(self.confusion, (labels, (scores > self.threshold).astype(np.int64)), 1)
+
+        calibration = np.minimum((scores * self.calibration_bins).astype(np.int64), self.calibration_bins - 1)
+        self.calibration_count += np.bincount(calibration, minlength=self.calibration_bins)
+        self.calibration_score += np.bincount(calibration, weights=scores, minlength=self.calibration_bins)
+        self.calibration_positive += np.bincount(calibration, weights=labels, minlength=self.calibration_bins)
+
+        clipped = np.clip(scores, 1e-7, 1 - 1e-7)
+        self.log_loss_sum += float(-np.sum(labels * np.log(clipped) + (1 - labels) * np.log(1 - clipped)))
+        self.brier_sum += float(np.sum((scores - labels) ** 2))
+        self.count += len(labels)
+
+    def _curves(self):
+        # Lower the threshold one score bin at a time, from above the top bin down to 0
+        tp = np.concatenate([[0], np.cumsum(self.positive_hist[::-1])])
+        fp = np.concatenate([[0], np.cumsum(self.negative_hist[::-1])])
+        thresholds = np.arange(self.score_bins, -1, -1) / self.score_bins
+        # Empty bins repeat the previous operating point
+        keep = np.concatenate([[True], (np.diff(tp) > 0) | (np.diff(fp) > 0)])
+        return thresholds[keep], tp[keep], fp[keep]
+
+    def _class_report(self, class_names):
+        report = {}
+        for c, name in enumerate(class_names):
+            true_positive = self.confusion[c, c]
+            predicted, support = self.confusion[:, c].sum(), self.confusion[c, :].sum()
+            precision = true_positive / predicted if predicted else 0.0
+            recall = true_positive / support if support else 0.0
+            f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+            report[name] = {'precision': float(precision), 'recall': float(recall), 'f1': float(f1),
+                            'support': int(support)}
+        return report
+
+    def result(self, class_names=('0', '1')):
+        """All metrics as a JSON-serialisable dict."""
+        thresholds, tp, fp = self._curves()
+        positives, negatives = int(tp[-1]), int(fp[-1])
+        metrics = {
+            'images': self.count,
+            'threshold': self.threshold,
+            'accuracy': float(np.trace(self.confusion) / self.count) if self.count else None,
+            'confusion_matrix': self.confusion.tolist(),
+            'classes': self._class_report(class_names),
+            'log_loss': self.log_loss_sum / self.count if self.count else None,
+            'brier_score': self.brier_sum / self.count if self.count else None,
+            'roc_auc': None,
+            'average_precision': None,
+        }
+        if positives and negatives:
+            tpr, fpr = tp / positives, fp / negatives
+            precision = np.where(tp + fp > 0, tp / np.maximum(tp + fp, 1), 1.0)
+            metrics['roc_auc'] = float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2))
+            metrics['average_precision'] = float(np.sum(np.diff(tpr) * precision[1:]))
+            metrics['roc_curve'] = {'threshold': thresholds.tolist(), 'fpr': fpr.tolist(), 'tpr': tpr.tolist()}
+            metrics['pr_curve'] = {'threshold': thresholds.tolist(), 'precision': precision.tolist(),
+                                   'recall': tpr.tolist()}
+
+        filled = np.flatnonzero(self.calibration_count)
+        counts = self.calibration_count[filled]
+        mean_score = self.calibration_score[filled] / counts
+        positive_rate = self.calibration_positive[filled] / counts
+        metrics['calibration'] = {
+            'bins': [
+                {'range': [b / self.calibration_bins, (b + 1) / self.calibration_bins], 'count': int(n),
+                 'mean_score': float(s), 'positive_rate': float(r)}
+                for b, n, s, r in zip(filled, counts, mean_score, positive_rate)
+            ],
+            'expected_calibration_error':
+                float(np.sum(counts * np.abs(mean_score - positive_rate)) / self.count) if self.count else None,
+        }
+        return metrics
+
+
+def format_report(metrics):
+    """Plain-text per-class report in the layout of sklearn's classification_report."""
+    lines = [f"{'':>12}{'precision':>10}{'recall':>10}{'f1-score':>10}{'support':>10}"]
+    for name, row in metrics['classes'].items():
+        lines.append(f"{name:>12}{row['precision']:>10.2f}{row['recall']:>10.2f}{row['f1']:>10.2f}{row['support']:>10}")
+    lines.append(f"\n{'accuracy':>12}{'':>20}{metrics['accuracy']:>10.2f}{metrics['images']:>10}")
+    if metrics['roc_auc'] is not None:
+        lines.append(f"{'roc_auc':>12}{'':>20}{metrics['roc_auc']:>10.4f}")
+    return '\n'.join(lines)
+
+
+class EvaluationSet:
+    """
+    The test split decoded once into uint8 shards (see dataset_shards.pack_split) and streamed in file order.
+
+    Repacking is incremental, so re-evaluating on an unchanged split reads the
+    cache without decoding a single JPEG.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = str(cache_dir)
+        self._store = None
+
+    def refresh(self, split_dir, files=None, target_size=(150, 150)):
+        pack_split(split_dir, self.cache_dir, target_size, files=files)
+        self._store = None
+
+    @property
+    def store(self):
+        if self._store is None:
+            self._store = ShardStore(self.cache_dir)
+        return self._store
+
+    @property
+    def class_names(self):
+        return list(self.store.class_indices)
+
+    def __len__(self):
+        return len(self.store)
+
+    def batches(self, batch_size, prefetch=2):
+        """Yield (images scaled for MobileNetV2, labels), gathering the next batches on a background thread."""
+        store = self.store
+        buffer = queue.Queue(maxsize=prefetch)
+        done = object()
+
+        def produce():
+            try:
+                for start in range(0, len(store), batch_size):
+                    indices = np.arange(start, min(start + batch_size, len(store)))
+                    images = preprocess_input(store.take(indices).astype(np.float32))
+                    buffer.put((images, store.labels[indices]))
+            except Exception as e:
+                buffer.put(e)
+            buffer.put(done)
+
+        threading.Thread(target=produce, daemon=True).start()
+        while (item := buffer.get()) is not done:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+
+def evaluate_models(engines, evaluation_set, batch_size=64, threshold=0.5):
+    """
+    Score several models in one pass over `evaluation_set`.
+
+    `engines` maps a name (e.g. the model path) to anything with a
+    `predict(batch)` method (InferenceEngine, TFLiteEngine). Each batch is read
+    once and the models predict on it concurrently.
+
+    Returns {name: metrics dict}, each with its total predict time.
+    """
+    metrics = {name: StreamingBinaryMetrics(threshold) for name in engines}
+    predict_seconds = dict.fromkeys(engines, 0.0)
+
+    def predict(name, images):
+        started = time.perf_counter()
+        scores = engines[name].predict(images)
+        return name, scores, time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(engines)) as pool:
+        for images, labels in evaluation_set.batches(batch_size):
+            for name, scores, seconds in pool.map(lambda name: predict(name, images), engines):
+                metrics[name].update(labels, scores)
+                predict_seconds[name] += seconds
+    seconds = time.perf_counter() - started
+    logging.info(f"Evaluated {len(engines)} model(s) on {len(evaluation_set)} images in {seconds:.2f}s")
+
+    class_names = evaluation_set.class_names
+    return {
+        name: {**metrics[name].result(class_names), 'predict_seconds': round(predict_seconds[name], 3)}
+        for name in engines
+    }
+
+
+def plot_confusion_matrix(metrics, class_names, path, title='Confusion Matrix'):
+    """Render one model's confusion matrix. matplotlib and seaborn are only imported here."""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    plt.figure(figsize=(10, 8))
+    sns.heatmap(np.asarray(metrics['confusion_matrix']), annot=True, fmt='d', cmap='Blues',
+                xticklabels=class_names, yticklabels=class_names)
+    plt.title(title)
+    plt.ylabel('True Label')
+    plt.xlabel('Predicted Label')
+    plt.tight_layout()
+    plt.savefig(str(path))
+    plt.close()
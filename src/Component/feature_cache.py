@@ -0,0 +1,211 @@
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import tensorflow as tf
+
+from src.Component.dataset_shards import load_resized
+from src.Component.stage_runner import fingerprint
+from src.Component.tf_data_pipeline import build_augmenter, mobilenet_scale
+
+
+def _inputs_of(layer):
+    tensors = layer.input
+    return list(tensors) if isinstance(tensors, (list, tuple)) else [tensors]
+
+
+def find_frozen_boundary(base_model, fine_tune_at):
+    """
+    Index of the last layer before `fine_tune_at` whose output is the only tensor
+    the later layers read from the frozen part of `base_model`.
+
+    MobileNetV2 has residual connections, so the cut has to fall between blocks:
+    everything up to the boundary is frozen and can be run once, everything
+    after it is replayed from the cached boundary activations.
+    """
+    layers = base_model.layers
+    position = {id(layer): i for i, layer in enumerate(layers)}
+    for boundary in range(min(fine_tune_at, len(layers)) - 1, 0, -1):
+        crossing = set()
+        for layer in layers[boundary + 1:]:
+            for tensor in _inputs_of(layer):
+                source = position[id(tensor._keras_history.operation)]
+                if source <= boundary:
+                    crossing.add(source)
+        if crossing == {boundary}:
+            return boundary
+    raise ValueError("No single-tensor boundary found in the frozen part of the backbone")
+
+
+def split_at_boundary(model, base_model, boundary):
+    """
+    Split a MobileNetV2Model into (prefix, suffix) Keras models at `boundary`.
+
+    The prefix maps images to the boundary activations. The suffix maps those
+    activations to the prediction by replaying the remaining backbone layers
+    and the head of `model`. Both reuse the original layer objects, so weights
+    trained through the suffix are the weights of `model`.
+    """
+    layers = base_model.layers
+    boundary_output = layers[boundary].output
+    prefix = tf.keras.Model(base_model.input, boundary_output, name='frozen_prefix')
+
+    features = tf.keras.Input(shape=boundary_output.shape[1:], name='cached_features')
+    tensors = {id(boundary_output): features}
+    for layer in layers[boundary + 1:]:
+        inputs = [tensors[id(t)] for t in _inputs_of(layer)]
+        tensors[id(layer.output)] = layer(inputs if len(inputs) > 1 else inputs[0])
+    x = tensors[id(base_model.output)]
+
+    # Replay the head that follows the backbone inside `model`
+    head = model.layers[model.layers.index(base_model) + 1:]
+    for layer in head:
+        x = layer(x)
+    suffix = tf.keras.Model(features, x, name='trainable_suffix')
+    return prefix, suffix
+
+
+class FeatureCache:
+    """
+    On-disk, memory-mapped float16 cache of frozen-prefix activations.
+
+    Layout under `cache_dir`:
+        train.npy            (variants, n, h, w, c) float16; variant 0 is un-augmented
+        validation.npy       (n, h, w, c) float16, un-augmented
+        test.npy             (n, h, w, c) float16, un-augmented
+        <split>_labels.npy   float32 labels
+        meta.json            fingerprint of the files, boundary and settings that produced it
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = str(cache_dir)
+
+    def _path(self, name):
+        return os.path.join(self.cache_dir, name)
+
+    def is_current(self, key):
+        try:
+            with open(self._path('meta.json')) as f:
+                return json.load(f).get('key') == key
+        except (OSError, ValueError):
+            return False
+
+    def load(self, split):
+        """(features memmap, labels) of a cached split."""
+        return np.load(self._path(f'{split}.npy'), mmap_mode='r'), np.load(self._path(f'{split}_labels.npy'))
+
+    def build(self, prefix, splits, target_size, variants=4, batch_size=64, seed=0, decode_workers=8, key=None):
+        """
+        Run the frozen prefix once over every split and store the activations.
+
+        Args:
+            prefix: Model mapping MobileNetV2-scaled images to boundary activations.
+            splits: {name: (filepaths, labels)} for 'train', 'validation' and 'test'.
+            target_size: (H, W) images are resized to, as in DataGenerator.
+            variants: Augmented copies per training image (the first is un-augmented).
+            key: Fingerprint stored in meta.json for is_current().
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Invalidate first: an interrupted rebuild must never look current
+        try:
+            os.remove(self._path('meta.json'))
+        except FileNotFoundError:
+            pass
+        augmenter = build_augmenter(seed=seed)
+        feature_shape = tuple(prefix.output.shape[1:])
+        run_prefix = tf.function(lambda images: prefix(images, training=False))
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=decode_workers) as pool:
+            for split, (filepaths, labels) in splits.items():
+                copies = variants if split == 'train' else 1
+                shape = (copies, len(filepaths), *feature_shape) if split == 'train' else (len(filepaths), *feature_shape)
+                tmp = self._path(f'{split}.npy.tmp')
+                out = np.lib.format.open_memmap(tmp, mode='w+', dtype=np.float16, shape=shape)
+                for start in range(0, len(filepaths), batch_size):
+                    paths = filepaths[start:start + batch_size]
+                    images = tf.constant(np.stack(list(pool.map(load_resized, paths, [target_size] * len(paths)))))
+                    images = tf.cast(images, tf.float32)
+                    for variant in range(copies):
+                        batch = augmenter(images, training=True) if variant else images
+                        activations = run_prefix(mobilenet_scale(batch)).numpy().astype(np.float16)
+                        if split == 'train':
+                            out[variant, start:start + len(paths)] = activations
+                        else:
+                            out[start:start + len(paths)] = activations
+                out.flush()
+                del out
+                os.replace(tmp, self._path(f'{split}.npy'))
+                with open(self._path(f'{split}_labels.npy.tmp'), 'wb') as f:
+                    np.save(f, np.asarray(labels, dtype=np.float32))
+                os.replace(self._path(f'{split}_labels.npy.tmp'), self._path(f'{split}_labels.npy'))
+                logging.info(f"Cached {split} features: {shape} float16")
+
+        # meta.json goes last, atomically, once every split is in place
+        with open(self._path('meta.json.tmp'), 'w') as f:
+            json.dump({
+                'key': key, 'variants': variants, 'feature_shape': list(feature_shape),
+                'seconds': round(time.perf_counter() - started, 3),
+            }, f, indent=2)
+        os.replace(self._path('meta.json.tmp'), self._path('meta.json'))
+        return time.perf_counter() - started
+
+    def dataset(self, split, batch_size, training, seed=None):
+        """
+        Batched tf.data pipeline over a cached split.
+
+        Training draws each sample from a random augmented variant, shuffles and
+        repeats; evaluation keeps file order and ends after one pass.
+        """
+        features, labels = self.load(split)
+        variants = features.shape[0] if split == 'train' else 1
+        n = len(labels)
+        feature_shape = features.shape[-3:]
+
+        def gather(indices):
+            indices = np.sort(indices)
+            if split == 'train':
+                variant = indices // n
+                rows = indices % n
+                batch = np.empty((len(indices), *feature_shape), dtype=np.float16)
+                for v in np.unique(variant):
+                    mask = variant == v
+                    batch[mask] = features[v, rows[mask]]
+            else:
+                rows = indices
+                batch = features[rows]
+            return batch.astype(np.float32), labels[rows]
+
+        def load(indices):
+            batch, batch_labels = tf.numpy_function(gather, [indices], (tf.float32, tf.float32), stateful=False)
+            batch.set_shape((None, *feature_shape))
+            batch_labels.set_shape((None,))
+            return batch, batch_labels
+
+        dataset = tf.data.Dataset.range(n * variants)
+        if training:
+            dataset = dataset.shuffle(n * variants, seed=seed, reshuffle_each_iteration=True).repeat()
+        dataset = dataset.batch(batch_size).map(load, num_parallel_calls=tf.data.AUTOTUNE)
+        dataset = dataset.prefetch(tf.data.AUTOTUNE)
+        dataset.samples = n
+        dataset.batch_size = batch_size
+        return dataset
+
+
+def _file_entry(path):
+    stat = os.stat(path)
+    return [str(path), stat.st_size, stat.st_mtime_ns]
+
+
+def feature_cache_key(splits, boundary_name, target_size, variants, weights):
+    """Fingerprint of everything that determines the cached activations, including each image's size and mtime."""
+    return fingerprint({
+        'files': {split: [_file_entry(p) for p in filepaths] for split, (filepaths, _) in splits.items()},
+        'boundary': boundary_name,
+        'target_size': list(target_size),
+        'variants': variants,
+        'weights': weights,
+    })
@@ -0,0 +1,129 @@
+import json
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+import tensorflow as tf
+from tensorflow.python.framework.convert_to_constants import convert_variables_to_constants_v2
+
+
+def freeze_concrete_function(concrete_fn):
+    """
+    Serialize a traced forward pass as a GraphDef with its weights folded in as constants.
+
+    `concrete_fn` takes a single float32 image batch (e.g. InferenceEngine's
+    traced function). Returns (graph bytes, input tensor name, output tensor name).
+    """
+    frozen = convert_variables_to_constants_v2(concrete_fn)
+    return frozen.graph.as_graph_def().SerializeToString(), frozen.inputs[0].name, frozen.outputs[0].name
+
+
+class FrozenGraphEngine:
+    """
+    CPU inference from a frozen GraphDef with the InferenceEngine interface.
+
+    Loading parses one protobuf and imports it, instead of rebuilding every
+    Keras layer from config and restoring its weights, which is what makes it
+    the fast way to bring a serving process up. The graph accepts any batch
+    size, so no padding is needed.
+    """
+
+    def __init__(self, graph_path, input_name, output_name, batch_sizes=(1, 8, 32), warmup=True, model_path=None):
+        """
+        Args:
+            graph_path: Serialized GraphDef written by `freeze_concrete_function`.
+            input_name: Name of the image batch placeholder in the graph, e.g. "images:0".
+            output_name: Name of the score tensor in the graph, e.g. "Identity:0".
+            batch_sizes: Batch sizes to warm up; the largest is also the chunk size.
+            warmup: Run dummy batches of every size in `batch_sizes` immediately.
+            model_path: The model file the graph was frozen from, used to version cached results.
+        """
+        self.graph_path = str(graph_path)
+        self.model_path = str(model_path if model_path is not None else graph_path)
+        graph_def = tf.compat.v1.GraphDef()
+        with open(self.graph_path, 'rb') as f:
+            graph_def.ParseFromString(f.read())
+
+        wrapped = tf.compat.v1.wrap_function(lambda: tf.compat.v1.import_graph_def(graph_def, name=''), [])
+        images = wrapped.graph.get_tensor_by_name(input_name)
+        self._fn = wrapped.prune(images, wrapped.graph.get_tensor_by_name(output_name))
+        self.input_shape = tuple(int(d) for d in images.shape[1:])
+        self.batch_sizes = tuple(sorted(set(int(b) for b in batch_sizes)))
+        self.max_batch_size = self.batch_sizes[-1]
+
+        if warmup:
+            self.warmup()
+
+    def warmup(self):
+        started = time.perf_counter()
+        for size in self.batch_sizes:
+            self._fn(tf.zeros((size, *self.input_shape), dtype=tf.float32))
+        logging.info(f"FrozenGraphEngine {self.graph_path} warmed up in {time.perf_counter() - started:.2f}s")
+
+    def predict(self, images):
+        """Predict on an (N, H, W, C) array of preprocessed images, chunked to the largest batch size."""
+        images = np.asarray(images, dtype=np.float32)
+        if len(images) <= self.max_batch_size:
+            return self._fn(tf.convert_to_tensor(images)).numpy()
+        return np.concatenate([
+            self._fn(tf.convert_to_tensor(images[start:start + self.max_batch_size])).numpy()
+            for start in range(0, len(images), self.max_batch_size)
+        ])
+
+    __call__ = predict
+
+
+class GraphCache:
+    """
+    A frozen graph of a Keras model file, kept next to it and reused while the model file is unchanged.
+
+    `<model>.graph.pb` holds the graph; `<model>.graph.json` records the model
+    file's size and mtime, the TensorFlow version and the tensor names.
+    A changed model file or TensorFlow upgrade makes the cache stale.
+    """
+
+    def __init__(self, model_path):
+        self.model_path = str(model_path)
+        self.graph_path = f'{self.model_path}.graph.pb'
+        self.info_path = f'{self.model_path}.graph.json'
+
+    def _key(self):
+        stat = os.stat(self.model_path)
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'tensorflow': tf.__version__}
+
+    def load(self, batch_sizes=(1, 8, 32)):
+        """A FrozenGraphEngine if the cached graph matches the model file, else None."""
+        try:
+            with open(self.info_path) as f:
+                info = json.load(f)
+            if info['key'] != self._key():
+                logging.info(f"Frozen graph {self.graph_path} is stale; rebuilding from {self.model_path}")
+                return None
+            started = time.perf_counter()
+            engine = FrozenGraphEngine(
+                self.graph_path, info['input'], info['output'], batch_sizes, model_path=self.model_path)
+        except (OSError, ValueError, KeyError):
+            return None
+        logging.info(f"Model loaded from frozen graph {self.graph_path} in {time.perf_counter() - started:.2f}s")
+        return engine
+
+    def save(self, concrete_fn):
+        """Freeze `concrete_fn` for the next start; a read-only model directory only costs a warning."""
+        started = time.perf_counter()
+        try:
+            key = self._key()
+            graph, input_name, output_name = freeze_concrete_function(concrete_fn)
+            # Write-then-rename, so workers starting together never read a partial graph
+            suffix = f'.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(self.graph_path + suffix, 'wb') as f:
+                f.write(graph)
+            with open(self.info_path + suffix, 'w') as f:
+                json.dump({'key': key, 'input': input_name, 'output': output_name}, f)
+            os.replace(self.graph_path + suffix, self.graph_path)
+            os.replace(self.info_path + suffix, self.info_path)
+        except OSError as e:
+            logging.warning(f"Could not write frozen graph {self.graph_path}: {e}")
+            return
+        logging.info(f"Frozen graph written to {self.graph_path} in {time.perf_counter() - started:.2f}s")
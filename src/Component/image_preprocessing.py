@@ -0,0 +1,104 @@
+import io
+import threading
+from contextlib import nullcontext
+
+import numpy as np
+from PIL import Image
+
+IMAGE_SIZE = (150, 150)
+
+# PIL's default resize filter, kept explicit so every path resizes identically
+RESAMPLE = Image.BICUBIC
+
+_local = threading.local()
+
+
+def open_image(source):
+    """Open raw bytes, a file-like object, a path or an existing PIL image without decoding it."""
+    if isinstance(source, Image.Image):
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    return Image.open(source)
+
+
+def _no_timer(stage):
+    return nullcontext()
+
+
+def decode_image(source, image_size=IMAGE_SIZE, out=None, use_draft=True, stage_timer=_no_timer):
+    """
+    Decode an image straight into a (H, W, 3) uint8 array of `image_size`.
+
+    For JPEGs, `Image.draft` asks libjpeg to decode at a reduced DCT scale
+    (1/2, 1/4 or 1/8) that is still at least `image_size`, so a 12 MP phone
+    photo is never fully materialised just to be shrunk to 150x150.
+
+    Args:
+        source: Anything `open_image` accepts. Draft mode only applies if the
+            image has not been loaded yet.
+        image_size: Target (width, height).
+        out: Optional preallocated (H, W, 3) uint8 array to write into.
+        use_draft: Disable to decode at full resolution (matches the legacy path exactly).
+        stage_timer: Callable returning a context manager per stage name
+            ("decode", "resize"), used for latency instrumentation.
+    """
+    with stage_timer('decode'):
+        image = open_image(source)
+        if use_draft and image.format == 'JPEG':
+            image.draft('RGB', image_size)
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        image.load()
+
+    with stage_timer('resize'):
+        if image.size != tuple(image_size):
+            image = image.resize(image_size, RESAMPLE)
+
+        width, height = image_size
+        if out is None:
+            out = np.empty((height, width, 3), dtype=np.uint8)
+        out[...] = np.asarray(image)
+    return out
+
+
+def scale_for_mobilenet(images, out=None):
+    """
+    Apply MobileNetV2's `preprocess_input` scaling (x / 127.5 - 1) without temporaries.
+
+    A float32 input is scaled in place; a uint8 input is written into `out`
+    (allocated if not given) in a single pass, then offset in place.
+    """
+    if images.dtype == np.float32 and out is None:
+        out = images
+    elif out is None:
+        out = np.empty(images.shape, dtype=np.float32)
+    np.divide(images, np.float32(127.5), out=out, dtype=np.float32)
+    np.subtract(out, np.float32(1.0), out=out)
+    return out
+
+
+def _thread_buffer(image_size):
+    """Per-thread reusable uint8 decode buffer for the single-image path."""
+    width, height = image_size
+    buffer = getattr(_local, 'buffer', None)
+    if buffer is None or buffer.shape != (height, width, 3):
+        buffer = _local.buffer = np.empty((height, width, 3), dtype=np.uint8)
+    return buffer
+
+
+def preprocess_image(source, image_size=IMAGE_SIZE, use_draft=True, stage_timer=_no_timer):
+    """
+    Preprocess one image to match model requirements.
+
+    Returns a fresh (1, H, W, 3) float32 array in MobileNetV2's [-1, 1] range;
+    the uint8 decode buffer is reused across calls on the same thread.
+    """
+    width, height = image_size
+    pixels = decode_image(
+        source, image_size, out=_thread_buffer(image_size), use_draft=use_draft, stage_timer=stage_timer
+    )
+    with stage_timer('preprocess'):
+        batch = np.empty((1, height, width, 3), dtype=np.float32)
+        scale_for_mobilenet(pixels, out=batch[0])
+    return batch
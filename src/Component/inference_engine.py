@@ -0,0 +1,169 @@
+import logging
+import os
+import time
+
+import numpy as np
+import tensorflow as tf
+
+
+class InferenceEngine:
+    """
+    Compiled, warmed-up forward pass around a loaded Keras model.
+
+    `model.predict` builds a data adapter and a fresh execution loop on every
+    call. This wrapper traces the model once into a concrete function with a
+    fixed (None, H, W, 3) float32 signature and runs it directly. When XLA is
+    enabled every call is padded up to one of `batch_sizes`, so the compiled
+    kernels for those shapes are built during warm-up rather than on the first
+    real request.
+    """
+
+    def __init__(self, model, input_shape=(150, 150, 3), batch_sizes=(1, 8, 32), jit_compile=False, warmup=True,
+                 model_path=None):
+        """
+        Args:
+            model: A built Keras model.
+            input_shape: Per-image input shape (H, W, C).
+            batch_sizes: Common batch sizes to warm up; the largest is also the chunk size.
+            jit_compile: Compile the forward pass with XLA.
+            warmup: Run dummy batches of every size in `batch_sizes` immediately.
+            model_path: File the model was loaded from, used to version cached results.
+        """
+        self.model = model
+        self.model_path = str(model_path) if model_path is not None else None
+        self.input_shape = tuple(input_shape)
+        self.batch_sizes = tuple(sorted(set(int(b) for b in batch_sizes)))
+        self.max_batch_size = self.batch_sizes[-1]
+        self.jit_compile = jit_compile
+
+        forward = tf.function(
+            self._forward,
+            input_signature=[tf.TensorSpec(shape=(None, *self.input_shape), dtype=tf.float32)],
+            jit_compile=jit_compile,
+        )
+        self._concrete_fn = forward.get_concrete_function()
+
+        if warmup:
+            self.warmup()
+
+    def _forward(self, images):
+        return self.model(images, training=False)
+
+    def _bucket(self, n):
+        for size in self.batch_sizes:
+            if size >= n:
+                return size
+        return self.max_batch_size
+
+    def warmup(self):
+        """Run a dummy batch of every configured size through the traced function."""
+        started = time.perf_counter()
+        for size in self.batch_sizes:
+            self._concrete_fn(tf.zeros((size, *self.input_shape), dtype=tf.float32))
+        logging.info(
+            f"InferenceEngine warmed up for batch sizes {self.batch_sizes} "
+            f"(jit_compile={self.jit_compile}) in {time.perf_counter() - started:.2f}s"
+        )
+
+    def _run_chunk(self, chunk):
+        n = len(chunk)
+        if self.jit_compile and n != self._bucket(n):
+            # Pad so XLA reuses a kernel compiled during warm-up
+            padded = np.zeros((self._bucket(n), *self.input_shape), dtype=np.float32)
+            padded[:n] = chunk
+            chunk = padded
+        return self._concrete_fn(tf.convert_to_tensor(chunk, dtype=tf.float32)).numpy()[:n]
+
+    def predict(self, images):
+        """Predict on an (N, H, W, C) array of preprocessed images, chunked to the largest batch size."""
+        images = np.asarray(images, dtype=np.float32)
+        if len(images) <= self.max_batch_size:
+            return self._run_chunk(images)
+        return np.concatenate([
+            self._run_chunk(images[start:start + self.max_batch_size])
+            for start in range(0, len(images), self.max_batch_size)
+        ])
+
+    __call__ = predict
+
+
+def _file_stat(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def load_inference_engine(model_path, inference_config=None):
+    """
+    Load a model and wrap it in a warmed-up engine for the configured backend.
+
+    The backend comes from the INFERENCE_BACKEND environment variable, falling
+    back to `inference.backend`: "keras" serves `model_path` through
+    InferenceEngine, "tflite" serves `inference.tflite_model_path` through
+    TFLiteEngine. A `model_path` ending in .tflite always uses TFLiteEngine.
+
+    With `inference.graph_cache`, the keras backend freezes the traced forward
+    pass next to `model_path` on first load (see graph_backend.GraphCache) and
+    later loads serve that frozen graph, skipping the Keras model rebuild.
+
+    The returned engine's `model_stat` is the (size, mtime_ns) of the served
+    file, taken before it was read, so results can be versioned by the model
+    actually loaded even if the file is replaced later.
+
+    Args:
+        model_path: Path to the saved Keras (or .tflite) model.
+        inference_config: The `inference` section of the project Config.
+    """
+    inference_config = inference_config or {}
+    backend = os.environ.get('INFERENCE_BACKEND', inference_config.get('backend', 'keras'))
+    batch_sizes = inference_config.get('warmup_batch_sizes', (1, 8, 32))
+    explicit_tflite = str(model_path).endswith('.tflite')
+
+    if backend == 'tflite' or explicit_tflite:
+        from src.Component.tflite_backend import TFLiteEngine
+
+        tflite_path = model_path if explicit_tflite else os.environ.get(
+            'TFLITE_MODEL_PATH', inference_config.get('tflite_model_path'))
+        logging.info(f"Serving TFLite model {tflite_path}")
+        model_stat = _file_stat(tflite_path)
+        engine = TFLiteEngine(
+            tflite_path,
+            num_threads=inference_config.get('tflite_num_threads'),
+            batch_sizes=batch_sizes,
+        )
+        engine.model_stat = model_stat
+        return engine
+    if backend != 'keras':
+        raise ValueError(f"Unknown inference backend: {backend!r} (expected 'keras' or 'tflite')")
+
+    model_stat = _file_stat(model_path)
+    jit_compile = inference_config.get('jit_compile', False)
+    # A frozen graph has no XLA variant, so jit_compile keeps the Keras path
+    graph_cache = None
+    if inference_config.get('graph_cache', False) and not jit_compile:
+        from src.Component.graph_backend import GraphCache
+
+        graph_cache = GraphCache(model_path)
+        engine = graph_cache.load(batch_sizes)
+        if engine is not None:
+            engine.model_stat = model_stat
+            return engine
+
+    from tensorflow.keras.models import load_model
+
+    started = time.perf_counter()
+    model = load_model(str(model_path), compile=False)
+    logging.info(f"Model loaded from {model_path} in {time.perf_counter() - started:.2f}s")
+    engine = InferenceEngine(
+        model,
+        input_shape=tuple(model.input_shape[1:]),
+        batch_sizes=batch_sizes,
+        jit_compile=jit_compile,
+        model_path=model_path,
+    )
+    engine.model_stat = model_stat
+    if graph_cache is not None:
+        graph_cache.save(engine._concrete_fn)
+    return engine
@@ -0,0 +1,220 @@
+import logging
+import queue
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, InvalidStateError
+
+import numpy as np
+
+
+class _PendingRequest:
+    """A single preprocessed image waiting for its slot in a batch."""
+
+    __slots__ = ("image", "future", "enqueued_at")
+
+    def __init__(self, image):
+        self.image = image
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+def _fail(pending, error):
+    """Fail a request's future unless it already finished or was cancelled."""
+    try:
+        pending.future.set_exception(error)
+    except InvalidStateError:
+        pass
+
+
+class MicroBatcher:
+    """
+    Dynamic micro-batching engine in front of a model.
+
+    Callers submit one preprocessed image at a time. A single worker thread
+    collects requests until either `max_batch_size` images are waiting or
+    `max_wait_ms` has passed since the first one arrived, runs one forward
+    pass over the stacked batch and hands each row back to its caller.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=32, max_wait_ms=5.0, max_queue_size=1024, history_size=1000,
+                 on_batch=None):
+        """
+        Args:
+            predict_fn: Callable mapping a (N, H, W, C) array to (N, ...) predictions.
+            max_batch_size: Upper bound on images per forward pass.
+            max_wait_ms: Longest time the first request of a batch waits for company.
+            max_queue_size: Requests beyond this are rejected with queue.Full.
+            history_size: Number of recent batches kept for the stats percentiles.
+            on_batch: Optional callback receiving the size of every completed batch.
+        """
+        self.predict_fn = predict_fn
+        self.on_batch = on_batch
+        self.max_batch_size = int(max_batch_size)
+        self.max_wait = float(max_wait_ms) / 1000.0
+
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        self._lock = threading.Lock()
+        self._batch_size_counts = Counter()
+        self._recent_batch_sizes = deque(maxlen=history_size)
+        self._recent_queue_waits = deque(maxlen=history_size)
+        self._total_batches = 0
+        self._total_requests = 0
+        self._total_errors = 0
+
+    def start(self):
+        """Start the background worker thread (idempotent)."""
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._worker, name="micro-batcher", daemon=True)
+        self._thread.start()
+        logging.info(
+            f"MicroBatcher started (max_batch_size={self.max_batch_size}, max_wait_ms={self.max_wait * 1000:.1f})"
+        )
+        return self
+
+    def stop(self, timeout=5.0):
+        """Stop the worker after it drains the batch it is currently running."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        # Fail whatever is still queued so no caller blocks forever
+        while True:
+            try:
+                pending = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            _fail(pending, RuntimeError("MicroBatcher stopped"))
+
+    def submit(self, image):
+        """
+        Enqueue one image and return a Future resolving to its prediction row.
+
+        Accepts either a single (H, W, C) image or a batch of one (1, H, W, C).
+        Raises queue.Full when the queue is at capacity.
+        """
+        image = np.asarray(image)
+        if image.ndim == 4:
+            if image.shape[0] != 1:
+                raise ValueError(f"submit() takes one image, got a batch of {image.shape[0]}")
+            image = image[0]
+        pending = _PendingRequest(image)
+        self._queue.put_nowait(pending)
+        return pending.future
+
+    def predict(self, image, timeout=None):
+        """
+        Blocking helper: submit one image and wait for its prediction row.
+
+        Raises TimeoutError after `timeout` seconds; the request is then
+        cancelled, so it is dropped if its batch has not started yet.
+        """
+        future = self.submit(image)
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def stats(self):
+        """Snapshot of queue depth and achieved batch sizes for tuning."""
+        with self._lock:
+            sizes = np.asarray(self._recent_batch_sizes, dtype=np.float64)
+            waits = np.asarray(self._recent_queue_waits, dtype=np.float64) * 1000.0
+            stats = {
+                'queue_depth': self.queue_depth(),
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': self.max_wait * 1000.0,
+                'total_batches': self._total_batches,
+                'total_requests': self._total_requests,
+                'total_errors': self._total_errors,
+                'batch_size_histogram': {str(k): v for k, v in sorted(self._batch_size_counts.items())},
+            }
+        if sizes.size:
+            stats['recent_batch_size'] = {
+                'mean': float(sizes.mean()),
+                'p50': float(np.percentile(sizes, 50)),
+                'p99': float(np.percentile(sizes, 99)),
+            }
+            stats['recent_queue_wait_ms'] = {
+                'mean': float(waits.mean()),
+                'p50': float(np.percentile(waits, 50)),
+                'p99': float(np.percentile(waits, 99)),
+            }
+        return stats
+
+    def _collect_batch(self, first):
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _worker(self):
+        while not self._stop_event.is_set():
+            try:
+                first = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            batch = [first]
+            try:
+                batch = self._collect_batch(first)
+                self._run_batch(batch)
+            except Exception as e:
+                # Keep the worker alive whatever goes wrong; its callers get the error
+                logging.exception(f"MicroBatcher worker error on a batch of {len(batch)}")
+                for p in batch:
+                    _fail(p, e)
+
+    def _run_batch(self, pending):
+        started = time.perf_counter()
+        # Skip requests whose callers timed out and cancelled while queued
+        pending = [p for p in pending if p.future.set_running_or_notify_cancel()]
+        if not pending:
+            return
+        try:
+            inputs = np.stack([p.image for p in pending])
+            outputs = self.predict_fn(inputs)
+        except Exception as e:
+            logging.error(f"MicroBatcher forward pass failed for batch of {len(pending)}: {e}")
+            for p in pending:
+                _fail(p, e)
+            with self._lock:
+                self._total_errors += len(pending)
+            return
+
+        if len(outputs) != len(pending):
+            error = RuntimeError(f"predict_fn returned {len(outputs)} rows for a batch of {len(pending)}")
+            for p in pending:
+                _fail(p, error)
+            with self._lock:
+                self._total_errors += len(pending)
+            return
+        for i, p in enumerate(pending):
+            p.future.set_result(outputs[i])
+
+        with self._lock:
+            self._total_batches += 1
+            self._total_requests += len(pending)
+            self._batch_size_counts[len(pending)] += 1
+            self._recent_batch_sizes.append(len(pending))
+            self._recent_queue_waits.extend(started - p.enqueued_at for p in pending)
+        if self.on_batch is not None:
+            try:
+                self.on_batch(len(pending))
+            except Exception:
+                logging.exception("MicroBatcher on_batch callback failed")
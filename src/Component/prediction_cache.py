@@ -0,0 +1,212 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Rough per-entry bookkeeping cost on top of the serialized value
+_ENTRY_OVERHEAD_BYTES = 200
+
+
+class PredictionCache:
+    """
+    Content-addressed LRU cache of prediction results.
+
+    Entries are keyed by the SHA-256 of the uploaded bytes and tagged with the
+    version of the model that produced them. The version is derived from the
+    model file's path, size and mtime *as they were when the engine loaded it*
+    (`model_stat`), not from the file currently on disk: replacing the file
+    does not change what the loaded engine answers. Call `set_model` when the
+    engine is reloaded; that invalidates every cached result.
+
+    The in-memory tier is bounded by `max_bytes` and `ttl_seconds`. An
+    optional SQLite file acts as a second tier that survives restarts; its
+    writes are batched on a background thread every `flush_seconds`, so no
+    request waits for a commit.
+    """
+
+    def __init__(self, model_path, max_bytes=64 * 2**20, ttl_seconds=3600, disk_path=None, model_stat=None,
+                 flush_seconds=1.0):
+        """
+        Args:
+            model_path: The model file the serving engine was loaded from.
+            model_stat: (size, mtime_ns) of that file captured when the engine loaded it;
+                read from disk now if not given.
+            flush_seconds: Interval of the batched SQLite writes.
+        """
+        self.model_path = str(model_path)
+        self.max_bytes = int(max_bytes)
+        self.ttl_seconds = ttl_seconds
+        self.flush_seconds = flush_seconds
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.model_version = None
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        self._db = None
+        # The SQLite connection is only used under _db_lock, never under _lock
+        self._db_lock = threading.Lock()
+        self._pending = {}
+        self._flush_wanted = threading.Event()
+        self._closed = False
+        if disk_path:
+            os.makedirs(os.path.dirname(os.path.abspath(disk_path)), exist_ok=True)
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS predictions ("
+                "key TEXT PRIMARY KEY, model_version TEXT, value TEXT, created REAL)"
+            )
+            self._db.commit()
+            threading.Thread(target=self._writer, name='prediction-cache-writer', daemon=True).start()
+
+        if model_stat is None:
+            try:
+                st = os.stat(self.model_path)
+                model_stat = (st.st_size, st.st_mtime_ns)
+            except OSError:
+                pass
+        self.set_model(self.model_path, model_stat)
+
+    @staticmethod
+    def content_key(data):
+        return hashlib.sha256(data).hexdigest()
+
+    def set_model(self, model_path, model_stat):
+        """Tag new entries with the version of a (re)loaded model; drop every entry of another version."""
+        version = hashlib.sha256(f"{os.path.abspath(model_path)}:{model_stat}".encode()).hexdigest()[:16]
+        with self._lock:
+            if version == self.model_version:
+                return
+            if self.model_version is not None:
+                logging.info(f"Model {model_path} reloaded; invalidating prediction cache")
+                self.invalidations += 1
+            self._entries.clear()
+            self._bytes = 0
+            self._pending.clear()
+            self.model_path = str(model_path)
+            self.model_version = version
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute("DELETE FROM predictions WHERE model_version != ?", (version,))
+                self._db.commit()
+
+    def _writer(self):
+        while not self._closed:
+            self._flush_wanted.wait(self.flush_seconds)
+            self._flush_wanted.clear()
+            self.flush()
+
+    def flush(self):
+        """Write the pending disk-tier entries in one transaction."""
+        if self._db is None:
+            return
+        with self._lock:
+            rows, self._pending = list(self._pending.values()), {}
+        if not rows:
+            return
+        try:
+            with self._db_lock:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO predictions (key, model_version, value, created) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+                self._db.commit()
+        except sqlite3.Error as e:
+            logging.warning(f"Could not write {len(rows)} prediction cache entries to disk: {e}")
+
+    def _expired(self, created):
+        return self.ttl_seconds is not None and time.time() - created > self.ttl_seconds
+
+    def _store(self, key, value, created):
+        size = len(json.dumps(value)) + len(key) + _ENTRY_OVERHEAD_BYTES
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)[2]
+        self._entries[key] = (value, created, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes and self._entries:
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def get(self, key):
+        """Return the cached result for `key`, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, created, size = entry
+                if not self._expired(created):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self._bytes -= size
+            version = self.model_version
+            if self._db is None:
+                self.misses += 1
+                return None
+
+        # Disk tier: queried without holding the in-memory lock
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT value, created FROM predictions WHERE key = ? AND model_version = ?", (key, version),
+            ).fetchone()
+        with self._lock:
+            if row is not None and not self._expired(row[1]) and version == self.model_version:
+                value = json.loads(row[0])
+                self._store(key, value, row[1])
+                self.hits += 1
+                self.disk_hits += 1
+                return value
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        """Cache a JSON-serializable result for `key` under the current model version."""
+        created = time.time()
+        with self._lock:
+            self._store(key, value, created)
+            if self._db is not None:
+                self._pending[key] = (key, self.model_version, json.dumps(value), created)
+                if len(self._pending) >= 512:
+                    self._flush_wanted.set()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._pending.clear()
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute("DELETE FROM predictions")
+                self._db.commit()
+
+    def close(self):
+        """Flush pending disk writes and stop the writer thread."""
+        self._closed = True
+        self._flush_wanted.set()
+        self.flush()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'model_version': self.model_version,
+            }
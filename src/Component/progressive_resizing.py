@@ -0,0 +1,94 @@
+import logging
+import time
+
+import tensorflow as tf
+
+
+def parse_schedule(stages, final_size=150, default_batch_size=32):
+    """
+    Validate the `progressive.stages` list of configs/default.yaml.
+
+    Each stage is {image_size, epochs, batch_size (optional)}. Sizes must not
+    shrink, and the last stage must train at `final_size`: that is the
+    resolution the saved model is served at.
+    """
+    if not stages:
+        raise ValueError("progressive.stages is empty")
+    schedule = []
+    for stage in stages:
+        schedule.append({
+            'image_size': int(stage['image_size']),
+            'epochs': int(stage['epochs']),
+            'batch_size': int(stage.get('batch_size') or default_batch_size),
+        })
+    sizes = [stage['image_size'] for stage in schedule]
+    if sizes != sorted(sizes):
+        raise ValueError(f"Stage image sizes must not decrease: {sizes}")
+    if sizes[-1] != final_size:
+        raise ValueError(f"The last stage must train at {final_size}x{final_size}, not {sizes[-1]}x{sizes[-1]}")
+    if any(stage['epochs'] < 1 for stage in schedule):
+        raise ValueError(f"Every stage needs at least one epoch: {schedule}")
+    return schedule
+
+
+class TimeToAccuracy(tf.keras.callbacks.Callback):
+    """
+    Training time until the full-resolution model first reaches `target` validation accuracy.
+
+    One instance is shared by every stage of a schedule. After each epoch it
+    scores `eval_model` (the 150x150 model that is saved) on the same
+    validation input, so low-resolution stages are judged by what they do for
+    the served model. The clock runs from start() across all stages, including
+    their input setup, and is paused during this evaluation so every schedule
+    pays the same measurement cost.
+    """
+
+    def __init__(self, eval_model, eval_data, eval_steps, target=None):
+        super().__init__()
+        self.eval_model = eval_model
+        self.eval_data = eval_data
+        self.eval_steps = eval_steps
+        self.target = target
+        self.image_size = None
+        self.elapsed = 0.0
+        self._resumed = None
+        self.epochs = []
+        self.reached = None
+
+    def start(self):
+        self._resumed = time.perf_counter()
+
+    def pause(self):
+        if self._resumed is not None:
+            self.elapsed += time.perf_counter() - self._resumed
+            self._resumed = None
+
+    def begin_stage(self, image_size):
+        self.image_size = image_size
+
+    def on_epoch_end(self, epoch, logs=None):
+        self.pause()
+        val_loss, val_accuracy = self.eval_model.evaluate(self.eval_data, steps=self.eval_steps, verbose=0)
+        record = {
+            'epoch': len(self.epochs),
+            'image_size': self.image_size,
+            'seconds': round(self.elapsed, 3),
+            'val_loss': float(val_loss),
+            'val_accuracy': float(val_accuracy),
+        }
+        self.epochs.append(record)
+        if self.reached is None and self.target is not None and val_accuracy >= self.target:
+            self.reached = record
+            logging.info(f"Reached val_accuracy {val_accuracy:.4f} >= {self.target} after {record['seconds']:.1f}s "
+                         f"(epoch {record['epoch'] + 1})")
+        self.start()
+
+    def report(self):
+        return {
+            'target_accuracy': self.target,
+            'seconds_to_target': self.reached['seconds'] if self.reached else None,
+            'epochs_to_target': self.reached['epoch'] + 1 if self.reached else None,
+            'train_seconds': round(self.elapsed, 3),
+            'final_val_accuracy': self.epochs[-1]['val_accuracy'] if self.epochs else None,
+            'epochs': self.epochs,
+        }
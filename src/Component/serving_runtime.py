@@ -0,0 +1,135 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from src.Component.metrics import BATCH_SIZE, BATCHER_QUEUE_DEPTH, MODEL_LOAD_SECONDS, MODEL_READY
+from src.Component.micro_batcher import MicroBatcher
+from src.Component.prediction_cache import PredictionCache
+
+
+@dataclass
+class ServingRuntime:
+    """The loaded inference engine plus the batcher and cache built around it."""
+    engine: Any
+    batcher: MicroBatcher
+    cache: Optional[PredictionCache] = None
+
+    def stats(self):
+        stats = {'batcher': self.batcher.stats()}
+        if self.cache is not None:
+            stats['cache'] = self.cache.stats()
+        return stats
+
+    def stop(self):
+        self.batcher.stop()
+        if self.cache is not None:
+            self.cache.close()
+
+
+def load_serving_runtime(config):
+    """
+    Load the model and start the serving components described by `config`.
+
+    Args:
+        config: The project Config (uses the `serving` and `inference` sections).
+    """
+    # TensorFlow is imported here rather than by the apps, so they start listening first
+    from src.Component.inference_engine import load_inference_engine
+
+    serving_config = config['serving']
+    started = time.perf_counter()
+    engine = load_inference_engine(serving_config['model_path'], config['inference'])
+    MODEL_LOAD_SECONDS.set(time.perf_counter() - started)
+
+    batcher = MicroBatcher(
+        engine.predict,
+        max_batch_size=serving_config['max_batch_size'],
+        max_wait_ms=serving_config['max_wait_ms'],
+        max_queue_size=serving_config['max_queue_size'],
+        on_batch=BATCH_SIZE.observe,
+    ).start()
+    BATCHER_QUEUE_DEPTH.set_function(batcher.queue_depth)
+
+    cache = None
+    cache_config = serving_config['cache']
+    if cache_config['enabled']:
+        cache = PredictionCache(
+            engine.model_path,
+            max_bytes=cache_config['max_mb'] * 2**20,
+            ttl_seconds=cache_config['ttl_seconds'],
+            disk_path=cache_config['disk_path'],
+            # Versioned by the file as it was loaded, not as it may be later
+            model_stat=engine.model_stat,
+        )
+    return ServingRuntime(engine=engine, batcher=batcher, cache=cache)
+
+
+class BackgroundLoader:
+    """
+    Runs a slow loader (e.g. load_serving_runtime) on a daemon thread and reports its state.
+
+    The state goes from "pending" to "loading" to "ready" or "failed"; a
+    failure is logged and kept in `error` for the readiness endpoints instead
+    of leaving the app to answer every request with a bare 500.
+    """
+
+    def __init__(self, load_fn, *args, on_ready=None):
+        self.load_fn = load_fn
+        self.args = args
+        self.on_ready = on_ready
+        self.state = 'pending'
+        self.result = None
+        self.error = None
+        self.created = time.perf_counter()
+        self.seconds = None
+        self._done = threading.Event()
+        self._start_lock = threading.Lock()
+
+    def load(self):
+        """Run the loader in the calling thread; returns its result, or None if it failed."""
+        self.state = 'loading'
+        started = time.perf_counter()
+        try:
+            self.result = self.load_fn(*self.args)
+            if self.on_ready is not None:
+                self.on_ready(self.result)
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            self.state = 'failed'
+            logging.error(f"Error loading model: {e}")
+        else:
+            self.state = 'ready'
+            MODEL_READY.set(1)
+            logging.info(f"Model loaded successfully in {time.perf_counter() - started:.2f}s "
+                         f"({time.perf_counter() - self.created:.2f}s after startup).")
+        finally:
+            self.seconds = time.perf_counter() - started
+            self._done.set()
+        return self.result
+
+    def start(self):
+        """Load on a daemon thread; a no-op once a load has started in this process."""
+        with self._start_lock:
+            if self.state != 'pending':
+                return self
+            self.state = 'loading'
+        threading.Thread(target=self.load, name='model-loader', daemon=True).start()
+        return self
+
+    def wait(self, timeout=None):
+        """Block until loading finished (either way); returns False on timeout."""
+        return self._done.wait(timeout)
+
+    @property
+    def ready(self):
+        return self.state == 'ready'
+
+    def status(self):
+        status = {'state': self.state, 'uptime_seconds': round(time.perf_counter() - self.created, 3)}
+        if self.seconds is not None:
+            status['load_seconds'] = round(self.seconds, 3)
+        if self.error is not None:
+            status['error'] = self.error
+        return status
@@ -0,0 +1,156 @@
+import csv
+import hashlib
+import logging
+import os
+import random
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src.Component.tf_data_pipeline import WHITE_LIST_FORMATS
+
+MANIFEST_COLUMNS = ('path', 'label', 'split', 'sha1', 'size', 'mtime_ns')
+MATERIALIZE_MODES = ('none', 'hardlink', 'symlink', 'copy')
+
+
+def file_sha1(path, chunk_size=1 << 20):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class SplitManifest:
+    """
+    Deterministic train/test split recorded as a CSV instead of copied files.
+
+    One row per source image: its path relative to the source directory, class
+    label, split, content hash, size and mtime. The split only depends on the
+    sorted file listing and the seed, so rebuilding over the same files gives
+    the same manifest.
+    """
+
+    def __init__(self, manifest_path):
+        self.manifest_path = str(manifest_path)
+        self.rows = self.load()
+
+    def load(self):
+        if not os.path.exists(self.manifest_path):
+            return []
+        with open(self.manifest_path, newline='') as f:
+            rows = list(csv.DictReader(f))
+        for row in rows:
+            row['size'] = int(row['size'])
+            row['mtime_ns'] = int(row['mtime_ns'])
+        return rows
+
+    def write(self):
+        os.makedirs(os.path.dirname(self.manifest_path) or '.', exist_ok=True)
+        tmp = f'{self.manifest_path}.tmp'
+        with open(tmp, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=MANIFEST_COLUMNS)
+            writer.writeheader()
+            writer.writerows(self.rows)
+        os.replace(tmp, self.manifest_path)
+
+    @staticmethod
+    def scan_source(source_dir, classes):
+        """(relative path, label, size, mtime_ns) for every image under source_dir/<class>/, sorted."""
+        entries = []
+        for cls in classes:
+            with os.scandir(os.path.join(source_dir, cls)) as it:
+                for entry in it:
+                    if entry.is_file() and entry.name.lower().endswith(WHITE_LIST_FORMATS):
+                        stat = entry.stat()
+                        entries.append((f'{cls}/{entry.name}', cls, stat.st_size, stat.st_mtime_ns))
+        return sorted(entries)
+
+    def is_current(self, source_dir, classes, output_dir=None, materialize='none'):
+        """True when the manifest covers exactly the current source files (and their materialised links)."""
+        if not self.rows:
+            return False
+        recorded = sorted((r['path'], r['label'], r['size'], r['mtime_ns']) for r in self.rows)
+        if recorded != self.scan_source(source_dir, classes):
+            return False
+        if materialize != 'none':
+            return all(os.path.exists(self.materialized_path(output_dir, row)) for row in self.rows)
+        return True
+
+    def build(self, source_dir, classes, train_ratio=0.8, seed=42, max_workers=8):
+        """Re-split the current source files, reusing hashes of files whose size and mtime are unchanged."""
+        known = {(r['path'], r['size'], r['mtime_ns']): r['sha1'] for r in self.rows}
+        entries = self.scan_source(source_dir, classes)
+        rng = random.Random(seed)
+        rows = []
+        for cls in classes:
+            class_entries = [e for e in entries if e[1] == cls]
+            rng.shuffle(class_entries)
+            train_count = int(len(class_entries) * train_ratio)
+            for i, (path, label, size, mtime_ns) in enumerate(class_entries):
+                rows.append({
+                    'path': path, 'label': label, 'split': 'train' if i < train_count else 'test',
+                    'sha1': known.get((path, size, mtime_ns), ''), 'size': size, 'mtime_ns': mtime_ns,
+                })
+
+        missing = [row for row in rows if not row['sha1']]
+        if missing:
+            logging.info(f"Hashing {len(missing)} new or changed images")
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                digests = pool.map(file_sha1, (os.path.join(source_dir, row['path']) for row in missing))
+                for row, digest in zip(missing, digests):
+                    row['sha1'] = digest
+        self.rows = rows
+        return self
+
+    @staticmethod
+    def materialized_path(output_dir, row):
+        return os.path.join(output_dir, row['split'], row['path'])
+
+    def materialize(self, source_dir, output_dir, mode='hardlink'):
+        """
+        Lay the split out as output_dir/<split>/<class>/ for directory-based readers.
+
+        hardlink and symlink cost no extra disk; hardlinks fall back to copies
+        when the output is on another filesystem.
+        """
+        if mode not in MATERIALIZE_MODES:
+            raise ValueError(f"Unknown materialize mode: {mode!r} (expected one of {MATERIALIZE_MODES})")
+        # Rows move between splits when the listing changes, so rebuild the tree from scratch
+        for split in ('train', 'test'):
+            shutil.rmtree(os.path.join(output_dir, split), ignore_errors=True)
+        if mode == 'none':
+            return
+        for row in self.rows:
+            source = os.path.abspath(os.path.join(source_dir, row['path']))
+            target = self.materialized_path(output_dir, row)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            if mode == 'symlink':
+                os.symlink(source, target)
+            elif mode == 'copy':
+                shutil.copy(source, target)
+            else:
+                try:
+                    os.link(source, target)
+                except OSError:
+                    shutil.copy(source, target)
+
+    def split_files(self, source_dir, split):
+        """
+        (filepaths, labels, class_indices) of one split, ordered like flow_from_directory
+        (sorted classes, sorted files within each class).
+        """
+        classes = sorted({row['label'] for row in self.rows})
+        class_indices = {cls: i for i, cls in enumerate(classes)}
+        rows = sorted((r for r in self.rows if r['split'] == split), key=lambda r: (class_indices[r['label']], r['path']))
+        filepaths = [os.path.join(source_dir, r['path']) for r in rows]
+        labels = np.asarray([class_indices[r['label']] for r in rows], dtype=np.int32)
+        return filepaths, labels, class_indices
+
+    def counts(self):
+        counts = {}
+        for row in self.rows:
+            key = (row['split'], row['label'])
+            counts[key] = counts.get(key, 0) + 1
+        return counts
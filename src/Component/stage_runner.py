@@ -0,0 +1,135 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Tuple
+
+
+def fingerprint(value):
+    """Stable SHA-1 of any JSON-serialisable value."""
+    return hashlib.sha1(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def tree_fingerprint(*paths):
+    """
+    Fingerprint of the files under `paths` from their names, sizes and mtimes.
+
+    Only stats files (no reads), so a warm check over the full dataset takes
+    a fraction of a second. Missing paths fingerprint as missing.
+    """
+    digest = hashlib.sha1()
+    for path in paths:
+        path = str(path)
+        if not os.path.exists(path):
+            digest.update(f'missing:{path}\n'.encode())
+            continue
+        if os.path.isfile(path):
+            stat = os.stat(path)
+            digest.update(f'{path}\0{stat.st_size}\0{stat.st_mtime_ns}\n'.encode())
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                stat = os.stat(os.path.join(root, name))
+                digest.update(f'{os.path.relpath(os.path.join(root, name), path)}\0{stat.st_size}\0{stat.st_mtime_ns}\n'.encode())
+    return digest.hexdigest()
+
+
+@dataclass
+class Stage:
+    """
+    One step of the data pipeline.
+
+    Args:
+        name: Unique stage name.
+        run: Callable receiving {dep name: dep artifacts} and returning this stage's
+            artifacts as a JSON-serialisable dict (typically output paths).
+        deps: Names of the stages whose artifacts this one consumes.
+        params: Settings that affect the output; changing them re-runs the stage.
+        outputs_fingerprint: Callable mapping this stage's artifacts to a fingerprint of
+            what is on disk, used to detect outputs that changed or disappeared.
+    """
+    name: str
+    run: Callable[[Dict[str, dict]], dict]
+    deps: Tuple[str, ...] = ()
+    params: dict = field(default_factory=dict)
+    outputs_fingerprint: Callable[[dict], str] = None
+
+
+class StageRunner:
+    """
+    Runs stages on demand, skipping the ones whose inputs and outputs are unchanged.
+
+    A stage's input fingerprint covers its params and the current output
+    fingerprints of its dependencies; both fingerprints are recorded in a JSON
+    state file after every run. `require(name)` brings `name` and its
+    dependencies up to date and returns its artifacts, so each consumer only
+    pays for the stages it actually needs.
+    """
+
+    def __init__(self, state_path):
+        self.state_path = str(state_path)
+        self.stages = {}
+        self._state = self._load_state()
+        self._resolved = {}
+
+    def _load_state(self):
+        try:
+            with open(self.state_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True)
+        tmp = f'{self.state_path}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self._state, f, indent=2)
+        os.replace(tmp, self.state_path)
+
+    def add(self, stage):
+        self.stages[stage.name] = stage
+        return self
+
+    def _outputs_fingerprint(self, stage, artifacts):
+        return stage.outputs_fingerprint(artifacts) if stage.outputs_fingerprint else fingerprint(artifacts)
+
+    def _input_fingerprint(self, stage, upstream):
+        return fingerprint({
+            'params': stage.params,
+            'deps': {dep: self._resolved[dep][1] for dep in upstream},
+        })
+
+    def require(self, name, force=False):
+        """Bring stage `name` (and its dependencies) up to date and return its artifacts."""
+        if name in self._resolved and not force:
+            return self._resolved[name][0]
+        stage = self.stages[name]
+        upstream = {dep: self.require(dep) for dep in stage.deps}
+        input_fp = self._input_fingerprint(stage, upstream)
+
+        record = self._state.get(name)
+        if not force and record and record['input'] == input_fp:
+            output_fp = self._outputs_fingerprint(stage, record['artifacts'])
+            if output_fp == record['output']:
+                logging.info(f"Stage '{name}' is up to date, skipping")
+                self._resolved[name] = (record['artifacts'], output_fp)
+                return record['artifacts']
+
+        logging.info(f"Running stage '{name}'")
+        started = time.perf_counter()
+        artifacts = stage.run(upstream)
+        output_fp = self._outputs_fingerprint(stage, artifacts)
+        self._state[name] = {
+            'input': input_fp,
+            'output': output_fp,
+            'artifacts': artifacts,
+            'seconds': round(time.perf_counter() - started, 3),
+            'completed_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+        self._save_state()
+        self._resolved[name] = (artifacts, output_fp)
+        logging.info(f"Stage '{name}' finished in {self._state[name]['seconds']}s")
+        return artifacts
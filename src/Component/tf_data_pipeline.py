@@ -0,0 +1,234 @@
+import logging
+import os
+
+import numpy as np
+import tensorflow as tf
+
+# Same extensions flow_from_directory accepts
+WHITE_LIST_FORMATS = ('png', 'jpg', 'jpeg', 'bmp', 'ppm', 'tif', 'tiff')
+
+
+def list_split_files(directory):
+    """
+    List images under `directory/<class>/` the way flow_from_directory does.
+
+    Classes are the sorted sub-directory names, files are sorted per class.
+
+    Returns:
+        (filepaths, labels, class_indices)
+    """
+    classes = sorted(d for d in os.listdir(directory) if os.path.isdir(os.path.join(directory, d)))
+    class_indices = {cls: i for i, cls in enumerate(classes)}
+    filepaths, labels = [], []
+    for cls in classes:
+        class_dir = os.path.join(directory, cls)
+        for root, _, files in sorted(os.walk(class_dir, followlinks=True)):
+            for fname in sorted(files):
+                if fname.lower().endswith(WHITE_LIST_FORMATS):
+                    filepaths.append(os.path.join(root, fname))
+                    labels.append(class_indices[cls])
+    return filepaths, np.asarray(labels, dtype=np.int32), class_indices
+
+
+def split_indices(labels, validation_split, subset):
+    """
+    Indices of the `training` or `validation` subset per class, matching ImageDataGenerator:
+    the first `validation_split` fraction of each class is validation, the rest training.
+    """
+    labels = np.asarray(labels)
+    if not validation_split:
+        return np.arange(len(labels), dtype=np.int64)
+    keep = []
+    for label in np.unique(labels):
+        indices = np.flatnonzero(labels == label)
+        cut = int(validation_split * len(indices))
+        keep.extend(indices[:cut] if subset == 'validation' else indices[cut:])
+    return np.asarray(sorted(keep), dtype=np.int64)
+
+
+def split_subset(filepaths, labels, validation_split, subset):
+    """Select the `training` or `validation` (filepaths, labels) subset, see split_indices."""
+    keep = split_indices(labels, validation_split, subset)
+    return [filepaths[i] for i in keep], np.asarray(labels)[keep]
+
+
+def build_augmenter(rotation_range=10, zoom_range=0.2, horizontal_flip=True, seed=None):
+    """
+    Batched equivalent of ImageDataGenerator's rotation/zoom/flip augmentation.
+
+    Each layer draws per-image random parameters and applies them to the whole
+    batch as one projective-transform op.
+    """
+    layers = []
+    if horizontal_flip:
+        layers.append(tf.keras.layers.RandomFlip('horizontal', seed=seed))
+    if rotation_range:
+        layers.append(tf.keras.layers.RandomRotation(rotation_range / 360.0, fill_mode='nearest', seed=seed))
+    if zoom_range:
+        layers.append(tf.keras.layers.RandomZoom(
+            (-zoom_range, zoom_range), (-zoom_range, zoom_range), fill_mode='nearest', seed=seed
+        ))
+    return tf.keras.Sequential(layers)
+
+
+def mobilenet_scale(images):
+    """MobileNetV2 preprocess_input on a float tensor: [0, 255] -> [-1, 1]."""
+    return images / 127.5 - 1.0
+
+
+def model_input_fn(training, augmenter=None):
+    """Map function turning a uint8 (images, labels) batch into augmented, MobileNetV2-scaled model input."""
+    def to_model_input(images, batch_labels):
+        images = tf.cast(images, tf.float32)
+        if training and augmenter is not None:
+            images = augmenter(images, training=True)
+        return mobilenet_scale(images), batch_labels
+
+    return to_model_input
+
+
+def _decode_and_resize(target_size):
+    height, width = target_size
+
+    def load(path, label):
+        contents = tf.io.read_file(path)
+        # Accurate integer IDCT decodes JPEGs bit-identically to PIL
+        image = tf.cond(
+            tf.io.is_jpeg(contents),
+            lambda: tf.io.decode_jpeg(contents, channels=3, dct_method='INTEGER_ACCURATE'),
+            lambda: tf.io.decode_image(contents, channels=3, expand_animations=False),
+        )
+        # flow_from_directory resizes with nearest-neighbour by default
+        image = tf.image.resize(image, (height, width), method='nearest')
+        image = tf.cast(image, tf.uint8)
+        image.set_shape((height, width, 3))
+        return image, label
+
+    return load
+
+
+def attach_iterator_attributes(dataset, labels, class_indices, batch_size, filepaths, num_shards=1, shard_index=0,
+                               split_samples=None):
+    """
+    Expose the DirectoryIterator attributes ModelTrain and PredictionPipeline rely on.
+
+    For one shard of a split (data-parallel workers), `samples` and the lists
+    describe the shard; `split_samples` is the size of the whole split.
+    """
+    dataset.samples = len(labels)
+    dataset.split_samples = split_samples if split_samples is not None else len(labels)
+    dataset.num_shards = num_shards
+    dataset.shard_index = shard_index
+    dataset.batch_size = batch_size
+    dataset.classes = np.asarray(labels)
+    dataset.class_indices = dict(class_indices)
+    dataset.num_classes = len(class_indices)
+    dataset.filenames = list(filepaths)
+    dataset.n = dataset.samples
+    return dataset
+
+
+def make_dataset(filepaths, labels, class_indices, target_size, batch_size, training,
+                 augmenter=None, cache=True, shuffle_buffer=2048, seed=None, num_shards=1, shard_index=0):
+    """
+    Build a batched tf.data pipeline over (path, label) pairs.
+
+    Files are decoded and resized in parallel, cached as uint8 (in memory, or
+    in the file `cache` if it is a path), then augmented as whole batches and
+    scaled for MobileNetV2. Training datasets are shuffled and repeat forever,
+    like ImageDataGenerator iterators; evaluation datasets keep file order and
+    end after one pass. With a `seed`, every run (and every worker of a
+    distributed run) shuffles in the same order, and a training dataset gets
+    a `from_batch(n)` method returning the same stream started at batch `n`
+    (see resumable_input).
+
+    With `num_shards` > 1, only every `num_shards`-th file starting at
+    `shard_index` is read, so data-parallel workers decode disjoint files.
+    """
+    autotune = tf.data.AUTOTUNE
+    labels = np.asarray(labels)
+    split_samples = len(labels)
+    if num_shards > 1:
+        # Sharded before shuffling and decoding
+        filepaths, labels = list(filepaths)[shard_index::num_shards], labels[shard_index::num_shards]
+
+    def from_batch(start_batch=0):
+        # A fresh pipeline each call: iterating a dataset advances its shuffle seeds,
+        # so only a newly built one replays the seeded stream from its start
+        dataset = tf.data.Dataset.from_tensor_slices((list(filepaths), labels.astype(np.float32)))
+        if training:
+            # Full, cheap shuffle of paths before decoding
+            dataset = dataset.shuffle(len(labels), seed=seed, reshuffle_each_iteration=True)
+        # A seeded stream must also decode in order to be reproducible
+        dataset = dataset.map(_decode_and_resize(target_size), num_parallel_calls=autotune,
+                              deterministic=not training or seed is not None)
+        if cache:
+            dataset = dataset.cache(cache if isinstance(cache, str) else '')
+        if training:
+            # Re-mix after the cache, which replays the first epoch's order
+            dataset = dataset.shuffle(shuffle_buffer, seed=seed, reshuffle_each_iteration=True).repeat()
+        dataset = dataset.batch(batch_size, drop_remainder=False)
+        if start_batch:
+            # Skipped batches are never augmented; after the first epoch they only cost cache reads
+            dataset = dataset.skip(start_batch)
+        return dataset.map(model_input_fn(training, augmenter), num_parallel_calls=autotune).prefetch(autotune)
+
+    dataset = attach_iterator_attributes(
+        from_batch(), labels, class_indices, batch_size, filepaths, num_shards, shard_index, split_samples
+    )
+    if training and seed is not None:
+        dataset.from_batch = from_batch
+    return dataset
+
+
+def iterate_batches(generator):
+    """Yield (x, y) batches for one pass over a DirectoryIterator/Sequence or a finite tf.data split."""
+    if isinstance(generator, tf.data.Dataset):
+        yield from generator.as_numpy_iterator()
+        return
+    for i in range(len(generator)):
+        yield generator[i]
+
+
+def _split_cache(cache, name, num_shards=1, shard_index=0):
+    if num_shards > 1:
+        name = f'{name}.shard{shard_index}of{num_shards}'
+    if isinstance(cache, str):
+        os.makedirs(cache, exist_ok=True)
+        return os.path.join(cache, name)
+    return cache
+
+
+def tf_data_test_split(test_dir, target_size, batch_size, cache=True, test_files=None):
+    """The test split alone: file order, no augmentation, one pass."""
+    filepaths, labels, class_indices = test_files or list_split_files(test_dir)
+    return make_dataset(filepaths, labels, class_indices, target_size, batch_size, False,
+                        None, _split_cache(cache, 'test'))
+
+
+def tf_data_generators(train_dir, test_dir, target_size, batch_size, validation_split,
+                       cache=True, shuffle_buffer=2048, seed=None, train_files=None, test_files=None,
+                       num_shards=1, shard_index=0):
+    """
+    Return (train, validation, test) tf.data splits equivalent to DataGenerator's Keras iterators.
+
+    `train_files`/`test_files` are optional (filepaths, labels, class_indices) listings
+    (e.g. from the split manifest) used instead of walking the split directories.
+    `num_shards`/`shard_index` shard train and validation (see make_dataset); test is never sharded.
+    """
+    filepaths, labels, class_indices = train_files or list_split_files(train_dir)
+    augmenter = build_augmenter(seed=seed)
+
+    train_files, train_labels = split_subset(filepaths, labels, validation_split, 'training')
+    val_files, val_labels = split_subset(filepaths, labels, validation_split, 'validation')
+
+    train = make_dataset(train_files, train_labels, class_indices, target_size, batch_size, True,
+                         augmenter, _split_cache(cache, 'train', num_shards, shard_index), shuffle_buffer, seed,
+                         num_shards, shard_index)
+    # Validation mirrors ImageDataGenerator's subset iterator: shuffled, repeating, and augmented
+    validation = make_dataset(val_files, val_labels, class_indices, target_size, batch_size, True,
+                              augmenter, _split_cache(cache, 'validation', num_shards, shard_index), shuffle_buffer,
+                              seed, num_shards, shard_index)
+    test = tf_data_test_split(test_dir, target_size, batch_size, cache, test_files)
+    logging.info(f"tf.data pipelines ready: {train.samples} train, {validation.samples} validation, {test.samples} test")
+    return train, validation, test
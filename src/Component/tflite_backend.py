@@ -0,0 +1,88 @@
+import logging
+import threading
+import time
+
+import numpy as np
+import tensorflow as tf
+
+
+class TFLiteEngine:
+    """
+    CPU inference from a converted TFLite model with the InferenceEngine interface.
+
+    The interpreter is not thread-safe, so calls are serialised with a lock.
+    Batches are padded up to the nearest of `batch_sizes` so the input tensor
+    is only resized (and the arena reallocated) when the bucket changes;
+    quantized (int8/uint8) input and output tensors are handled transparently
+    using the tensors' quantization parameters.
+    """
+
+    def __init__(self, model_path, num_threads=None, batch_sizes=(1, 8, 32), warmup=True):
+        self.model_path = str(model_path)
+        self.interpreter = tf.lite.Interpreter(model_path=self.model_path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self.input_shape = tuple(int(d) for d in self._input['shape'][1:])
+        self.batch_sizes = tuple(sorted(set(int(b) for b in batch_sizes)))
+        self.max_batch_size = self.batch_sizes[-1]
+        self._batch_size = int(self._input['shape'][0])
+        self._lock = threading.Lock()
+
+        if warmup:
+            self.warmup()
+
+    def warmup(self):
+        started = time.perf_counter()
+        for size in self.batch_sizes:
+            self.predict(np.zeros((size, *self.input_shape), dtype=np.float32))
+        logging.info(f"TFLiteEngine {self.model_path} warmed up in {time.perf_counter() - started:.2f}s")
+
+    def _quantize_input(self, images):
+        dtype = self._input['dtype']
+        if dtype == np.float32:
+            return images
+        scale, zero_point = self._input['quantization']
+        info = np.iinfo(dtype)
+        return np.clip(np.round(images / scale + zero_point), info.min, info.max).astype(dtype)
+
+    def _dequantize_output(self, outputs):
+        if self._output['dtype'] == np.float32:
+            return outputs
+        scale, zero_point = self._output['quantization']
+        return (outputs.astype(np.float32) - zero_point) * scale
+
+    def _bucket(self, n):
+        for size in self.batch_sizes:
+            if size >= n:
+                return size
+        return self.max_batch_size
+
+    def _run_chunk(self, chunk):
+        n = len(chunk)
+        bucket = self._bucket(n)
+        if bucket != n:
+            padded = np.zeros((bucket, *self.input_shape), dtype=np.float32)
+            padded[:n] = chunk
+            chunk = padded
+        with self._lock:
+            if bucket != self._batch_size:
+                self.interpreter.resize_tensor_input(self._input['index'], (bucket, *self.input_shape))
+                self.interpreter.allocate_tensors()
+                self._batch_size = bucket
+            self.interpreter.set_tensor(self._input['index'], self._quantize_input(chunk))
+            self.interpreter.invoke()
+            outputs = self.interpreter.get_tensor(self._output['index'])
+        return self._dequantize_output(outputs)[:n]
+
+    def predict(self, images):
+        """Predict on an (N, H, W, C) array of preprocessed images."""
+        images = np.asarray(images, dtype=np.float32)
+        if len(images) <= self.max_batch_size:
+            return self._run_chunk(images)
+        return np.concatenate([
+            self._run_chunk(images[start:start + self.max_batch_size])
+            for start in range(0, len(images), self.max_batch_size)
+        ])
+
+    __call__ = predict
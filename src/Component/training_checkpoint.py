@@ -0,0 +1,235 @@
+import json
+import logging
+import os
+import shutil
+
+import numpy as np
+import tensorflow as tf
+
+STATE_FILE = 'state.json'
+LATEST_WEIGHTS = 'latest.weights.h5'
+BEST_WEIGHTS = 'best.weights.h5'
+
+
+def resumable_batches(iterator, steps_per_epoch, start_epoch=0, start_step=0, seed=0, num_shards=1, shard_index=0):
+    """
+    Endless tf.data stream of a Keras image iterator's batches, starting at (start_epoch, start_step).
+
+    The order of every epoch is a permutation seeded by (seed, epoch), so a
+    resumed run continues with exactly the batch an interrupted run would have
+    trained on next; skipped batches are never loaded. Augmentation is still random.
+
+    With `num_shards` > 1 (data-parallel workers), a step covers
+    `num_shards * iterator.batch_size` images and this stream yields only the
+    `shard_index`-th slice of each, so workers read disjoint files.
+    """
+    x, y = iterator[0][:2]
+    signature = (
+        tf.TensorSpec((None, *x.shape[1:]), tf.as_dtype(x.dtype)),
+        tf.TensorSpec((None, *y.shape[1:]), tf.as_dtype(y.dtype)),
+    )
+
+    def batches():
+        epoch, step = start_epoch, start_step
+        while True:
+            if iterator.shuffle:
+                order = np.random.default_rng([seed, epoch]).permutation(iterator.n)
+            else:
+                order = np.arange(iterator.n)
+            for i in range(step, steps_per_epoch):
+                first = (i * num_shards + shard_index) * iterator.batch_size
+                index_array = order[first:first + iterator.batch_size]
+                # iterator[i] serves batches from its own index_array, which it reshuffles with the
+                # unseeded global RNG at every epoch end, so the seeded order is applied here by
+                # calling the method __getitem__ itself delegates to
+                yield tuple(iterator._get_batches_of_transformed_samples(index_array)[:2])
+            epoch, step = epoch + 1, 0
+
+    return tf.data.Dataset.from_generator(batches, output_signature=signature).prefetch(tf.data.AUTOTUNE)
+
+
+def resumable_input(data, steps_per_epoch, start_epoch=0, start_step=0, seed=0):
+    """
+    Training input positioned at (start_epoch, start_step).
+
+    tf.data pipelines (the tfdata and shards backends) built with a seed
+    replay the same stream on every run, so they are started at batch
+    `start_epoch * steps_per_epoch + start_step` with `from_batch`. Unseeded
+    ones cannot be positioned: they are returned as they are, and a resumed
+    epoch reshuffles and only runs its remaining number of steps.
+    """
+    if isinstance(data, tf.data.Dataset):
+        from_batch = getattr(data, 'from_batch', None)
+        if from_batch is None:
+            if start_epoch or start_step:
+                logging.warning("Training input has no seed (data.seed); the resumed epoch is reshuffled")
+            return data
+        return from_batch(start_epoch * steps_per_epoch + start_step)
+    return resumable_batches(data, steps_per_epoch, start_epoch, start_step, seed)
+
+
+class TrainingCheckpoint(tf.keras.callbacks.Callback):
+    """
+    Periodic checkpoints, early stopping and best-weights tracking that survive a restart.
+
+    Layout under `checkpoint_dir`:
+        latest.weights.h5   model and optimizer state at the last checkpoint
+        best.weights.h5     model at the epoch with the best `monitor` value
+        state.json          position (epoch, step in epoch), best value and
+                            early-stopping counter, plus the run settings a
+                            resume must match
+    """
+
+    def __init__(self, checkpoint_dir, save_every_steps=None, monitor='val_loss', patience=None,
+                 min_delta=0.0, save_best=True, run_info=None):
+        """
+        Args:
+            checkpoint_dir: Directory for the files above.
+            save_every_steps: Also checkpoint every N train steps within an epoch.
+            monitor: Epoch-end metric for early stopping and best weights ('max' mode for accuracies).
+            patience: Epochs without improvement before training stops; None disables early stopping.
+            save_best: Keep best.weights.h5 so restore_best() can load it after training.
+            run_info: Settings (steps per epoch, batch size) that must be unchanged to resume.
+        """
+        super().__init__()
+        self.checkpoint_dir = str(checkpoint_dir)
+        self.save_every_steps = save_every_steps
+        self.monitor = monitor
+        self.mode = 'min' if 'loss' in monitor else 'max'
+        self.patience = patience
+        self.min_delta = abs(min_delta)
+        self.save_best = save_best
+        self.run_info = run_info or {}
+        self.state = self._initial_state()
+
+    def _initial_state(self):
+        return {'epoch': 0, 'step': 0, 'best': None, 'best_epoch': None, 'wait': 0, 'stopped': False,
+                'run': self.run_info}
+
+    def _path(self, name):
+        return os.path.join(self.checkpoint_dir, name)
+
+    def reset(self):
+        """Start a fresh run: drop any earlier checkpoint."""
+        shutil.rmtree(self.checkpoint_dir, ignore_errors=True)
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        self.state = self._initial_state()
+
+    def resume(self):
+        """Load the last checkpoint into the model; returns the (epoch, step) to continue from."""
+        try:
+            with open(self._path(STATE_FILE)) as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            logging.info(f"No checkpoint in {self.checkpoint_dir}, starting from scratch")
+            self.reset()
+            return 0, 0
+        if state['run'] != self.run_info:
+            raise ValueError(
+                f"Checkpoint in {self.checkpoint_dir} is from a run with {state['run']}, not {self.run_info}"
+            )
+        # Optimizer slots must exist before their saved values can be loaded
+        if not self.model.optimizer.built:
+            self.model.optimizer.build(self.model.trainable_variables)
+        self.model.load_weights(self._path(LATEST_WEIGHTS))
+        self.state = state
+        logging.info(f"Resumed from {self.checkpoint_dir} at epoch {state['epoch'] + 1}, step {state['step']}")
+        return state['epoch'], state['step']
+
+    def restore_best(self):
+        if self.save_best and os.path.exists(self._path(BEST_WEIGHTS)):
+            self.model.load_weights(self._path(BEST_WEIGHTS))
+            logging.info(f"Restored best weights from epoch {self.state['best_epoch'] + 1} "
+                         f"({self.monitor}={self.state['best']:.4f})")
+
+    def _save_weights(self, name):
+        # Keras requires the .weights.h5 suffix; write aside and rename so a crash never leaves half a file
+        tmp = self._path('tmp.' + name)
+        self.model.save_weights(tmp)
+        os.replace(tmp, self._path(name))
+
+    def _save(self):
+        self._save_weights(LATEST_WEIGHTS)
+        tmp = self._path(STATE_FILE + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp, self._path(STATE_FILE))
+
+    def _improved(self, current):
+        best = self.state['best']
+        if best is None:
+            return True
+        return current < best - self.min_delta if self.mode == 'min' else current > best + self.min_delta
+
+    def on_epoch_begin(self, epoch, logs=None):
+        # A resumed epoch continues counting from the step it was checkpointed at
+        self._offset = self.state['step'] if epoch == self.state['epoch'] else 0
+        self.state['epoch'] = epoch
+        self._last_batch = -1
+        self._since_save = 0
+
+    def on_train_batch_end(self, batch, logs=None):
+        self._since_save += batch - self._last_batch
+        self._last_batch = batch
+        self.state['step'] = self._offset + batch + 1
+        if self.save_every_steps and self._since_save >= self.save_every_steps:
+            self._save()
+            self._since_save = 0
+
+    def on_epoch_end(self, epoch, logs=None):
+        current = (logs or {}).get(self.monitor)
+        if current is None:
+            logging.warning(f"'{self.monitor}' is not in the epoch logs; early stopping and best weights are skipped")
+        elif self._improved(current):
+            self.state.update(best=float(current), best_epoch=epoch, wait=0)
+            if self.save_best:
+                self._save_weights(BEST_WEIGHTS)
+        else:
+            self.state['wait'] += 1
+            if self.patience and self.state['wait'] >= self.patience:
+                self.state['stopped'] = True
+                self.model.stop_training = True
+                logging.info(
+                    f"Early stopping after epoch {epoch + 1}: {self.monitor} has not improved for "
+                    f"{self.patience} epochs (best {self.state['best']:.4f} at epoch {self.state['best_epoch'] + 1})"
+                )
+        self.state['epoch'], self.state['step'] = epoch + 1, 0
+        self._save()
+
+
+def fit_resumable(model, make_input, epochs, steps_per_epoch, checkpoint, resume=False, callbacks=(), **fit_kwargs):
+    """
+    `model.fit` that can pick up from `checkpoint` and ends with the best weights loaded.
+
+    make_input(epoch, step) must return a training input positioned at that
+    batch. An epoch interrupted mid-way is finished by a first, shorter fit()
+    so that every later epoch keeps its original boundaries.
+
+    Returns a History with the epochs trained in this call.
+    """
+    checkpoint.set_model(model)
+    if resume:
+        epoch, step = checkpoint.resume()
+    else:
+        checkpoint.reset()
+        epoch, step = 0, 0
+    callbacks = [checkpoint, *callbacks]
+    legs = []
+    if step and epoch < epochs and not checkpoint.state['stopped']:
+        logging.info(f"Finishing epoch {epoch + 1} from step {step}/{steps_per_epoch}")
+        legs.append(model.fit(make_input(epoch, step), initial_epoch=epoch, epochs=epoch + 1,
+                              steps_per_epoch=steps_per_epoch - step, callbacks=callbacks, **fit_kwargs))
+        epoch += 1
+    if epoch < epochs and not checkpoint.state['stopped']:
+        legs.append(model.fit(make_input(epoch, 0), initial_epoch=epoch, epochs=epochs,
+                              steps_per_epoch=steps_per_epoch, callbacks=callbacks, **fit_kwargs))
+    checkpoint.restore_best()
+
+    history = tf.keras.callbacks.History()
+    history.set_model(model)
+    history.epoch, history.history = [], {}
+    for leg in legs:
+        history.epoch.extend(leg.epoch)
+        for key, values in leg.history.items():
+            history.history.setdefault(key, []).extend(values)
+    return history
@@ -0,0 +1,60 @@
+import logging
+
+BF16_CPU_FLAGS = ('avx512_bf16', 'amx_bf16')
+PRECISIONS = ('float32', 'mixed_bfloat16')
+
+
+def cpu_supports_bf16(cpuinfo_path='/proc/cpuinfo'):
+    """True when the CPU has native bfloat16 arithmetic (AVX512-BF16 or AMX)."""
+    try:
+        with open(cpuinfo_path) as f:
+            for line in f:
+                if line.startswith('flags'):
+                    flags = set(line.split(':', 1)[1].split())
+                    return any(flag in flags for flag in BF16_CPU_FLAGS)
+    except OSError:
+        pass
+    return False
+
+
+def resolve_precision(setting):
+    """
+    Keras dtype policy name for `training.mixed_precision`.
+
+    "auto" picks mixed_bfloat16 only on CPUs with native bf16 support; elsewhere
+    bf16 is emulated and always slower than float32. Even with native support
+    it is not always a win, so check benchmarks/bench_training.py first.
+    """
+    if setting in (None, False, 'float32'):
+        return 'float32'
+    if setting in (True, 'bfloat16', 'mixed_bfloat16'):
+        return 'mixed_bfloat16'
+    if setting == 'auto':
+        return 'mixed_bfloat16' if cpu_supports_bf16() else 'float32'
+    raise ValueError(f"Unknown mixed_precision setting: {setting!r} (expected 'auto', 'bfloat16' or false)")
+
+
+def scaled_learning_rate(learning_rate, batch_size, base_batch_size):
+    """Linear scaling rule: the learning rate grows with the batch size it was tuned for."""
+    return learning_rate * batch_size / base_batch_size
+
+
+def training_options(training_config=None):
+    """
+    Resolve the `training` section of configs/default.yaml into the options
+    MobileNetV2Model and ModelTrain use. Missing keys keep the original
+    behaviour: float32, Adam(1e-3), batch size 32, no XLA, one step per call.
+    """
+    training_config = training_config or {}
+    batch_size = int(training_config.get('batch_size', 32))
+    base_lr = float(training_config.get('learning_rate', 1e-3))
+    options = {
+        'epochs': int(training_config.get('epochs', 10)),
+        'batch_size': batch_size,
+        'learning_rate': scaled_learning_rate(base_lr, batch_size, int(training_config.get('base_batch_size', batch_size))),
+        'precision': resolve_precision(training_config.get('mixed_precision', False)),
+        'jit_compile': bool(training_config.get('jit_compile', False)),
+        'steps_per_execution': int(training_config.get('steps_per_execution', 1)),
+    }
+    logging.info(f"Training options: {options}")
+    return options
@@ -0,0 +1,196 @@
+import json
+import logging
+import os
+import resource
+import statistics
+import threading
+import time
+
+import tensorflow as tf
+
+# Share of step time spent waiting for input above which a run is reported as input-bound
+INPUT_BOUND_THRESHOLD = 0.2
+
+
+def peak_rss_mb():
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class TrainingProfiler(tf.keras.callbacks.Callback):
+    """
+    Per-step input/compute timing for `model.fit`.
+
+    Keras prefetches and pulls batches inside the compiled train step, so the
+    callback hooks alone cannot tell input time from compute time. `wrap()`
+    appends a pass-through stage to the training input that timestamps the
+    moment each batch is handed to the step. The data wait of a step is how long
+    after the step started its batch arrived; the rest of the step is compute.
+    With steps_per_execution > 1 only the wait for the first batch of each call
+    is counted.
+
+    Every step is written as one JSON line to `log_path`, followed by per-epoch
+    lines and a final summary that says whether the run was input-bound.
+    """
+
+    def __init__(self, log_path='logs/training_profile.jsonl', trace_steps=None, trace_dir='logs/tf_trace',
+                 warmup_steps=1):
+        """
+        Args:
+            log_path: JSON-lines output file.
+            trace_steps: Optional [first, last] global steps to capture with the TensorFlow profiler
+                (viewable in TensorBoard's Profile tab).
+            trace_dir: Where the profiler trace is written.
+            warmup_steps: Leading steps (tracing, graph building) left out of the summary.
+        """
+        super().__init__()
+        self.log_path = str(log_path)
+        self.trace_steps = tuple(trace_steps) if trace_steps else None
+        self.trace_dir = str(trace_dir)
+        self.warmup_steps = warmup_steps
+        self._ready = []
+        self._lock = threading.Lock()
+        self._tracing = False
+        self._global_step = 0
+        self._steps = []
+        self._train_started = None
+        self.summary = None
+
+    def wrap(self, data):
+        """
+        Training input with a timestamp taken as each batch reaches the train step.
+
+        Accepts a tf.data.Dataset or a Keras iterator/PyDataset (ImageDataGenerator
+        flows), which is turned into an endless, prefetched tf.data pipeline the
+        same way Keras would; pass steps_per_epoch to fit().
+        """
+        if not isinstance(data, tf.data.Dataset):
+            data = self._from_py_dataset(data)
+
+        def mark(*batch):
+            stamp = tf.py_function(self._mark, [tf.shape(batch[0])[0]], tf.float64)
+            with tf.control_dependencies([stamp]):
+                return tuple(tf.identity(t) for t in batch)
+
+        return data.map(mark)
+
+    @staticmethod
+    def _from_py_dataset(py_dataset):
+        x, y = py_dataset[0][:2]
+        signature = (
+            tf.TensorSpec((None, *x.shape[1:]), tf.as_dtype(x.dtype)),
+            tf.TensorSpec((None, *y.shape[1:]), tf.as_dtype(y.dtype)),
+        )
+
+        def batches():
+            while True:
+                for i in range(len(py_dataset)):
+                    yield tuple(py_dataset[i][:2])
+                py_dataset.on_epoch_end()
+
+        return tf.data.Dataset.from_generator(batches, output_signature=signature).prefetch(tf.data.AUTOTUNE)
+
+    def _mark(self, batch_size):
+        with self._lock:
+            self._ready.append((time.perf_counter(), int(batch_size)))
+        return 0.0
+
+    def _write(self, record):
+        self._log.write(json.dumps(record) + '\n')
+
+    def on_train_begin(self, logs=None):
+        # A resumed run may call fit() more than once; later calls extend the same log and summary
+        os.makedirs(os.path.dirname(self.log_path) or '.', exist_ok=True)
+        self._log = open(self.log_path, 'a' if self._steps else 'w')
+        if self._train_started is None:
+            self._train_started = time.perf_counter()
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._epoch = epoch
+        self._epoch_started = time.perf_counter()
+        self._epoch_first_step = len(self._steps)
+
+    def on_train_batch_begin(self, batch, logs=None):
+        if self.trace_steps and self._global_step == self.trace_steps[0] and not self._tracing:
+            tf.profiler.experimental.start(self.trace_dir)
+            self._tracing = True
+        self._step_started = time.perf_counter()
+
+    def on_train_batch_end(self, batch, logs=None):
+        ended = time.perf_counter()
+        started = self._step_started
+        with self._lock:
+            arrived = [r for r in self._ready if started <= r[0] <= ended]
+            self._ready = [r for r in self._ready if r[0] > ended]
+        duration = ended - started
+        data_wait = min(duration, arrived[0][0] - started) if arrived else 0.0
+        images = sum(n for _, n in arrived)
+        record = {
+            'event': 'step',
+            'epoch': self._epoch,
+            'step': batch,
+            'global_step': self._global_step,
+            'data_wait_ms': round(data_wait * 1000, 3),
+            'compute_ms': round((duration - data_wait) * 1000, 3),
+            'images': images,
+            'images_per_second': round(images / duration, 2) if duration else None,
+            'peak_rss_mb': round(peak_rss_mb(), 1),
+        }
+        self._write(record)
+        self._steps.append(record)
+
+        if self._tracing and self._global_step >= self.trace_steps[1]:
+            self._stop_trace()
+        self._global_step += 1
+
+    def on_epoch_end(self, epoch, logs=None):
+        steps = self._steps[self._epoch_first_step:]
+        record = {
+            'event': 'epoch',
+            'epoch': epoch,
+            'seconds': round(time.perf_counter() - self._epoch_started, 3),
+            **self._aggregate(steps),
+            'metrics': {k: float(v) for k, v in (logs or {}).items()},
+        }
+        self._write(record)
+        self._log.flush()
+
+    def on_train_end(self, logs=None):
+        if self._tracing:
+            self._stop_trace()
+        self.summary = {
+            'event': 'summary',
+            'seconds': round(time.perf_counter() - self._train_started, 3),
+            'warmup_steps_excluded': min(self.warmup_steps, len(self._steps)),
+            **self._aggregate(self._steps[self.warmup_steps:]),
+        }
+        self._write(self.summary)
+        self._log.close()
+        logging.info(
+            f"Training profile: {self.summary['verdict']} "
+            f"({self.summary['input_fraction']:.0%} of step time waiting for input, "
+            f"{self.summary['images_per_second']} img/s, peak RSS {self.summary['peak_rss_mb']} MB) -> {self.log_path}"
+        )
+
+    def _stop_trace(self):
+        tf.profiler.experimental.stop()
+        self._tracing = False
+        logging.info(f"TensorFlow profiler trace written to {self.trace_dir}")
+
+    @staticmethod
+    def _aggregate(steps):
+        wait = sum(s['data_wait_ms'] for s in steps) / 1000
+        compute = sum(s['compute_ms'] for s in steps) / 1000
+        images = sum(s['images'] for s in steps)
+        fraction = wait / (wait + compute) if wait + compute else 0.0
+        return {
+            'steps': len(steps),
+            'data_wait_seconds': round(wait, 3),
+            'compute_seconds': round(compute, 3),
+            'input_fraction': round(fraction, 4),
+            'images_per_second': round(images / (wait + compute), 2) if wait + compute else None,
+            'median_step_ms': round(statistics.median(s['data_wait_ms'] + s['compute_ms'] for s in steps), 3)
+            if steps else None,
+            'peak_rss_mb': round(peak_rss_mb(), 1),
+            'verdict': 'input-bound' if fraction > INPUT_BOUND_THRESHOLD else 'compute-bound',
+        }
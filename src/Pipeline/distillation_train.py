@@ -0,0 +1,179 @@
+"""
+Distil the trained models/model.h5 (teacher) into compact students for CPU serving.
+
+Every student in `distillation.students` (MobileNetV2 width `alpha`, internal
+`image_size`, optional `cut_at` pruning) is trained on the teacher's soft
+labels plus the true labels. The teacher and all students are then scored
+on the test split in one pass and timed on CPU through InferenceEngine,
+giving an accuracy-versus-latency table. The fastest student within
+`max_accuracy_drop` of the teacher (or `selected`) is exported to
+`export_path`. Students take the same 150x150 input as the teacher, so
+setting `serving.model_path` to it serves it through /predict unchanged.
+
+Usage:
+    python src/Pipeline/distillation_train.py
+"""
+import json
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from tensorflow.keras.optimizers import Adam
+from src.Component.data_ingestion import FULL_SIZE, DataGenerator
+from src.Component.dataset_shards import ShardStore, pack_split
+from src.Component.distillation import (
+    build_student, distillation_dataset, distillation_loss, format_table, hard_accuracy, measure_latency,
+    teacher_soft_labels,
+)
+from src.Component.evaluation import evaluate_models
+from src.Component.inference_engine import load_inference_engine
+from src.Component.tf_data_pipeline import build_augmenter, split_subset
+from src.config import Config
+from src.logger import logging
+from src.Pipeline.prediction import PredictionPipeline
+from src.Exception import CustomException as cuexc
+
+
+class DistillationTrain:
+    def __init__(self, config=None, weights='imagenet'):
+        self.config = config or Config()
+        self.distill_config = self.config['distillation']
+        self.weights = weights
+        self.VALIDATION_SPLIT = 0.2
+        self.teacher_path = project_root / self.distill_config['teacher_path']
+        self.cache_dir = project_root / self.distill_config['cache_dir']
+        self.students_dir = project_root / self.distill_config.get('students_dir', 'models/students')
+
+    def prepare_data(self):
+        """Pack the training and validation subsets once as uint8 shards; returns {subset: ShardStore}."""
+        data_generator = DataGenerator()
+        filepaths, labels, class_indices = data_generator.file_listing('train')
+        stores = {}
+        for subset in ('training', 'validation'):
+            files = split_subset(filepaths, labels, self.VALIDATION_SPLIT, subset) + (class_indices,)
+            pack_split(data_generator.train_dir, str(self.cache_dir / subset), FULL_SIZE, files=files)
+            stores[subset] = ShardStore(str(self.cache_dir / subset))
+        return stores
+
+    def train_student(self, spec, stores, soft_labels):
+        """Distil one student; returns (saved path, parameter count, training seconds)."""
+        batch_size = self.distill_config.get('batch_size', 64)
+        logits_model, model = build_student(**spec, weights=self.weights)
+        logits_model.compile(
+            optimizer=Adam(learning_rate=self.distill_config.get('learning_rate', 1e-3)),
+            loss=distillation_loss(self.distill_config.get('temperature', 2.0),
+                                   self.distill_config.get('soft_weight', 0.7)),
+            metrics=[hard_accuracy],
+        )
+        train = distillation_dataset(stores['training'], soft_labels['training'], batch_size, True, build_augmenter())
+        validation = distillation_dataset(stores['validation'], soft_labels['validation'], batch_size, False)
+
+        logging.info(f"Distilling {spec['name']} ({model.count_params():,} parameters)")
+        started = time.perf_counter()
+        logits_model.fit(
+            train,
+            epochs=self.distill_config.get('epochs', 10),
+            steps_per_epoch=max(1, len(stores['training']) // batch_size),
+            validation_data=validation,
+            verbose=2,
+        )
+        seconds = time.perf_counter() - started
+
+        path = self.students_dir / f"{spec['name']}.h5"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        model.save(str(path))
+        return path, model.count_params(), seconds
+
+    def compare(self, model_paths, param_counts):
+        """Score every model on the test split in one pass and time it on CPU; returns table rows."""
+        inference_config = self.config['inference']
+        engines = {name: load_inference_engine(path, inference_config) for name, path in model_paths.items()}
+        metrics = evaluate_models(engines, PredictionPipeline(config=self.config).evaluation_set())
+        batch_sizes = self.distill_config.get('latency_batch_sizes', [1, 32])
+        rows = []
+        for name, engine in engines.items():
+            rows.append({
+                'name': name,
+                'path': str(model_paths[name]),
+                'params': param_counts[name],
+                'size_mb': os.path.getsize(model_paths[name]) / 2**20,
+                'accuracy': metrics[name]['accuracy'],
+                'roc_auc': metrics[name]['roc_auc'],
+                'latency': {str(b): measure_latency(engine, b) for b in batch_sizes},
+            })
+        return rows
+
+    def select(self, rows):
+        """The configured student, or the fastest one within max_accuracy_drop of the teacher."""
+        if self.distill_config.get('selected'):
+            return next(row for row in rows if row['name'] == self.distill_config['selected'])
+        teacher, students = rows[0], rows[1:]
+        allowed = teacher['accuracy'] - self.distill_config.get('max_accuracy_drop', 0.01)
+        candidates = [row for row in students if row['accuracy'] >= allowed]
+        if not candidates:
+            logging.warning(f"No student is within {self.distill_config.get('max_accuracy_drop', 0.01)} "
+                            f"of the teacher's accuracy ({teacher['accuracy']:.4f}); nothing exported")
+            return None
+        # Ranked by latency at the first (smallest) configured batch size, i.e. single-request latency
+        batch_size = str(self.distill_config.get('latency_batch_sizes', [1, 32])[0])
+        return min(candidates, key=lambda row: row['latency'][batch_size]['p50_ms'])
+
+    def run(self):
+        try:
+            logging.info("Distillation Started")
+            if not self.teacher_path.exists():
+                raise FileNotFoundError(f"Teacher model not found at {self.teacher_path}")
+            teacher = load_inference_engine(self.teacher_path, self.config['inference'])
+            stores = self.prepare_data()
+            soft_labels = {subset: teacher_soft_labels(teacher, self.teacher_path, store)
+                           for subset, store in stores.items()}
+
+            model_paths = {'teacher': self.teacher_path}
+            param_counts = {'teacher': teacher.model.count_params() if hasattr(teacher, 'model') else None}
+            train_seconds = {}
+            for spec in self.distill_config['students']:
+                path, param_counts[spec['name']], train_seconds[spec['name']] = self.train_student(
+                    spec, stores, soft_labels)
+                model_paths[spec['name']] = path
+
+            rows = self.compare(model_paths, param_counts)
+            for row in rows:
+                row['train_seconds'] = train_seconds.get(row['name'])
+            batch_sizes = self.distill_config.get('latency_batch_sizes', [1, 32])
+            table = format_table(rows, batch_sizes)
+            logging.info(f"Distillation results:\n{table}")
+            print(table)
+
+            selected = self.select(rows)
+            if selected is not None:
+                export_path = project_root / self.distill_config.get('export_path', 'models/student.h5')
+                shutil.copyfile(selected['path'], export_path)
+                logging.info(f"Exported {selected['name']} to {export_path}")
+                print(f"Selected {selected['name']} -> {export_path}")
+
+            report_path = project_root / self.distill_config.get('report_path', 'models/distillation_report.json')
+            report_path.parent.mkdir(parents=True, exist_ok=True)
+            report_path.write_text(json.dumps({
+                'students': self.distill_config['students'],
+                'results': rows,
+                'selected': selected['name'] if selected else None,
+            }, indent=2))
+            return rows, selected
+
+        except Exception as e:
+            logging.error(f"Error in distillation: {e}")
+            raise cuexc(e, sys)
+
+
+if __name__ == "__main__":
+    try:
+        trainer = DistillationTrain()
+        trainer.run()
+    except Exception as e:
+        print(f"Distillation failed: {e}")
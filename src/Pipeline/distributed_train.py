@@ -0,0 +1,151 @@
+"""
+Data-parallel training of MobileNetV2Model over several worker processes.
+
+Workers run tf.distribute.MultiWorkerMirroredStrategy: every worker trains on
+its own shard of the DataGenerator split and gradients are all-reduced each
+step. The global batch is `training.batch_size` per worker times the number of
+workers, and the learning rate is scaled to it from `training.base_batch_size`.
+Worker 0 (the chief) writes models/model.h5 and a throughput report.
+
+Usage:
+    # N workers on this machine, each pinned to its own CPU slice
+    python src/Pipeline/distributed_train.py --workers 4
+
+    # Across machines: list "host:port" per line in hosts.txt, then on host i
+    python src/Pipeline/distributed_train.py --hosts hosts.txt --index i
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import tensorflow as tf
+from src.Component.data_ingestion import DataGenerator
+from src.Component.distributed_training import (
+    MultiWorkerTrainer, configure_from_env, launch_local_workers, read_hosts_file, shard_input, tf_config,
+)
+from src.Component.training_options import training_options
+from src.config import Config
+from src.logger import logging
+from src.Pipeline.fine_tune_model import MobileNetV2Model
+from src.Exception import CustomException as cuexc
+
+
+class DistributedTrain:
+    def __init__(self, config=None):
+        self.config = config or Config()
+        self.dist_config = self.config['distributed']
+
+    def prepare_data(self):
+        """Bring the data stages up to date once, before workers start reading the split concurrently."""
+        data_generator = DataGenerator()
+        data_generator.stages.require('split')
+        if data_generator.backend == 'shards':
+            data_generator.shards_dir()
+
+    def launch(self, num_workers=None):
+        try:
+            num_workers = num_workers or self.dist_config['workers']
+            self.prepare_data()
+            codes = launch_local_workers([sys.executable, str(Path(__file__).resolve()), '--worker'], num_workers)
+            if any(codes):
+                raise RuntimeError(f"Distributed training failed, worker exit codes: {codes}")
+            with open(project_root / self.dist_config['report_path']) as f:
+                return json.load(f)
+
+        except Exception as e:
+            logging.error(f"Error in distributed training: {e}")
+            raise cuexc(e, sys)
+
+    def run_worker(self):
+        """Train as one worker of the cluster described by TF_CONFIG."""
+        try:
+            configure_from_env(self.dist_config.get('inter_op_threads', 2))
+
+            # Must exist before any other TensorFlow op runs in this process
+            strategy = tf.distribute.MultiWorkerMirroredStrategy()
+            num_workers = strategy.num_replicas_in_sync
+            task_id = strategy.cluster_resolver.task_id
+            is_chief = task_id == 0
+
+            training_config = self.config['training']
+            per_worker_batch = int(training_config.get('batch_size', 32))
+            global_batch = per_worker_batch * num_workers
+            options = training_options({**training_config, 'batch_size': global_batch})
+            logging.info(f"Worker {task_id}/{num_workers}: global batch {global_batch}, "
+                         f"learning rate {options['learning_rate']:.6f}")
+
+            # tf.data backends read only this worker's shard; Keras iterators are sharded by shard_input
+            train_gen, val_gen, _ = DataGenerator(
+                batch_size=per_worker_batch, num_shards=num_workers, shard_index=task_id).data_generator()
+            # Whole-split sizes, so every worker runs the same number of steps
+            steps_per_epoch = getattr(train_gen, 'split_samples', train_gen.samples) // global_batch
+            validation_steps = max(1, getattr(val_gen, 'split_samples', val_gen.samples) // global_batch)
+            train_ds = strategy.distribute_datasets_from_function(lambda ctx: shard_input(
+                train_gen, steps_per_epoch, ctx.num_input_pipelines, ctx.input_pipeline_id))
+            val_ds = strategy.distribute_datasets_from_function(lambda ctx: shard_input(
+                val_gen, validation_steps, ctx.num_input_pipelines, ctx.input_pipeline_id))
+
+            with strategy.scope():
+                model = MobileNetV2Model(options=options).model
+
+            history, throughput = MultiWorkerTrainer(model, strategy).fit(
+                train_ds,
+                epochs=options['epochs'],
+                steps_per_epoch=steps_per_epoch,
+                global_batch_size=global_batch,
+                validation_data=val_ds,
+                validation_steps=validation_steps,
+                verbose=is_chief,
+            )
+
+            if is_chief:
+                model_path = project_root / 'models' / 'model.h5'
+                model_path.parent.mkdir(parents=True, exist_ok=True)
+                model.save(str(model_path))
+                logging.info(f"Model saved at {model_path}")
+                report = {
+                    'workers': num_workers,
+                    'per_worker_batch_size': per_worker_batch,
+                    'global_batch_size': global_batch,
+                    'learning_rate': options['learning_rate'],
+                    'steps_per_epoch': steps_per_epoch,
+                    'epochs': throughput,
+                    'history': history,
+                }
+                report_path = project_root / self.dist_config['report_path']
+                report_path.parent.mkdir(parents=True, exist_ok=True)
+                report_path.write_text(json.dumps(report, indent=2))
+            return history
+
+        except Exception as e:
+            logging.error(f"Error in distributed training worker: {e}")
+            raise cuexc(e, sys)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Data-parallel MobileNetV2 training with MultiWorkerMirroredStrategy")
+    parser.add_argument('--workers', type=int, help="Local worker processes to launch (default: distributed.workers)")
+    parser.add_argument('--hosts', help="File with one 'host:port' per worker; run once per host with --index")
+    parser.add_argument('--index', type=int, help="This host's line in --hosts")
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    try:
+        trainer = DistributedTrain()
+        if args.hosts:
+            os.environ['TF_CONFIG'] = tf_config(read_hosts_file(args.hosts), args.index)
+            trainer.prepare_data()
+            trainer.run_worker()
+        elif args.worker:
+            trainer.run_worker()
+        else:
+            print(json.dumps(trainer.launch(args.workers), indent=2))
+    except Exception as e:
+        print(f"Training failed: {e}")
+        # A non-zero exit lets the launcher stop the other workers
+        sys.exit(1)
@@ -0,0 +1,120 @@
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.Component.data_ingestion import DataGenerator
+from src.Component.feature_cache import FeatureCache, feature_cache_key, find_frozen_boundary, split_at_boundary
+from src.Component.tf_data_pipeline import split_subset
+from src.Component.training_options import training_options
+from src.config import Config
+from src.logger import logging
+from src.Pipeline.fine_tune_model import MobileNetV2Model
+from src.Exception import CustomException as cuexc
+
+
+class FeatureCacheTrain:
+    """
+    Train MobileNetV2Model from cached frozen-backbone activations.
+
+    The frozen prefix of the backbone runs once per image (plus a few
+    augmented variants) and its activations are cached on disk. Each epoch
+    then only runs the trainable suffix and the head, which share their
+    layers with the full model saved to models/model.h5.
+    """
+
+    def __init__(self, config=None, weights='imagenet'):
+        config = config or Config()
+        self.config = config['feature_cache']
+        # Learning rate (scaled to this batch size), precision and XLA as in ModelTrain
+        self.options = training_options({**config['training'], 'batch_size': self.config['batch_size']})
+        self.model_builder = MobileNetV2Model(weights=weights, options=self.options)
+        self.model = self.model_builder.model
+        self.weights = weights
+        self.cache = FeatureCache(project_root / self.config['cache_dir'])
+        self.TARGET_SIZE = (150, 150)
+        self.VALIDATION_SPLIT = 0.2
+
+    def dataset_splits(self):
+        """{'train'|'validation'|'test': (filepaths, labels)} with DataGenerator's split and per-class validation subset."""
+        data_generator = DataGenerator()
+        filepaths, labels, _ = data_generator.file_listing('train')
+        test_files, test_labels, _ = data_generator.file_listing('test')
+        return {
+            'train': split_subset(filepaths, labels, self.VALIDATION_SPLIT, 'training'),
+            'validation': split_subset(filepaths, labels, self.VALIDATION_SPLIT, 'validation'),
+            'test': (test_files, test_labels),
+        }
+
+    def train(self, splits, epochs=None, batch_size=None):
+        """Build (or reuse) the feature cache for `splits`, then fit the suffix. Returns (history, report)."""
+        epochs = epochs or self.config['epochs']
+        batch_size = batch_size or self.config['batch_size']
+        variants = self.config['variants']
+
+        base_model = self.model_builder.base_model
+        boundary = find_frozen_boundary(base_model, self.model_builder.fine_tune_at)
+        prefix, suffix = split_at_boundary(self.model, base_model, boundary)
+        logging.info(f"Caching activations of '{base_model.layers[boundary].name}' {tuple(prefix.output.shape[1:])}")
+
+        key = feature_cache_key(splits, base_model.layers[boundary].name, self.TARGET_SIZE, variants, self.weights)
+        cache_seconds = 0.0
+        if self.cache.is_current(key):
+            logging.info(f"Feature cache {self.cache.cache_dir} is current")
+        else:
+            cache_seconds = self.cache.build(prefix, splits, self.TARGET_SIZE, variants=variants, key=key)
+
+        # The suffix trains with the full model's optimizer, built from the training options
+        suffix.compile(
+            optimizer=self.model.optimizer,
+            loss='binary_crossentropy',
+            metrics=['accuracy'],
+            jit_compile=self.options['jit_compile'],
+            steps_per_execution=self.options['steps_per_execution'],
+        )
+        train_ds = self.cache.dataset('train', batch_size, training=True)
+        started = time.perf_counter()
+        history = suffix.fit(
+            train_ds,
+            epochs=epochs,
+            validation_data=self.cache.dataset('validation', batch_size, training=False),
+            steps_per_epoch=max(1, train_ds.samples // batch_size),
+        )
+        train_seconds = time.perf_counter() - started
+        test_loss, test_accuracy = suffix.evaluate(self.cache.dataset('test', batch_size, training=False), verbose=0)
+        report = {
+            'boundary_layer': base_model.layers[boundary].name,
+            'cache_seconds': cache_seconds,
+            'train_seconds': train_seconds,
+            'test_loss': float(test_loss),
+            'test_accuracy': float(test_accuracy),
+        }
+        logging.info(f"Feature-cache training report: {report}")
+        return history, report
+
+    def initiate_model_training(self):
+        try:
+            logging.info("Feature-cache Model Training Started")
+            history, report = self.train(self.dataset_splits())
+
+            # The suffix shares its layers with the full model, so this is the trained 150x150 model
+            model_path = project_root / 'models' / 'model.h5'
+            model_path.parent.mkdir(parents=True, exist_ok=True)
+            self.model.save(str(model_path))
+            logging.info(f"Model saved at {model_path}")
+            return history
+
+        except Exception as e:
+            logging.error(f"Error in feature-cache training: {e}")
+            raise cuexc(e, sys)
+
+
+if __name__ == "__main__":
+    try:
+        trainer = FeatureCacheTrain()
+        trainer.initiate_model_training()
+    except Exception as e:
+        print(f"Training failed: {e}")
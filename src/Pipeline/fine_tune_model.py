@@ -5,33 +5,90 @@ from src.Exception import CustomException as cuexc
 from tensorflow.keras.applications import MobileNetV2
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import GlobalAveragePooling2D, Dense,Dropout
-from tensorflow.keras import Model,Input
+from tensorflow.keras import Model,Input,mixed_precision
+from tensorflow.keras.optimizers import Adam
+from src.Component.training_options import training_options
+
+
+IMAGE_SIZE = 150
 
 
 class MobileNetV2Model:
-    def __init__(self):
+    def __init__(self, weights='imagenet', options=None, flexible_input=False):
+        self.weights = weights
+        # Defaults reproduce the original float32 / Adam(1e-3) model
+        self.options = options or training_options()
+        # Backbone accepts any image size, so stage_model() can train it at lower resolutions
+        self.flexible_input = flexible_input
+        self._stage_models = {}
         self.model = self.build_model()
 
     def build_model(self):
-        base_model = MobileNetV2(weights='imagenet', include_top=False, input_shape=(150, 150, 3))
+        # The dtype policy is captured by each layer when it is created, so only this model is affected
+        previous_policy = mixed_precision.global_policy()
+        mixed_precision.set_global_policy(self.options['precision'])
+        try:
+            model = self._build()
+        finally:
+            mixed_precision.set_global_policy(previous_policy)
+
+        self._compile(model, Adam(learning_rate=self.options['learning_rate']))
+        logging.info(
+            f"Model compiletion done.. (precision={self.options['precision']}, "
+            f"jit_compile={self.options['jit_compile']}, steps_per_execution={self.options['steps_per_execution']})"
+        )
+        return model
+
+    def _compile(self, model, optimizer):
+        model.compile(
+            optimizer=optimizer,
+            loss='binary_crossentropy',
+            metrics=['accuracy'],
+            jit_compile=self.options['jit_compile'],
+            steps_per_execution=self.options['steps_per_execution'],
+        )
+
+    def stage_model(self, image_size):
+        """
+        The model at `image_size` x `image_size` input, for progressive-resolution training.
 
-        input = Input(shape=(150, 150, 3))
+        It reuses every layer and the optimizer of self.model, so weights and
+        optimizer state trained at one size carry over to the next and to the
+        saved 150x150 model. Requires flexible_input=True.
+        """
+        if image_size == IMAGE_SIZE:
+            return self.model
+        if not self.flexible_input:
+            raise ValueError(f"Training at {image_size}x{image_size} needs MobileNetV2Model(flexible_input=True)")
+        if image_size not in self._stage_models:
+            x = inputs = Input(shape=(image_size, image_size, 3))
+            for layer in self.model.layers[1:]:
+                x = layer(x)
+            model = Model(inputs=inputs, outputs=x)
+            self._compile(model, self.model.optimizer)
+            self._stage_models[image_size] = model
+        return self._stage_models[image_size]
+
+    def _build(self):
+        backbone_shape = (None, None, 3) if self.flexible_input else (IMAGE_SIZE, IMAGE_SIZE, 3)
+        base_model = MobileNetV2(weights=self.weights, include_top=False, input_shape=backbone_shape)
+        self.base_model = base_model
+
+        input = Input(shape=(IMAGE_SIZE, IMAGE_SIZE, 3))
         x = base_model(input)
         x = GlobalAveragePooling2D()(x)
         x = Dropout(0.2)(x)
-        output = Dense(1, activation='sigmoid')(x)
+        # Keep the sigmoid output in float32 under mixed precision
+        output = Dense(1, activation='sigmoid', dtype='float32')(x)
 
         model = Model(inputs=input, outputs=output)
         
         base_model.trainable = True
         fine_tune_at = len(base_model.layers) - 30
+        self.fine_tune_at = fine_tune_at
         for layer in base_model.layers[:fine_tune_at]:
             layer.trainable = False
         
         logging.info(f"✅ Total MobileNetV2 layers: {len(base_model.layers)}")
         logging.info(f"🔓 Fine-tuning from layer: {fine_tune_at}")
-
-        
-        model.compile(optimizer='adam', loss='binary_crossentropy', metrics=['accuracy'])
-        logging.info('Model compiletion done..')
-        return model
\ No newline at end of file
+        return model
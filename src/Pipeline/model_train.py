@@ -1,3 +1,4 @@
+import argparse
 import sys
 from pathlib import Path
 
@@ -6,29 +7,67 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.Component.data_ingestion import DataGenerator
+from src.Component.training_checkpoint import TrainingCheckpoint, fit_resumable, resumable_input
+from src.Component.training_options import training_options
+from src.Component.training_profiler import TrainingProfiler
+from src.config import Config
 from src.logger import logging
 from src.Pipeline.fine_tune_model import MobileNetV2Model
 from src.Exception import CustomException as cuexc
 
 class ModelTrain:
-    def __init__(self):
-        self.model_builder = MobileNetV2Model()
+    def __init__(self, config=None):
+        # Epochs, batch size, learning rate, precision and XLA come from the `training` config section
+        self.config = config or Config()
+        self.options = training_options(self.config['training'])
+        self.model_builder = MobileNetV2Model(options=self.options)
         self.model = self.model_builder.model
-        self.data_generator = DataGenerator()
+        self.data_generator = DataGenerator(batch_size=self.options['batch_size'])
     
-    def initiate_model_training(self):
+    def initiate_model_training(self, resume=False):
         try:
             logging.info("Model Training Started")
             train_gen, val_gen, test_gen = self.data_generator.data_generator()
             
             logging.info(f"Training with {train_gen.samples} samples, validating with {val_gen.samples} samples")
+            steps_per_epoch = train_gen.samples // train_gen.batch_size
 
-            history = self.model.fit(
-                train_gen,
-                epochs=10,
+            checkpoint_config = self.config['checkpoint']
+            checkpoint = TrainingCheckpoint(
+                project_root / checkpoint_config.get('checkpoint_dir', 'models/checkpoints'),
+                save_every_steps=checkpoint_config.get('save_every_steps'),
+                monitor=checkpoint_config.get('monitor', 'val_loss'),
+                patience=checkpoint_config.get('early_stopping_patience'),
+                save_best=checkpoint_config.get('save_best', True),
+                run_info={'steps_per_epoch': steps_per_epoch, 'batch_size': self.options['batch_size']},
+            )
+
+            callbacks = []
+            profiler = None
+            profiling = self.config.config.get('profiling', {})
+            if profiling.get('enabled'):
+                profiler = TrainingProfiler(
+                    log_path=project_root / profiling.get('log_path', 'logs/training_profile.jsonl'),
+                    trace_steps=profiling.get('trace_steps'),
+                    trace_dir=project_root / profiling.get('trace_dir', 'logs/tf_trace'),
+                )
+                callbacks.append(profiler)
+
+            def make_input(epoch, step):
+                # Positioned at the first batch not yet trained on, so --resume neither repeats nor skips data
+                data = resumable_input(train_gen, steps_per_epoch, epoch, step)
+                return profiler.wrap(data) if profiler else data
+
+            history = fit_resumable(
+                self.model,
+                make_input,
+                epochs=self.options['epochs'],
+                steps_per_epoch=steps_per_epoch,
+                checkpoint=checkpoint,
+                resume=resume,
+                callbacks=callbacks,
                 validation_data=val_gen,
                 validation_steps=val_gen.samples // val_gen.batch_size,
-                steps_per_epoch=train_gen.samples // train_gen.batch_size
             )
             
             # Save the model
@@ -44,8 +83,11 @@ class ModelTrain:
             raise cuexc(e, sys)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fine-tune MobileNetV2 on the Cat/Dog split")
+    parser.add_argument('--resume', action='store_true', help="Continue from the last checkpoint in checkpoint.checkpoint_dir")
+    args = parser.parse_args()
     try:
         trainer = ModelTrain()
-        trainer.initiate_model_training()
+        trainer.initiate_model_training(resume=args.resume)
     except Exception as e:
         print(f"Training failed: {e}")
\ No newline at end of file
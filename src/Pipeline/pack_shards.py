@@ -0,0 +1,39 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.Component.data_stages import build_data_stages
+from src.logger import logging
+from src.Exception import CustomException as cuexc
+
+
+class PackShards:
+    """One-time (then incremental) packing of the train/test split into pre-resized memory-mapped shards."""
+
+    def __init__(self, config=None):
+        self.stages = build_data_stages(config)
+
+    def run(self, force=False):
+        try:
+            started = time.perf_counter()
+            shards = self.stages.require('pack', force=force)
+            logging.info(f"Shards ready in {time.perf_counter() - started:.1f}s: {shards}")
+            return shards
+        except Exception as e:
+            logging.error(f"Error packing shards: {e}")
+            raise cuexc(e, sys)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pack the train/test split into memory-mapped uint8 shards")
+    parser.add_argument('--force', action='store_true', help='Re-check every shard even if the pack stage looks current')
+    args = parser.parse_args()
+    try:
+        PackShards().run(args.force)
+    except Exception as e:
+        print(f"Packing failed: {e}")
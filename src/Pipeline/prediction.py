@@ -1,3 +1,5 @@
+import argparse
+import json
 import os
 import sys
 from pathlib import Path
@@ -6,74 +8,103 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from tensorflow.keras.models import load_model
-from sklearn.metrics import confusion_matrix, classification_report
-from src.Component.data_ingestion import DataGenerator
+from src.Component.data_ingestion import FULL_SIZE, DataGenerator
+from src.Component.evaluation import EvaluationSet, evaluate_models, format_report, plot_confusion_matrix
+from src.Component.inference_engine import load_inference_engine
+from src.config import Config
 from src.logger import logging
 from src.Exception import CustomException as cuexc
 
 class PredictionPipeline:
-    def __init__(self):
-        self.model_path = project_root / 'models' / 'model.h5'
-        # self.test_data_path = project_root / 'data' / 'processed' / 'cat-dog-split' / 'test'
+    """
+    Evaluate one or more saved models on the test split in a single streaming pass.
+
+    The test images are decoded once into a uint8 cache (`evaluation.cache_dir`,
+    or the packed test shards with the shards backend) that later runs reuse.
+    Metrics for every model are written to `evaluation.metrics_path`; the
+    confusion-matrix plot is optional.
+    """
+
+    def __init__(self, model_paths=None, config=None):
+        self.config = config or Config()
+        self.eval_config = self.config.config.get('evaluation', {})
+        self.model_paths = [Path(p) for p in model_paths] if model_paths else [project_root / 'models' / 'model.h5']
         self.confusion_matrix_path = project_root / 'confusion_matrix.png'
+        self.metrics_path = project_root / self.eval_config.get('metrics_path', 'models/evaluation.json')
+
+    def evaluation_set(self):
+        """The cached, pre-decoded test split, refreshed if the split changed."""
+        data_generator = DataGenerator()
+        if data_generator.backend == 'shards':
+            # The pack stage already keeps a decoded copy of the test split
+            return EvaluationSet(os.path.join(data_generator.shards_dir(), 'test'))
+        evaluation_set = EvaluationSet(project_root / self.eval_config.get('cache_dir', 'data/processed/eval_cache'))
+        evaluation_set.refresh(data_generator.test_dir, data_generator.split_files('test'), FULL_SIZE)
+        return evaluation_set
 
-    def run(self):
+    def plot_path(self, model_path):
+        if len(self.model_paths) == 1:
+            return self.confusion_matrix_path
+        return self.confusion_matrix_path.with_name(f'confusion_matrix_{model_path.stem}.png')
+
+    def run(self, plot=None):
         try:
             logging.info("Prediction Pipeline Started")
-            
-            # Load Model
-            if not self.model_path.exists():
-                raise FileNotFoundError(f"Model not found at {self.model_path}")
-            
-            logging.info(f"Loading model from {self.model_path}")
-            model = load_model(str(self.model_path))
-            
-            # Data Generator for Test Data
-            _,_,test_generator = DataGenerator().data_generator()
-            
+            plot = self.eval_config.get('plot', True) if plot is None else plot
+
+            for model_path in self.model_paths:
+                if not model_path.exists():
+                    raise FileNotFoundError(f"Model not found at {model_path}")
+            evaluation_set = self.evaluation_set()
+
+            engines = {}
+            for model_path in self.model_paths:
+                logging.info(f"Loading model from {model_path}")
+                engines[str(model_path)] = load_inference_engine(model_path, self.config['inference'])
 
-            
-            # Make Predictions
             logging.info("Generating predictions...")
-            predictions = model.predict(test_generator)
-            predicted_classes = (predictions > 0.5).astype(int).flatten()
-            true_classes = test_generator.classes
-            class_labels = list(test_generator.class_indices.keys())
-            
-            # Confusion Matrix
-            logging.info("Computing confusion matrix...")
-            cm = confusion_matrix(true_classes, predicted_classes)
-            
-            # Plotting
-            plt.figure(figsize=(10, 8))
-            sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', xticklabels=class_labels, yticklabels=class_labels)
-            plt.title('Confusion Matrix')
-            plt.ylabel('True Label')
-            plt.xlabel('Predicted Label')
-            plt.tight_layout()
-            
-            # Save Plot
-            plt.savefig(str(self.confusion_matrix_path))
-            logging.info(f"Confusion matrix saved at {self.confusion_matrix_path}")
-            print(f"Confusion matrix saved at {self.confusion_matrix_path}")
-            
-            # Classification Report
-            report = classification_report(true_classes, predicted_classes, target_names=class_labels)
-            logging.info(f"Classification Report:\n{report}")
-            print("Classification Report:")
-            print(report)
-            
+            results = evaluate_models(
+                engines, evaluation_set,
+                batch_size=self.eval_config.get('batch_size', 64),
+                threshold=self.eval_config.get('threshold', 0.5),
+            )
+
+            self.metrics_path.parent.mkdir(parents=True, exist_ok=True)
+            self.metrics_path.write_text(json.dumps({
+                'test_images': len(evaluation_set),
+                'class_indices': evaluation_set.store.class_indices,
+                'models': results,
+            }, indent=2))
+            logging.info(f"Metrics saved at {self.metrics_path}")
+
+            class_labels = evaluation_set.class_names
+            for model_path in self.model_paths:
+                metrics = results[str(model_path)]
+                report = format_report(metrics)
+                logging.info(f"Classification Report ({model_path.name}):\n{report}")
+                if plot:
+                    try:
+                        plot_confusion_matrix(metrics, class_labels, self.plot_path(model_path))
+                    except ImportError as e:
+                        # The metrics JSON is already written; the plot is only a view of it
+                        logging.warning(f"Skipping the confusion matrix plot: {e}")
+                        plot = False
+                        continue
+                    logging.info(f"Confusion matrix saved at {self.plot_path(model_path)}")
+            return results
+
         except Exception as e:
             logging.error(f"Error in prediction pipeline: {e}")
             raise cuexc(e, sys)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate saved models on the test split")
+    parser.add_argument('models', nargs='*', help="Model files (.h5/.keras/.tflite); default models/model.h5")
+    parser.add_argument('--plot', action=argparse.BooleanOptionalAction, default=None,
+                        help="Render confusion matrices (default: evaluation.plot)")
+    args = parser.parse_args()
     try:
-        pipeline = PredictionPipeline()
-        pipeline.run()
+        pipeline = PredictionPipeline(args.models)
+        pipeline.run(plot=args.plot)
     except Exception as e:
         print(f"Prediction failed: {e}")
@@ -0,0 +1,122 @@
+"""
+Progressive-resolution training of MobileNetV2Model.
+
+The early stages train at a low resolution with bigger batches, where a step
+is several times cheaper. Later stages step up to the full 150x150. All
+stages share one set of layers and one optimizer, so weights and Adam state
+carry across, and the saved models/model.h5 takes 150x150 images as before.
+Each stage's learning rate is scaled to its batch size from
+`training.learning_rate` / `training.base_batch_size`.
+
+Usage:
+    python src/Pipeline/progressive_train.py
+"""
+import json
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.Component.data_ingestion import DataGenerator
+from src.Component.progressive_resizing import TimeToAccuracy, parse_schedule
+from src.Component.training_options import scaled_learning_rate, training_options
+from src.config import Config
+from src.logger import logging
+from src.Pipeline.fine_tune_model import IMAGE_SIZE, MobileNetV2Model
+from src.Exception import CustomException as cuexc
+
+
+class ProgressiveTrain:
+    def __init__(self, config=None, weights='imagenet', schedule=None):
+        self.config = config or Config()
+        self.progressive_config = self.config['progressive']
+        self.training_config = self.config['training']
+        self.options = training_options(self.training_config)
+        self.schedule = parse_schedule(
+            schedule or self.progressive_config['stages'], IMAGE_SIZE, self.options['batch_size']
+        )
+        self.model_builder = MobileNetV2Model(weights=weights, options=self.options, flexible_input=True)
+        self.model = self.model_builder.model
+
+    def stage_data(self, image_size, batch_size):
+        """(training input, steps per epoch) for one stage, decoded at `image_size`."""
+        train_gen, _, _ = DataGenerator(batch_size=batch_size, target_size=(image_size, image_size)).data_generator()
+        return train_gen, train_gen.samples // batch_size
+
+    def validation_data(self):
+        """(validation input, steps) at full resolution, used to score every epoch."""
+        _, val_gen, _ = DataGenerator(batch_size=self.options['batch_size']).data_generator()
+        return val_gen, max(1, val_gen.samples // self.options['batch_size'])
+
+    def stage_learning_rate(self, batch_size):
+        base_lr = float(self.training_config.get('learning_rate', 1e-3))
+        base_batch_size = int(self.training_config.get('base_batch_size', self.options['batch_size']))
+        return scaled_learning_rate(base_lr, batch_size, base_batch_size)
+
+    def train(self, stage_data=None, validation=None, target_accuracy=None):
+        """
+        Run every stage of the schedule. Returns the time-to-accuracy report.
+
+        `stage_data(image_size, batch_size)` and `validation` default to the
+        DataGenerator split; benchmarks pass their own.
+        """
+        stage_data = stage_data or self.stage_data
+        val_data, val_steps = validation or self.validation_data()
+        if target_accuracy is None:
+            target_accuracy = self.progressive_config.get('target_accuracy')
+        tracker = TimeToAccuracy(self.model, val_data, val_steps, target_accuracy)
+
+        tracker.start()
+        epoch = 0
+        stages = []
+        for stage in self.schedule:
+            image_size, batch_size = stage['image_size'], stage['batch_size']
+            data, steps_per_epoch = stage_data(image_size, batch_size)
+            model = self.model_builder.stage_model(image_size)
+            # The optimizer is shared by all stages; only its learning rate changes
+            learning_rate = self.stage_learning_rate(batch_size)
+            model.optimizer.learning_rate = learning_rate
+            logging.info(f"Stage {image_size}x{image_size}: {stage['epochs']} epochs, batch size {batch_size}, "
+                         f"learning rate {learning_rate:.6f}")
+
+            tracker.begin_stage(image_size)
+            model.fit(data, initial_epoch=epoch, epochs=epoch + stage['epochs'], steps_per_epoch=steps_per_epoch,
+                      callbacks=[tracker], verbose=2)
+            epoch += stage['epochs']
+            stages.append({**stage, 'learning_rate': learning_rate, 'steps_per_epoch': steps_per_epoch})
+        tracker.pause()
+
+        report = {'stages': stages, **tracker.report()}
+        logging.info(f"Progressive training: {report['train_seconds']:.1f}s, final val_accuracy "
+                     f"{report['final_val_accuracy']:.4f}, time to {target_accuracy}: {report['seconds_to_target']}")
+        return report
+
+    def initiate_model_training(self):
+        try:
+            logging.info("Progressive Model Training Started")
+            report = self.train()
+
+            # Stages share their layers with this 150x150 model
+            model_path = project_root / 'models' / 'model.h5'
+            model_path.parent.mkdir(parents=True, exist_ok=True)
+            self.model.save(str(model_path))
+            logging.info(f"Model saved at {model_path}")
+
+            report_path = project_root / self.progressive_config.get('report_path', 'models/progressive_report.json')
+            report_path.parent.mkdir(parents=True, exist_ok=True)
+            report_path.write_text(json.dumps(report, indent=2))
+            return report
+
+        except Exception as e:
+            logging.error(f"Error in progressive training: {e}")
+            raise cuexc(e, sys)
+
+
+if __name__ == "__main__":
+    try:
+        trainer = ProgressiveTrain()
+        trainer.initiate_model_training()
+    except Exception as e:
+        print(f"Training failed: {e}")
@@ -0,0 +1,138 @@
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import tensorflow as tf
+from PIL import Image
+from tensorflow.keras.applications.mobilenet_v2 import preprocess_input
+from tensorflow.keras.models import load_model
+from src.Component.data_ingestion import FULL_SIZE, DataGenerator
+from src.Component.inference_engine import InferenceEngine
+from src.Component.tflite_backend import TFLiteEngine
+from src.Component.tf_data_pipeline import iterate_batches
+from src.config import Config
+from src.logger import logging
+from src.Exception import CustomException as cuexc
+
+
+class TFLiteExport:
+    """
+    Convert the trained h5 model to quantized TFLite variants and compare them.
+
+    Variants:
+        dynamic_range: int8 weights, float activations (no calibration needed).
+        float16: float16 weights.
+        int8: full integer quantization calibrated on a subset of the train split.
+    """
+
+    def __init__(self, config=None):
+        self.config = (config or Config())['tflite_export']
+        self.model_path = project_root / 'models' / 'model.h5'
+        self.output_dir = project_root / 'models'
+        self.report_path = project_root / self.config['report_path']
+        self.TARGET_SIZE = FULL_SIZE
+        self.BATCH_SIZE = 32
+        # Split directories or the split manifest, whichever the data config uses
+        self.data_generator = DataGenerator(batch_size=self.BATCH_SIZE, target_size=self.TARGET_SIZE)
+
+    def representative_dataset(self):
+        """Yield single preprocessed images sampled from both classes of the train split."""
+        files = list(self.data_generator.file_listing('train')[0])
+        if not files:
+            raise FileNotFoundError("No calibration images found in the train split")
+        rng = random.Random(42)
+        samples = rng.sample(files, min(self.config['calibration_samples'], len(files)))
+        for path in samples:
+            try:
+                image = Image.open(path).convert('RGB').resize(self.TARGET_SIZE)
+            except Exception as e:
+                logging.warning(f"Skipping calibration image {path}: {e}")
+                continue
+            array = preprocess_input(np.asarray(image, dtype=np.float32))
+            yield [array[np.newaxis]]
+
+    def convert(self, model, variant):
+        """Convert `model` to TFLite bytes with the given quantization variant."""
+        converter = tf.lite.TFLiteConverter.from_keras_model(model)
+        if variant == 'dynamic_range':
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        elif variant == 'float16':
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            converter.target_spec.supported_types = [tf.float16]
+        elif variant == 'int8':
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            converter.representative_dataset = self.representative_dataset
+            converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        else:
+            raise ValueError(f"Unknown TFLite variant: {variant!r}")
+        return converter.convert()
+
+    def evaluate(self, engine, test_generator):
+        """Return (accuracy, scores, seconds) for an engine over the test split."""
+        started = time.perf_counter()
+        scores = np.concatenate([
+            engine.predict(batch_x) for batch_x, _ in iterate_batches(test_generator)
+        ]).ravel()
+        elapsed = time.perf_counter() - started
+        accuracy = float(np.mean((scores > 0.5).astype(int) == test_generator.classes))
+        return accuracy, scores, elapsed
+
+    def run(self):
+        try:
+            logging.info("TFLite export started")
+            if not self.model_path.exists():
+                raise FileNotFoundError(f"Model not found at {self.model_path}")
+            model = load_model(str(self.model_path), compile=False)
+
+            test_generator = self.data_generator.test_generator()
+
+            base_accuracy, base_scores, base_seconds = self.evaluate(InferenceEngine(model), test_generator)
+            report = {
+                'h5': {
+                    'path': str(self.model_path),
+                    'size_mb': self.model_path.stat().st_size / 2**20,
+                    'accuracy': base_accuracy,
+                    'eval_seconds': base_seconds,
+                },
+                'variants': {},
+            }
+            logging.info(f"h5 model accuracy on test split: {base_accuracy:.4f}")
+
+            for variant in self.config['variants']:
+                tflite_path = self.output_dir / f'model_{variant}.tflite'
+                tflite_path.write_bytes(self.convert(model, variant))
+                logging.info(f"Wrote {tflite_path}")
+
+                accuracy, scores, seconds = self.evaluate(TFLiteEngine(tflite_path), test_generator)
+                report['variants'][variant] = {
+                    'path': str(tflite_path),
+                    'size_mb': tflite_path.stat().st_size / 2**20,
+                    'accuracy': accuracy,
+                    'accuracy_delta': accuracy - base_accuracy,
+                    'agreement_with_h5': float(np.mean((scores > 0.5) == (base_scores > 0.5))),
+                    'max_abs_score_diff': float(np.max(np.abs(scores - base_scores))),
+                    'eval_seconds': seconds,
+                }
+                logging.info(f"{variant}: accuracy {accuracy:.4f} (delta {accuracy - base_accuracy:+.4f})")
+
+            self.report_path.parent.mkdir(parents=True, exist_ok=True)
+            self.report_path.write_text(json.dumps(report, indent=2))
+            logging.info(f"TFLite report saved at {self.report_path}")
+            return report
+
+        except Exception as e:
+            logging.error(f"Error in TFLite export: {e}")
+            raise cuexc(e, sys)
+
+if __name__ == "__main__":
+    try:
+        TFLiteExport().run()
+    except Exception as e:
+        print(f"TFLite export failed: {e}")
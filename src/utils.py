@@ -0,0 +1,18 @@
+CLASSES = ['Cat', 'Dog']
+
+
+def format_prediction(score):
+    """
+    Turn a sigmoid score into the /predict response fields.
+
+    Output is binary: < 0.5 is Class 0 (Cat), > 0.5 is Class 1 (Dog),
+    following flow_from_directory's alphabetical class order.
+    """
+    score = float(score)
+    predicted_class = CLASSES[1] if score > 0.5 else CLASSES[0]
+    confidence = score if score > 0.5 else 1 - score
+    return {
+        'class': predicted_class,
+        'confidence': float(confidence),
+        'score': score
+    }
@@ -0,0 +1,86 @@
+import io
+import tarfile
+import zipfile
+
+import pytest
+
+from src.Component.batch_upload import UploadTooLarge, expand_uploads
+
+
+def zip_upload(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return ('images.zip', buffer.getvalue())
+
+
+def tar_upload(members):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode='w:gz') as archive:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return ('images.tar.gz', buffer.getvalue())
+
+
+@pytest.mark.parametrize('make_upload', [zip_upload, tar_upload])
+def test_archive_is_expanded_to_sorted_images(make_upload):
+    upload = make_upload({'b/2.png': b'png', 'a/1.jpg': b'jpg', 'notes.txt': b'text', 'a/.hidden.jpg': b'x'})
+    assert expand_uploads([upload]) == [('a/1.jpg', b'jpg'), ('b/2.png', b'png')]
+
+
+def test_plain_uploads_pass_through():
+    uploads = [('a.jpg', b'one'), ('b.jpg', b'two')]
+    assert expand_uploads(uploads) == uploads
+
+
+@pytest.mark.parametrize('make_upload', [zip_upload, tar_upload])
+def test_archive_over_the_file_limit_is_rejected(make_upload):
+    upload = make_upload({f'{i}.jpg': b'x' for i in range(5)})
+    assert len(expand_uploads([upload], max_files=5)) == 5
+    with pytest.raises(UploadTooLarge, match="Too many files"):
+        expand_uploads([upload], max_files=4)
+
+
+@pytest.mark.parametrize('make_upload', [zip_upload, tar_upload])
+def test_archive_over_the_uncompressed_size_limit_is_rejected(make_upload):
+    # Compresses to almost nothing; the limit applies to the uncompressed size
+    upload = make_upload({'big.jpg': b'\0' * 100_000})
+    assert len(upload[1]) < 10_000
+    with pytest.raises(UploadTooLarge, match="Upload too large"):
+        expand_uploads([upload], max_bytes=50_000)
+
+
+def test_zip_limits_are_checked_before_reading_members(monkeypatch):
+    upload = zip_upload({f'{i}.jpg': b'x' for i in range(3)})
+
+    def no_reads(*args, **kwargs):
+        raise AssertionError("member read before the limits were checked")
+
+    monkeypatch.setattr(zipfile.ZipFile, 'read', no_reads)
+    with pytest.raises(UploadTooLarge):
+        expand_uploads([upload], max_files=2)
+
+
+def test_tar_with_many_skipped_entries_is_rejected():
+    upload = tar_upload({f'{i}.txt': b'' for i in range(100)})
+    with pytest.raises(UploadTooLarge, match="Too many archive entries"):
+        expand_uploads([upload], max_files=10)
+
+
+def test_plain_uploads_are_limited_too():
+    uploads = [('a.jpg', b'x' * 10), ('b.jpg', b'x' * 10)]
+    with pytest.raises(UploadTooLarge):
+        expand_uploads(uploads, max_files=1)
+    with pytest.raises(UploadTooLarge):
+        expand_uploads(uploads, max_bytes=15)
+
+
+@pytest.mark.parametrize('make_upload', [zip_upload, tar_upload])
+@pytest.mark.parametrize('name', ['../escape.jpg', 'a/../../escape.jpg', '/etc/escape.jpg', 'C:/escape.jpg'])
+def test_path_traversal_is_rejected(make_upload, name):
+    upload = make_upload({'ok.jpg': b'x', name: b'y'})
+    with pytest.raises(ValueError, match="Unsafe path"):
+        expand_uploads([upload])
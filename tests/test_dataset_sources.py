@@ -0,0 +1,105 @@
+import io
+import tarfile
+import zipfile
+
+import pytest
+
+from src.Component.dataset_sources import KaggleSource, count_images, extract_dataset, is_complete_zip
+
+MEMBERS = {
+    'README.txt': b'readme',
+    'PetImages/Cat/0.jpg': b'cat 0',
+    'PetImages/Cat/1.jpg': b'cat 1',
+    'PetImages/Dog/0.jpg': b'dog 0',
+    'PetImages/notes.txt': b'skipped',
+}
+
+
+def write_zip(path, members=MEMBERS):
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return path
+
+
+def write_tar(path, members=MEMBERS):
+    with tarfile.open(path, 'w:gz') as archive:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return path
+
+
+@pytest.mark.parametrize('write_archive,name', [(write_zip, 'data.zip'), (write_tar, 'data.tar.gz')])
+def test_extracts_the_class_folders_below_the_dataset_root(tmp_path, write_archive, name):
+    # The top-level README comes first in the archive, before any class folder
+    archive = write_archive(tmp_path / name)
+    extract_dataset(archive, tmp_path / 'out', workers=2)
+
+    files = sorted(p.relative_to(tmp_path / 'out').as_posix() for p in (tmp_path / 'out').rglob('*') if p.is_file())
+    assert files == ['Cat/0.jpg', 'Cat/1.jpg', 'Dog/0.jpg']
+    assert (tmp_path / 'out' / 'Dog' / '0.jpg').read_bytes() == b'dog 0'
+    assert count_images(tmp_path / 'out') == {'Cat': 2, 'Dog': 1}
+    assert not (tmp_path / 'out.partial').exists()
+
+
+@pytest.mark.parametrize('write_archive,name', [(write_zip, 'data.zip'), (write_tar, 'data.tar.gz')])
+def test_archive_without_class_folders_is_rejected(tmp_path, write_archive, name):
+    archive = write_archive(tmp_path / name, {'README.txt': b'readme', 'images/0.jpg': b'x'})
+    with pytest.raises(ValueError, match="no Cat/ or Dog/ folder"):
+        extract_dataset(archive, tmp_path / 'out')
+
+
+def test_is_complete_zip(tmp_path):
+    archive = write_zip(tmp_path / 'data.zip')
+    assert is_complete_zip(archive)
+
+    truncated = tmp_path / 'truncated.zip'
+    truncated.write_bytes(archive.read_bytes()[:-30])
+    assert not is_complete_zip(truncated)
+    assert not is_complete_zip(tmp_path / 'missing.zip')
+
+
+class FakeKaggle:
+    """The parts of the downloader KaggleSource uses; downloads write `payload` unless the file exists."""
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.downloads = 0
+        self.api = self
+
+    def check_kaggle_json(self):
+        pass
+
+    def authenticate_kaggle(self):
+        pass
+
+    def dataset_download_files(self, dataset, path, unzip, force):
+        target = f"{path}/{dataset.split('/')[-1]}.zip"
+        try:
+            with open(target, 'xb') as f:
+                f.write(self.payload)
+        except FileExistsError:
+            return
+        self.downloads += 1
+
+
+def test_kaggle_fetch_replaces_a_truncated_archive(tmp_path):
+    complete = write_zip(tmp_path / 'complete.zip').read_bytes()
+    (tmp_path / 'dogs-vs-cats.zip').write_bytes(complete[:-30])
+    downloader = FakeKaggle(complete)
+
+    archive = KaggleSource(downloader, 'owner/dogs-vs-cats').fetch(tmp_path)
+    assert downloader.downloads == 1
+    assert archive.read_bytes() == complete
+
+    # A complete archive is reused as it is
+    KaggleSource(downloader, 'owner/dogs-vs-cats').fetch(tmp_path)
+    assert downloader.downloads == 1
+
+
+def test_kaggle_fetch_rejects_a_corrupt_download(tmp_path):
+    with pytest.raises(ValueError, match="incomplete or corrupt"):
+        KaggleSource(FakeKaggle(b'not a zip'), 'owner/dogs-vs-cats').fetch(tmp_path)
+    assert not (tmp_path / 'dogs-vs-cats.zip').exists()
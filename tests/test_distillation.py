@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+tf = pytest.importorskip('tensorflow')
+
+from src.Component.distillation import distillation_loss, hard_accuracy
+
+
+def sigmoid(x):
+    return 1 / (1 + np.exp(-x))
+
+
+def bce(target, probability):
+    return -(target * np.log(probability) + (1 - target) * np.log(1 - probability))
+
+
+def targets(labels, teacher_probabilities):
+    return tf.constant(np.stack([labels, teacher_probabilities], axis=1), tf.float32)
+
+
+def test_matches_a_manual_reference():
+    labels = np.array([0.0, 1.0, 1.0, 0.0])
+    teacher = np.array([0.2, 0.9, 0.4, 0.01])
+    logits = np.array([[-1.0], [2.0], [0.5], [-3.0]])
+    temperature, soft_weight = 3.0, 0.6
+
+    teacher_logits = np.log(teacher / (1 - teacher))
+    expected = ((1 - soft_weight) * bce(labels, sigmoid(logits[:, 0]))
+                + soft_weight * temperature ** 2
+                * bce(sigmoid(teacher_logits / temperature), sigmoid(logits[:, 0] / temperature)))
+
+    loss = distillation_loss(temperature, soft_weight)(targets(labels, teacher), tf.constant(logits, tf.float32))
+    np.testing.assert_allclose(loss.numpy(), expected, rtol=1e-5)
+
+
+def test_without_soft_weight_it_is_plain_cross_entropy():
+    labels, logits = np.array([0.0, 1.0]), tf.constant([[0.3], [-0.7]])
+    loss = distillation_loss(temperature=4.0, soft_weight=0.0)(targets(labels, np.array([0.9, 0.1])), logits)
+    expected = tf.keras.losses.binary_crossentropy(labels[:, None], logits, from_logits=True)
+    np.testing.assert_allclose(loss.numpy(), expected.numpy(), rtol=1e-6)
+
+
+@pytest.mark.parametrize('temperature', [1.0, 2.0, 5.0])
+def test_soft_term_is_minimised_at_the_teacher_logit(temperature):
+    teacher = np.array([0.1, 0.5, 0.8])
+    teacher_logits = np.log(teacher / (1 - teacher))[:, None].astype(np.float32)
+    loss_fn = distillation_loss(temperature, soft_weight=1.0)
+
+    for offset, vanishes in ((0.0, True), (0.5, False)):
+        logits = tf.Variable(teacher_logits + offset)
+        with tf.GradientTape() as tape:
+            loss = tf.reduce_sum(loss_fn(targets(np.zeros(3), teacher), logits))
+        gradient = tape.gradient(loss, logits).numpy()
+        assert np.allclose(gradient, 0, atol=1e-4) == vanishes
+
+
+def test_saturated_teacher_probabilities_stay_finite():
+    loss = distillation_loss()(targets(np.array([0.0, 1.0]), np.array([0.0, 1.0])), tf.constant([[0.0], [0.0]]))
+    assert np.isfinite(loss.numpy()).all()
+
+
+def test_hard_accuracy_uses_the_true_labels():
+    batch = targets(np.array([0.0, 1.0, 1.0, 0.0]), np.array([0.9, 0.9, 0.1, 0.1]))
+    logits = tf.constant([[-1.0], [2.0], [-0.5], [0.5]])
+    assert float(hard_accuracy(batch, logits)) == pytest.approx(0.5)
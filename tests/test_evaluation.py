@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('tensorflow')
+
+from src.Component.evaluation import StreamingBinaryMetrics
+
+
+@pytest.fixture
+def predictions():
+    rng = np.random.default_rng(0)
+    labels = rng.integers(0, 2, size=2000)
+    # Informative but imperfect scores, distinct at the histogram resolution
+    scores = np.clip(rng.normal(0.35 + 0.3 * labels, 0.2), 0.0, 1.0)
+    return labels, scores
+
+
+def streamed(labels, scores, batch_size=128):
+    metrics = StreamingBinaryMetrics()
+    for start in range(0, len(labels), batch_size):
+        metrics.update(labels[start:start + batch_size], scores[start:start + batch_size])
+    return metrics.result(class_names=('Cat', 'Dog'))
+
+
+def reference_roc_auc(labels, scores):
+    """Probability that a random positive outranks a random negative (ties count half)."""
+    positives, negatives = scores[labels == 1], scores[labels == 0]
+    greater = (positives[:, None] > negatives[None, :]).sum()
+    ties = (positives[:, None] == negatives[None, :]).sum()
+    return (greater + 0.5 * ties) / (len(positives) * len(negatives))
+
+
+def reference_average_precision(labels, scores):
+    """Mean of the precision at the rank of every positive, scores sorted descending."""
+    order = np.argsort(-scores, kind='stable')
+    hits = labels[order] == 1
+    precision_at_k = np.cumsum(hits) / np.arange(1, len(hits) + 1)
+    return precision_at_k[hits].mean()
+
+
+def test_threshold_metrics_match_a_manual_reference(predictions):
+    labels, scores = predictions
+    result = streamed(labels, scores)
+    predicted = (scores > 0.5).astype(int)
+
+    expected_confusion = [[int(np.sum((labels == t) & (predicted == p))) for p in (0, 1)] for t in (0, 1)]
+    assert result['confusion_matrix'] == expected_confusion
+    assert result['images'] == len(labels)
+    assert result['accuracy'] == pytest.approx(np.mean(predicted == labels))
+
+    true_positive = np.sum((labels == 1) & (predicted == 1))
+    assert result['classes']['Dog']['precision'] == pytest.approx(true_positive / np.sum(predicted == 1))
+    assert result['classes']['Dog']['recall'] == pytest.approx(true_positive / np.sum(labels == 1))
+    assert result['classes']['Cat']['support'] == int(np.sum(labels == 0))
+
+    clipped = np.clip(scores, 1e-7, 1 - 1e-7)
+    log_loss = -np.mean(labels * np.log(clipped) + (1 - labels) * np.log(1 - clipped))
+    assert result['log_loss'] == pytest.approx(log_loss)
+    assert result['brier_score'] == pytest.approx(np.mean((scores - labels) ** 2))
+
+
+def test_ranking_metrics_match_a_manual_reference(predictions):
+    labels, scores = predictions
+    result = streamed(labels, scores)
+
+    # Exact up to ties within one of the 1000 score bins
+    assert result['roc_auc'] == pytest.approx(reference_roc_auc(labels, scores), abs=2e-3)
+    assert result['average_precision'] == pytest.approx(reference_average_precision(labels, scores), abs=5e-3)
+
+
+def test_ranking_metrics_are_exact_on_bin_aligned_scores():
+    labels = np.array([0, 0, 1, 1, 0, 1, 1, 0])
+    scores = np.array([0.1, 0.4, 0.35, 0.8, 0.7, 0.9, 0.2, 0.05])
+    result = streamed(labels, scores, batch_size=3)
+
+    assert result['roc_auc'] == pytest.approx(reference_roc_auc(labels, scores))
+    assert result['average_precision'] == pytest.approx(reference_average_precision(labels, scores))
+
+
+def test_batching_does_not_change_the_result(predictions):
+    labels, scores = predictions
+    large, small = streamed(labels, scores, batch_size=1000), streamed(labels, scores, batch_size=7)
+    # Counts are identical; running float sums only differ by summation order
+    for key in ('confusion_matrix', 'classes', 'roc_auc', 'average_precision', 'roc_curve', 'pr_curve'):
+        assert large[key] == small[key]
+    for key in ('log_loss', 'brier_score'):
+        assert large[key] == pytest.approx(small[key])
+    assert [b['count'] for b in large['calibration']['bins']] == [b['count'] for b in small['calibration']['bins']]
+
+
+def test_single_class_leaves_ranking_metrics_undefined():
+    result = streamed(np.ones(10, dtype=int), np.linspace(0, 1, 10))
+    assert result['roc_auc'] is None
+    assert result['average_precision'] is None
+
+
+def test_calibration_bins_match_a_manual_reference(predictions):
+    labels, scores = predictions
+    result = streamed(labels, scores)
+
+    bins = np.minimum((scores * 10).astype(int), 9)
+    for entry in result['calibration']['bins']:
+        b = int(round(entry['range'][0] * 10))
+        assert entry['count'] == int(np.sum(bins == b))
+        assert entry['mean_score'] == pytest.approx(scores[bins == b].mean())
+        assert entry['positive_rate'] == pytest.approx(labels[bins == b].mean())
+
+
+def test_agrees_with_sklearn(predictions):
+    sklearn_metrics = pytest.importorskip('sklearn.metrics')
+    labels, scores = predictions
+    result = streamed(labels, scores)
+
+    assert result['roc_auc'] == pytest.approx(sklearn_metrics.roc_auc_score(labels, scores), abs=2e-3)
+    assert result['average_precision'] == pytest.approx(
+        sklearn_metrics.average_precision_score(labels, scores), abs=5e-3)
+    assert result['log_loss'] == pytest.approx(sklearn_metrics.log_loss(labels, np.clip(scores, 1e-7, 1 - 1e-7)))
+    assert result['confusion_matrix'] == sklearn_metrics.confusion_matrix(labels, scores > 0.5).tolist()
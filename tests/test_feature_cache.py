@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+tf = pytest.importorskip('tensorflow')
+
+from src.Component.feature_cache import _inputs_of, find_frozen_boundary, split_at_boundary
+from src.Pipeline.fine_tune_model import MobileNetV2Model
+
+
+@pytest.fixture(scope='module')
+def model_builder():
+    # Random weights: the split only depends on the graph, and nothing is downloaded
+    return MobileNetV2Model(weights=None)
+
+
+def test_boundary_is_the_only_tensor_read_across_the_cut(model_builder):
+    base_model = model_builder.base_model
+    boundary = find_frozen_boundary(base_model, model_builder.fine_tune_at)
+    layers = base_model.layers
+
+    assert 0 < boundary < model_builder.fine_tune_at
+    assert not any(layer.trainable_weights for layer in layers[:boundary + 1])
+    position = {id(layer): i for i, layer in enumerate(layers)}
+    read_across = {
+        position[id(tensor._keras_history.operation)]
+        for layer in layers[boundary + 1:] for tensor in _inputs_of(layer)
+    } & set(range(boundary + 1))
+    assert read_across == {boundary}
+
+
+def test_prefix_then_suffix_matches_the_full_model(model_builder):
+    model, base_model = model_builder.model, model_builder.base_model
+    boundary = find_frozen_boundary(base_model, model_builder.fine_tune_at)
+    prefix, suffix = split_at_boundary(model, base_model, boundary)
+
+    images = np.random.default_rng(0).uniform(-1, 1, size=(2, 150, 150, 3)).astype(np.float32)
+    features = prefix(images, training=False)
+    assert tuple(features.shape[1:]) == tuple(base_model.layers[boundary].output.shape[1:])
+    np.testing.assert_allclose(suffix(features, training=False), model(images, training=False), atol=1e-5)
+
+    # The suffix trains the model's own weights
+    suffix_weights = {id(w) for w in suffix.trainable_weights}
+    assert suffix_weights and suffix_weights <= {id(w) for w in model.trainable_weights}
+    assert {id(w) for w in model.trainable_weights} <= suffix_weights
+
+
+def test_no_boundary_when_every_cut_is_crossed_by_a_skip_connection():
+    inputs = tf.keras.Input((4,))
+    x = tf.keras.layers.Dense(4)(inputs)
+    x = tf.keras.layers.Dense(4)(x)
+    outputs = tf.keras.layers.Concatenate()([inputs, x])
+    model = tf.keras.Model(inputs, outputs)
+
+    with pytest.raises(ValueError, match="No single-tensor boundary"):
+        find_frozen_boundary(model, len(model.layers) - 1)
@@ -0,0 +1,82 @@
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from src.Component.image_preprocessing import RESAMPLE, decode_image, preprocess_image, scale_for_mobilenet
+
+
+def encoded(image, fmt):
+    buffer = io.BytesIO()
+    image.save(buffer, fmt)
+    return buffer.getvalue()
+
+
+def gradient(size=(600, 400), mode='RGB'):
+    width, height = size
+    x = np.linspace(0, 255, width, dtype=np.uint8)[None, :].repeat(height, axis=0)
+    y = np.linspace(0, 255, height, dtype=np.uint8)[:, None].repeat(width, axis=1)
+    return Image.fromarray(np.stack([x, y, 255 - x], axis=-1)).convert(mode)
+
+
+def legacy_preprocess(data, image_size=(150, 150)):
+    """The original serving path: full decode, RGB, resize, x / 127.5 - 1."""
+    image = Image.open(io.BytesIO(data)).convert('RGB').resize(image_size, RESAMPLE)
+    return (np.asarray(image, dtype=np.float32) / 127.5 - 1.0)[np.newaxis]
+
+
+@pytest.mark.parametrize('fmt,mode', [('PNG', 'RGB'), ('PNG', 'RGBA'), ('PNG', 'L'), ('JPEG', 'RGB')])
+def test_without_draft_matches_the_legacy_path(fmt, mode):
+    data = encoded(gradient(mode=mode), fmt)
+    np.testing.assert_allclose(preprocess_image(data, use_draft=False), legacy_preprocess(data), atol=1e-6)
+
+
+def test_jpeg_draft_decode_stays_close_to_the_full_decode():
+    data = encoded(gradient((1200, 900)), 'JPEG')
+    drafted = decode_image(data).astype(int)
+    full = decode_image(data, use_draft=False).astype(int)
+
+    assert drafted.shape == full.shape == (150, 150, 3)
+    assert np.abs(drafted - full).mean() < 3
+
+
+def test_preprocess_returns_a_fresh_array_per_call():
+    first = preprocess_image(encoded(Image.new('RGB', (32, 32), (0, 0, 0)), 'PNG'))
+    second = preprocess_image(encoded(Image.new('RGB', (32, 32), (255, 255, 255)), 'PNG'))
+
+    assert first.shape == (1, 150, 150, 3) and first.dtype == np.float32
+    assert np.all(first == -1.0) and np.all(second == 1.0)
+
+
+def test_decode_writes_into_the_given_buffer():
+    out = np.zeros((20, 30, 3), dtype=np.uint8)
+    result = decode_image(encoded(Image.new('RGB', (64, 64), (10, 20, 30)), 'PNG'), (30, 20), out=out)
+    assert result is out
+    assert (out == [10, 20, 30]).all()
+
+
+def test_scale_for_mobilenet():
+    pixels = np.array([[0, 127.5, 255]], dtype=np.float32)
+    assert scale_for_mobilenet(pixels) is pixels
+    np.testing.assert_allclose(pixels, [[-1.0, 0.0, 1.0]])
+
+    uint8 = np.array([0, 255], dtype=np.uint8)
+    np.testing.assert_allclose(scale_for_mobilenet(uint8), [-1.0, 1.0])
+
+
+def test_stage_timer_sees_every_stage():
+    stages = []
+
+    class Timer:
+        def __init__(self, stage):
+            stages.append(stage)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    preprocess_image(encoded(gradient(), 'JPEG'), stage_timer=Timer)
+    assert stages == ['decode', 'resize', 'preprocess']
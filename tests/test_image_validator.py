@@ -0,0 +1,70 @@
+import io
+import json
+
+import pytest
+from PIL import Image
+
+from src.Component import image_validator
+from src.Component.image_validator import ImageValidator, check_image
+
+
+def jpeg_bytes(value=128):
+    buffer = io.BytesIO()
+    Image.new('RGB', (64, 64), (value, 0, 255 - value)).save(buffer, 'JPEG')
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    """Cat/ and Dog/ with three good JPEGs each, one truncated Cat and one non-image Dog."""
+    root = tmp_path / 'PetImages'
+    for cls in ('Cat', 'Dog'):
+        (root / cls).mkdir(parents=True)
+        for i in range(3):
+            (root / cls / f'{i}.jpg').write_bytes(jpeg_bytes(40 * i))
+    (root / 'Cat' / 'truncated.jpg').write_bytes(jpeg_bytes()[:300])
+    (root / 'Dog' / 'text.jpg').write_bytes(b'not an image')
+    (root / 'Dog' / 'notes.txt').write_text('skipped')
+    return root
+
+
+def test_check_image(dataset):
+    assert check_image(dataset / 'Cat' / '0.jpg') is None
+    assert check_image(dataset / 'Cat' / 'truncated.jpg')
+    assert check_image(dataset / 'Dog' / 'text.jpg').startswith('UnidentifiedImageError')
+
+
+def test_bad_images_are_quarantined_by_class(dataset, tmp_path):
+    quarantine = tmp_path / 'quarantine'
+    report = ImageValidator(tmp_path / 'cache.json', quarantine, max_workers=2).scan(dataset)
+
+    assert (report['files'], report['checked'], report['bad']) == (8, 8, 2)
+    assert sorted(p.relative_to(quarantine).as_posix() for p in quarantine.rglob('*.jpg')) == [
+        'PetImages/Cat/truncated.jpg', 'PetImages/Dog/text.jpg'
+    ]
+    assert not (dataset / 'Cat' / 'truncated.jpg').exists()
+    assert json.loads((quarantine / 'report.json').read_text())['bad'] == 2
+
+
+def test_report_only_leaves_files_in_place(dataset, tmp_path):
+    report = ImageValidator(tmp_path / 'cache.json', tmp_path / 'quarantine', max_workers=1,
+                            quarantine=False).scan(dataset)
+
+    assert report['bad'] == 2
+    assert all(entry['quarantined_to'] is None for entry in report['quarantined'])
+    assert (dataset / 'Cat' / 'truncated.jpg').exists()
+
+
+def test_later_scans_only_decode_new_or_changed_files(dataset, tmp_path, monkeypatch):
+    cache = tmp_path / 'cache.json'
+    ImageValidator(cache, tmp_path / 'quarantine', max_workers=1).scan(dataset)
+
+    (dataset / 'Dog' / 'new.jpg').write_bytes(jpeg_bytes(7))
+    (dataset / 'Cat' / '0.jpg').write_bytes(jpeg_bytes(9))
+    # A fresh validator (a new process) reads the cache written by the first scan
+    report = ImageValidator(cache, tmp_path / 'quarantine', max_workers=1).scan(dataset)
+    assert (report['files'], report['checked'], report['cached'], report['bad']) == (7, 2, 5, 0)
+
+    # Nothing to decode: no worker pool is started at all
+    monkeypatch.setattr(image_validator, 'ProcessPoolExecutor', None)
+    assert ImageValidator(cache, tmp_path / 'quarantine').scan(dataset)['checked'] == 0
@@ -0,0 +1,165 @@
+import queue
+import threading
+
+import numpy as np
+import pytest
+
+from src.Component.micro_batcher import MicroBatcher
+
+
+def first_pixel(batch):
+    """A predict_fn whose output row identifies the input image."""
+    return batch.reshape(len(batch), -1)[:, :1].astype(np.float32)
+
+
+def image(value):
+    return np.full((4, 4, 3), value, dtype=np.float32)
+
+
+@pytest.fixture
+def batcher_factory():
+    batchers = []
+
+    def make(predict_fn, start=True, **kwargs):
+        batcher = MicroBatcher(predict_fn, **kwargs)
+        batchers.append(batcher)
+        return batcher.start() if start else batcher
+
+    yield make
+    for batcher in batchers:
+        batcher.stop()
+
+
+def test_concurrent_requests_share_one_forward_pass(batcher_factory):
+    sizes = []
+
+    def predict_fn(batch):
+        sizes.append(len(batch))
+        return first_pixel(batch)
+
+    batcher = batcher_factory(predict_fn, max_batch_size=4, max_wait_ms=500)
+    futures = [batcher.submit(image(i)) for i in range(4)]
+
+    assert [float(f.result(timeout=5)[0]) for f in futures] == [0.0, 1.0, 2.0, 3.0]
+    assert sizes == [4]
+    stats = batcher.stats()
+    assert stats['total_batches'] == 1
+    assert stats['total_requests'] == 4
+    assert stats['batch_size_histogram'] == {'4': 1}
+
+
+def test_batch_size_is_capped(batcher_factory):
+    sizes = []
+
+    def predict_fn(batch):
+        sizes.append(len(batch))
+        return first_pixel(batch)
+
+    batcher = batcher_factory(predict_fn, start=False, max_batch_size=3, max_wait_ms=50)
+    futures = [batcher.submit(image(i)) for i in range(7)]
+    batcher.start()
+
+    assert [float(f.result(timeout=5)[0]) for f in futures] == list(range(7))
+    assert max(sizes) == 3
+    assert sum(sizes) == 7
+
+
+def test_submit_accepts_a_batch_of_one(batcher_factory):
+    batcher = batcher_factory(first_pixel, max_wait_ms=1)
+    assert float(batcher.predict(image(5)[None], timeout=5)[0]) == 5.0
+    with pytest.raises(ValueError):
+        batcher.submit(np.zeros((2, 4, 4, 3)))
+
+
+def test_forward_pass_error_reaches_every_caller(batcher_factory):
+    calls = []
+
+    def predict_fn(batch):
+        calls.append(len(batch))
+        if len(calls) == 1:
+            raise ValueError("bad batch")
+        return first_pixel(batch)
+
+    batcher = batcher_factory(predict_fn, start=False, max_batch_size=2, max_wait_ms=50)
+    futures = [batcher.submit(image(i)) for i in range(2)]
+    batcher.start()
+
+    for future in futures:
+        with pytest.raises(ValueError, match="bad batch"):
+            future.result(timeout=5)
+    assert batcher.stats()['total_errors'] == 2
+    # The worker survives and serves the next batch
+    assert float(batcher.predict(image(7), timeout=5)[0]) == 7.0
+
+
+def test_wrong_number_of_output_rows_fails_the_batch(batcher_factory):
+    batcher = batcher_factory(lambda batch: first_pixel(batch)[:0], max_wait_ms=1)
+    with pytest.raises(RuntimeError, match="returned 0 rows"):
+        batcher.predict(image(1), timeout=5)
+
+
+def test_failing_on_batch_callback_does_not_fail_requests(batcher_factory):
+    def on_batch(size):
+        raise RuntimeError("metrics down")
+
+    batcher = batcher_factory(first_pixel, max_wait_ms=1, on_batch=on_batch)
+    assert float(batcher.predict(image(3), timeout=5)[0]) == 3.0
+    assert float(batcher.predict(image(4), timeout=5)[0]) == 4.0
+
+
+def test_worker_survives_unexpected_errors(batcher_factory):
+    batcher = batcher_factory(first_pixel, max_wait_ms=1)
+    original = batcher._collect_batch
+    batcher._collect_batch = lambda first: 1 / 0
+
+    with pytest.raises(ZeroDivisionError):
+        batcher.predict(image(1), timeout=5)
+    batcher._collect_batch = original
+    assert batcher._thread.is_alive()
+    assert float(batcher.predict(image(2), timeout=5)[0]) == 2.0
+
+
+def test_full_queue_rejects_and_stop_fails_pending(batcher_factory):
+    batcher = batcher_factory(first_pixel, start=False, max_queue_size=2)
+    futures = [batcher.submit(image(i)) for i in range(2)]
+    with pytest.raises(queue.Full):
+        batcher.submit(image(2))
+    assert batcher.queue_depth() == 2
+
+    batcher.stop()
+    for future in futures:
+        with pytest.raises(RuntimeError, match="stopped"):
+            future.result(timeout=1)
+
+
+def test_timed_out_request_is_dropped_before_the_forward_pass(batcher_factory):
+    seen = []
+
+    def predict_fn(batch):
+        seen.extend(first_pixel(batch)[:, 0].tolist())
+        return first_pixel(batch)
+
+    batcher = batcher_factory(predict_fn, start=False, max_wait_ms=1)
+    with pytest.raises(TimeoutError):
+        batcher.predict(image(1), timeout=0.01)
+    batcher.start()
+
+    assert float(batcher.predict(image(2), timeout=5)[0]) == 2.0
+    assert seen == [2.0]
+
+
+def test_many_threads_get_their_own_rows(batcher_factory):
+    batcher = batcher_factory(first_pixel, max_batch_size=8, max_wait_ms=2)
+    results = {}
+
+    def call(i):
+        results[i] = float(batcher.predict(image(i), timeout=10)[0])
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(32)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {i: float(i) for i in range(32)}
+    assert batcher.stats()['total_requests'] == 32
@@ -0,0 +1,103 @@
+import os
+import time
+
+import pytest
+
+from src.Component.prediction_cache import PredictionCache
+
+RESULT = {'class': 'Dog', 'confidence': 0.9, 'score': 0.9}
+
+
+@pytest.fixture
+def model_file(tmp_path):
+    path = tmp_path / 'model.h5'
+    path.write_bytes(b'weights v1')
+    return path
+
+
+def stat_of(path):
+    st = os.stat(path)
+    return (st.st_size, st.st_mtime_ns)
+
+
+def test_hit_and_miss(model_file):
+    cache = PredictionCache(model_file)
+    key = PredictionCache.content_key(b'image bytes')
+
+    assert cache.get(key) is None
+    cache.put(key, RESULT)
+    assert cache.get(key) == RESULT
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 1, 1)
+
+
+def test_entries_expire_after_ttl(model_file):
+    cache = PredictionCache(model_file, ttl_seconds=0.05)
+    cache.put('key', RESULT)
+    assert cache.get('key') == RESULT
+
+    time.sleep(0.1)
+    assert cache.get('key') is None
+    assert cache.stats()['entries'] == 0
+
+
+def test_least_recently_used_entries_are_evicted(model_file):
+    cache = PredictionCache(model_file, max_bytes=1200)
+    cache.put('key0', RESULT)
+    for i in range(1, 10):
+        # Keep key0 recently used
+        assert cache.get('key0') == RESULT
+        cache.put(f'key{i}', RESULT)
+
+    stats = cache.stats()
+    assert stats['evictions'] > 0
+    assert stats['bytes'] <= 1200
+    assert cache.get('key0') == RESULT
+    assert cache.get('key9') == RESULT
+    assert cache.get('key1') is None
+
+
+def test_set_model_invalidates(model_file):
+    cache = PredictionCache(model_file, model_stat=(10, 1))
+    cache.put('key', RESULT)
+
+    cache.set_model(model_file, (10, 1))
+    assert cache.get('key') == RESULT
+
+    cache.set_model(model_file, (11, 2))
+    assert cache.get('key') is None
+    assert cache.stats()['invalidations'] == 1
+
+
+def test_version_is_fixed_when_the_model_was_loaded(model_file):
+    cache = PredictionCache(model_file, model_stat=stat_of(model_file))
+    cache.put('key', RESULT)
+
+    # Replacing the file on disk does not change what the loaded engine answers
+    model_file.write_bytes(b'weights v2, not loaded yet')
+    assert cache.get('key') == RESULT
+
+
+def test_disk_tier_survives_restart_of_the_same_model(model_file, tmp_path):
+    disk_path = tmp_path / 'cache.sqlite'
+    model_stat = stat_of(model_file)
+    cache = PredictionCache(model_file, disk_path=str(disk_path), model_stat=model_stat)
+    cache.put('key', RESULT)
+    cache.close()
+
+    restarted = PredictionCache(model_file, disk_path=str(disk_path), model_stat=model_stat)
+    assert restarted.get('key') == RESULT
+    assert restarted.stats()['disk_hits'] == 1
+    restarted.close()
+
+
+def test_disk_tier_is_dropped_for_a_new_model(model_file, tmp_path):
+    disk_path = tmp_path / 'cache.sqlite'
+    cache = PredictionCache(model_file, disk_path=str(disk_path), model_stat=stat_of(model_file))
+    cache.put('key', RESULT)
+    cache.close()
+
+    model_file.write_bytes(b'retrained weights')
+    restarted = PredictionCache(model_file, disk_path=str(disk_path), model_stat=stat_of(model_file))
+    assert restarted.get('key') is None
+    restarted.close()
@@ -0,0 +1,65 @@
+import threading
+
+import pytest
+
+from src.Component.serving_runtime import BackgroundLoader
+
+
+def counting_loader(release=None):
+    calls = []
+
+    def load():
+        calls.append(threading.current_thread().name)
+        if release is not None:
+            release.wait(5)
+        return 'runtime'
+
+    return calls, load
+
+
+def test_start_loads_once_per_process():
+    release = threading.Event()
+    calls, load = counting_loader(release)
+    loader = BackgroundLoader(load)
+
+    for _ in range(3):
+        loader.start()
+    assert loader.state == 'loading'
+    release.set()
+    assert loader.wait(5)
+    loader.start()
+
+    assert calls == ['model-loader']
+    assert loader.ready and loader.result == 'runtime'
+
+
+def test_start_after_a_blocking_load_is_a_no_op():
+    calls, load = counting_loader()
+    loader = BackgroundLoader(load)
+    loader.load()
+    loader.start()
+    assert calls == [threading.current_thread().name]
+
+
+def test_failed_load_is_reported():
+    def load():
+        raise OSError("no model file")
+
+    loader = BackgroundLoader(load).start()
+    assert loader.wait(5)
+    assert loader.state == 'failed'
+    assert loader.status()['error'] == "OSError: no model file"
+
+
+def test_flask_app_starts_loading_on_its_first_request(monkeypatch):
+    pytest.importorskip('flask_cors')
+    import app
+
+    calls, load = counting_loader()
+    monkeypatch.setattr(app, 'loader', BackgroundLoader(load))
+    client = app.app.test_client()
+
+    assert client.get('/healthz').status_code == 200
+    assert app.loader.wait(5)
+    assert client.get('/readyz').status_code == 200
+    assert calls == ['model-loader']
@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+tf = pytest.importorskip('tensorflow')
+
+from src.Component.distributed_training import shard_input
+from src.Component.tf_data_pipeline import list_split_files, make_dataset
+
+TARGET_SIZE = (8, 8)
+
+
+@pytest.fixture
+def split_dir(tmp_path):
+    """Ten solid-colour PNGs per class; the pixel value identifies the image."""
+    for c, cls in enumerate(('Cat', 'Dog')):
+        (tmp_path / cls).mkdir()
+        for i in range(10):
+            value = 10 * (10 * c + i)
+            Image.new('RGB', (16, 16), (value, value, value)).save(tmp_path / cls / f'{i}.png')
+    return tmp_path
+
+
+def image_ids(dataset):
+    """The ids of every image in one pass over an evaluation dataset."""
+    ids = []
+    for images, _ in dataset.as_numpy_iterator():
+        # Undo MobileNetV2 scaling to recover the pixel value
+        ids.extend(np.rint((images[:, 0, 0, 0] + 1) * 127.5 / 10).astype(int).tolist())
+    return ids
+
+
+@pytest.mark.parametrize('num_shards', [2, 3])
+def test_make_dataset_shards_are_disjoint_and_cover_the_split(split_dir, num_shards):
+    filepaths, labels, class_indices = list_split_files(str(split_dir))
+    shards = [
+        make_dataset(filepaths, labels, class_indices, TARGET_SIZE, 4, training=False, cache=False,
+                     num_shards=num_shards, shard_index=index)
+        for index in range(num_shards)
+    ]
+
+    ids = [image_ids(shard) for shard in shards]
+    assert sorted(sum(ids, [])) == list(range(20))
+    assert sum(len(shard_ids) for shard_ids in ids) == 20
+    assert [set(shard.filenames) for shard in shards] == [set(filepaths[i::num_shards]) for i in range(num_shards)]
+    for shard in shards:
+        assert shard.split_samples == 20
+        assert shard.samples == len(shard.filenames)
+
+
+def test_training_shards_only_read_their_files(split_dir):
+    filepaths, labels, class_indices = list_split_files(str(split_dir))
+    seen = []
+    for index in range(2):
+        shard = make_dataset(filepaths, labels, class_indices, TARGET_SIZE, 5, training=True, cache=False,
+                             seed=1, num_shards=2, shard_index=index)
+        ids = set()
+        for images, _ in shard.take(4).as_numpy_iterator():
+            ids.update(np.rint((images[:, 0, 0, 0] + 1) * 127.5 / 10).astype(int).tolist())
+        seen.append(ids)
+    assert not seen[0] & seen[1]
+    assert seen[0] | seen[1] == set(range(20))
+
+
+def test_shard_input_rejects_a_dataset_built_for_another_shard(split_dir):
+    filepaths, labels, class_indices = list_split_files(str(split_dir))
+    dataset = make_dataset(filepaths, labels, class_indices, TARGET_SIZE, 4, training=False, cache=False,
+                           num_shards=2, shard_index=0)
+
+    assert shard_input(dataset, 2, num_shards=2, shard_index=0) is not None
+    with pytest.raises(ValueError, match="shard 0 of 2"):
+        shard_input(dataset, 2, num_shards=2, shard_index=1)
+
+
+class FakeIterator:
+    """The parts of a Keras DirectoryIterator that resumable_batches uses; x is the sample index."""
+
+    def __init__(self, n, batch_size, shuffle=True):
+        self.n = n
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+
+    def __getitem__(self, i):
+        return self._get_batches_of_transformed_samples(np.arange(self.batch_size))
+
+    def _get_batches_of_transformed_samples(self, index_array):
+        index_array = np.asarray(index_array)
+        return index_array.astype(np.int64), np.zeros(len(index_array), dtype=np.float32)
+
+
+@pytest.mark.parametrize('shuffle', [True, False])
+def test_shard_input_splits_each_global_batch(shuffle):
+    iterator = FakeIterator(n=24, batch_size=4, shuffle=shuffle)
+    steps = 3
+    shards = [
+        [x.tolist() for x, _ in shard_input(iterator, steps, num_shards=2, shard_index=index, seed=5)
+         .take(steps).as_numpy_iterator()]
+        for index in range(2)
+    ]
+
+    for step in range(steps):
+        first, second = shards[0][step], shards[1][step]
+        assert len(first) == len(second) == 4
+        assert not set(first) & set(second)
+    # One epoch of 3 global batches of 8 covers all 24 samples exactly once
+    assert sorted(sum(shards[0] + shards[1], [])) == list(range(24))
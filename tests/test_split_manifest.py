@@ -0,0 +1,104 @@
+import os
+
+import pytest
+
+from src.Component import split_manifest
+from src.Component.split_manifest import SplitManifest
+
+CLASSES = ['Cat', 'Dog']
+
+
+@pytest.fixture
+def source_dir(tmp_path):
+    source = tmp_path / 'raw'
+    for cls in CLASSES:
+        (source / cls).mkdir(parents=True)
+        for i in range(10):
+            (source / cls / f'{i}.jpg').write_bytes(f'{cls}-{i}'.encode())
+    (source / 'Cat' / 'notes.txt').write_text('not an image')
+    return source
+
+
+def split_of(manifest):
+    return {row['path']: row['split'] for row in manifest.rows}
+
+
+def test_split_is_deterministic(source_dir, tmp_path):
+    first = SplitManifest(tmp_path / 'a.csv').build(source_dir, CLASSES, train_ratio=0.8, seed=42)
+    second = SplitManifest(tmp_path / 'b.csv').build(source_dir, CLASSES, train_ratio=0.8, seed=42)
+
+    assert first.rows == second.rows
+    assert len(first.rows) == 20
+    assert first.counts() == {('train', 'Cat'): 8, ('test', 'Cat'): 2, ('train', 'Dog'): 8, ('test', 'Dog'): 2}
+    other_seed = SplitManifest(tmp_path / 'c.csv').build(source_dir, CLASSES, train_ratio=0.8, seed=7)
+    assert split_of(other_seed) != split_of(first)
+
+
+def test_manifest_round_trips_and_tracks_the_source(source_dir, tmp_path):
+    manifest = SplitManifest(tmp_path / 'manifest.csv').build(source_dir, CLASSES)
+    manifest.write()
+
+    reloaded = SplitManifest(tmp_path / 'manifest.csv')
+    assert reloaded.rows == manifest.rows
+    assert reloaded.is_current(source_dir, CLASSES)
+
+    (source_dir / 'Dog' / 'new.jpg').write_bytes(b'new dog')
+    assert not reloaded.is_current(source_dir, CLASSES)
+
+
+def test_rebuild_only_hashes_new_or_changed_files(source_dir, tmp_path, monkeypatch):
+    manifest = SplitManifest(tmp_path / 'manifest.csv').build(source_dir, CLASSES)
+    manifest.write()
+
+    (source_dir / 'Dog' / 'new.jpg').write_bytes(b'new dog')
+    (source_dir / 'Cat' / '0.jpg').write_bytes(b'edited cat')
+    hashed = []
+    original = split_manifest.file_sha1
+    monkeypatch.setattr(split_manifest, 'file_sha1', lambda path: hashed.append(path) or original(path))
+
+    SplitManifest(tmp_path / 'manifest.csv').build(source_dir, CLASSES)
+    assert sorted(os.path.relpath(path, source_dir) for path in hashed) == ['Cat/0.jpg', 'Dog/new.jpg']
+
+
+@pytest.mark.parametrize('mode', ['hardlink', 'symlink', 'copy'])
+def test_materialise_follows_the_manifest(source_dir, tmp_path, mode):
+    output_dir = tmp_path / 'split'
+    manifest = SplitManifest(tmp_path / 'manifest.csv').build(source_dir, CLASSES)
+    manifest.materialize(source_dir, output_dir, mode)
+    assert manifest.is_current(source_dir, CLASSES, output_dir, mode)
+    for row in manifest.rows:
+        target = SplitManifest.materialized_path(output_dir, row)
+        assert open(target, 'rb').read() == (source_dir / row['path']).read_bytes()
+
+    # A new file makes the tree stale; rebuilding brings both up to date
+    (source_dir / 'Cat' / 'new.jpg').write_bytes(b'new cat')
+    assert not manifest.is_current(source_dir, CLASSES, output_dir, mode)
+    manifest.build(source_dir, CLASSES)
+    manifest.materialize(source_dir, output_dir, mode)
+    assert manifest.is_current(source_dir, CLASSES, output_dir, mode)
+    materialised = sorted(
+        os.path.relpath(os.path.join(root, name), output_dir)
+        for root, _, files in os.walk(output_dir) for name in files
+    )
+    assert materialised == sorted(f"{row['split']}/{row['path']}" for row in manifest.rows)
+
+
+def test_deleted_materialised_file_makes_the_manifest_stale(source_dir, tmp_path):
+    output_dir = tmp_path / 'split'
+    manifest = SplitManifest(tmp_path / 'manifest.csv').build(source_dir, CLASSES)
+    manifest.materialize(source_dir, output_dir, 'hardlink')
+
+    os.remove(SplitManifest.materialized_path(output_dir, manifest.rows[0]))
+    assert not manifest.is_current(source_dir, CLASSES, output_dir, 'hardlink')
+    # Reading from the manifest directly does not need the tree
+    assert manifest.is_current(source_dir, CLASSES)
+
+
+def test_split_files_are_ordered_like_flow_from_directory(source_dir, tmp_path):
+    manifest = SplitManifest(tmp_path / 'manifest.csv').build(source_dir, CLASSES)
+    filepaths, labels, class_indices = manifest.split_files(str(source_dir), 'train')
+
+    assert class_indices == {'Cat': 0, 'Dog': 1}
+    assert list(labels) == [0] * 8 + [1] * 8
+    cats = [os.path.basename(p) for p in filepaths[:8]]
+    assert cats == sorted(cats)
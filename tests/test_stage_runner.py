@@ -0,0 +1,72 @@
+from src.Component.stage_runner import Stage, StageRunner, tree_fingerprint
+
+
+def build_runner(state_path, output_file, calls, source_params=None):
+    """source -> derived, where `source` writes `output_file` and `derived` reads it."""
+
+    def source(_):
+        calls.append('source')
+        # Every run writes a different size, so reruns always change the output fingerprint
+        output_file.write_text('x' * calls.count('source'))
+        return {'path': str(output_file)}
+
+    def derived(upstream):
+        calls.append('derived')
+        return {'length': len(open(upstream['source']['path']).read())}
+
+    runner = StageRunner(state_path)
+    runner.add(Stage('source', source, params=source_params or {'version': 1},
+                     outputs_fingerprint=lambda artifacts: tree_fingerprint(artifacts['path'])))
+    runner.add(Stage('derived', derived, deps=('source',)))
+    return runner
+
+
+def test_unchanged_stages_are_skipped(tmp_path):
+    state, output, calls = tmp_path / 'stages.json', tmp_path / 'data.txt', []
+
+    assert build_runner(state, output, calls).require('derived') == {'length': 1}
+    assert calls == ['source', 'derived']
+
+    # A fresh runner (a new process) reads the recorded state and runs nothing
+    assert build_runner(state, output, calls).require('derived') == {'length': 1}
+    assert calls == ['source', 'derived']
+
+
+def test_require_only_runs_the_needed_stages(tmp_path):
+    calls = []
+    build_runner(tmp_path / 'stages.json', tmp_path / 'data.txt', calls).require('source')
+    assert calls == ['source']
+
+
+def test_changed_params_rerun_the_stage_and_its_dependents(tmp_path):
+    state, output, calls = tmp_path / 'stages.json', tmp_path / 'data.txt', []
+    build_runner(state, output, calls).require('derived')
+
+    build_runner(state, output, calls, source_params={'version': 2}).require('derived')
+    assert calls == ['source', 'derived', 'source', 'derived']
+
+
+def test_changed_outputs_rerun_the_stage(tmp_path):
+    state, output, calls = tmp_path / 'stages.json', tmp_path / 'data.txt', []
+    build_runner(state, output, calls).require('derived')
+
+    output.unlink()
+    build_runner(state, output, calls).require('derived')
+    assert calls == ['source', 'derived', 'source', 'derived']
+
+
+def test_dependents_rerun_when_upstream_output_changes(tmp_path):
+    state, output, calls = tmp_path / 'stages.json', tmp_path / 'data.txt', []
+    runner = build_runner(state, output, calls)
+    runner.require('derived')
+
+    build_runner(state, output, calls).require('source', force=True)
+    assert build_runner(state, output, calls).require('derived') == {'length': 2}
+    assert calls == ['source', 'derived', 'source', 'derived']
+
+
+def test_force_reruns_an_up_to_date_stage(tmp_path):
+    state, output, calls = tmp_path / 'stages.json', tmp_path / 'data.txt', []
+    build_runner(state, output, calls).require('source')
+    build_runner(state, output, calls).require('source', force=True)
+    assert calls == ['source', 'source']
@@ -0,0 +1,144 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+tf = pytest.importorskip('tensorflow')
+
+from src.Component.dataset_shards import ShardStore, pack_split
+from src.Component.tf_data_pipeline import list_split_files, make_dataset
+from src.Component.training_checkpoint import TrainingCheckpoint, fit_resumable, resumable_input
+
+TARGET_SIZE = (8, 8)
+
+
+@pytest.fixture
+def split_dir(tmp_path):
+    """Ten solid-colour PNGs per class; the pixel value identifies the image."""
+    for c, cls in enumerate(('Cat', 'Dog')):
+        (tmp_path / cls).mkdir()
+        for i in range(10):
+            value = 10 * (10 * c + i)
+            Image.new('RGB', (16, 16), (value, value, value)).save(tmp_path / cls / f'{i}.png')
+    return tmp_path
+
+
+def batch_ids(dataset, batches):
+    """The image ids of the first `batches` batches, one tuple per batch."""
+    return [tuple(np.rint((images[:, 0, 0, 0] + 1) * 127.5 / 10).astype(int).tolist())
+            for images, _ in dataset.take(batches).as_numpy_iterator()]
+
+
+def test_seeded_tf_data_input_resumes_at_the_next_batch(split_dir):
+    filepaths, labels, class_indices = list_split_files(str(split_dir))
+
+    def build():
+        return make_dataset(filepaths, labels, class_indices, TARGET_SIZE, 3, training=True, cache=True,
+                            shuffle_buffer=4, seed=7)
+
+    full = batch_ids(build(), 20)
+    # A new process builds the dataset again and must see the same stream
+    assert batch_ids(build(), 20) == full
+    assert batch_ids(resumable_input(build(), 6, start_epoch=1, start_step=2), 12) == full[8:]
+
+
+def test_seeded_shard_input_resumes_at_the_next_batch(split_dir, tmp_path):
+    pack_split(str(split_dir), str(tmp_path / 'shards'), target_size=TARGET_SIZE, max_workers=1)
+    store = ShardStore(str(tmp_path / 'shards'))
+    dataset = store.dataset(np.arange(len(store)), 3, training=True, seed=3)
+
+    full = batch_ids(dataset, 20)
+    assert batch_ids(resumable_input(dataset, 6, start_epoch=2, start_step=1), 7) == full[13:]
+
+
+def test_unseeded_tf_data_input_is_returned_as_is(split_dir):
+    filepaths, labels, class_indices = list_split_files(str(split_dir))
+    dataset = make_dataset(filepaths, labels, class_indices, TARGET_SIZE, 3, training=True, cache=False)
+    assert not hasattr(dataset, 'from_batch')
+    assert resumable_input(dataset, 6, start_epoch=1, start_step=2) is dataset
+
+
+class FakeIterator:
+    """The parts of a Keras DirectoryIterator that resumable_batches uses; x is the sample index."""
+
+    def __init__(self, n, batch_size, shuffle=True):
+        self.n = n
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+
+    def __getitem__(self, i):
+        return self._get_batches_of_transformed_samples(np.arange(self.batch_size))
+
+    def _get_batches_of_transformed_samples(self, index_array):
+        index_array = np.asarray(index_array)
+        return index_array.astype(np.int64), np.zeros(len(index_array), dtype=np.float32)
+
+
+@pytest.mark.parametrize('shuffle', [True, False])
+def test_keras_iterator_input_resumes_at_the_next_batch(shuffle):
+    iterator = FakeIterator(n=12, batch_size=3, shuffle=shuffle)
+    full = [x.tolist() for x, _ in resumable_input(iterator, 4, seed=5).take(12).as_numpy_iterator()]
+    resumed = [x.tolist() for x, _ in resumable_input(iterator, 4, 1, 3, seed=5).take(5).as_numpy_iterator()]
+
+    assert resumed == full[7:]
+    for epoch in range(3):
+        assert sorted(sum(full[4 * epoch:4 * epoch + 4], [])) == list(range(12))
+
+
+class Interrupt(tf.keras.callbacks.Callback):
+    """Stops training abruptly after the given (epoch, batch), like a killed process."""
+
+    def __init__(self, epoch, batch):
+        super().__init__()
+        self.at = (epoch, batch)
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self.epoch = epoch
+
+    def on_train_batch_end(self, batch, logs=None):
+        if (self.epoch, batch) == self.at:
+            raise KeyboardInterrupt
+
+
+def build_model():
+    model = tf.keras.Sequential([tf.keras.Input((2,)), tf.keras.layers.Dense(1, activation='sigmoid')])
+    model.compile(optimizer='adam', loss='binary_crossentropy')
+    return model
+
+
+def test_interrupted_fit_resumes_mid_epoch(tmp_path):
+    rng = np.random.default_rng(0)
+    x, y = rng.normal(size=(32, 2)).astype(np.float32), rng.integers(0, 2, size=(32, 1)).astype(np.float32)
+    calls = []
+
+    def make_input(epoch, step):
+        calls.append((epoch, step))
+        return tf.data.Dataset.from_tensor_slices((x, y)).batch(8).repeat()
+
+    def checkpoint():
+        return TrainingCheckpoint(tmp_path / 'ckpt', save_every_steps=1, monitor='loss', run_info={'steps': 4})
+
+    with pytest.raises(KeyboardInterrupt):
+        fit_resumable(build_model(), make_input, 3, 4, checkpoint(), callbacks=[Interrupt(1, 2)], verbose=0)
+    assert calls == [(0, 0)]
+
+    history = fit_resumable(build_model(), make_input, 3, 4, checkpoint(), resume=True, verbose=0)
+    assert calls == [(0, 0), (1, 3), (2, 0)]
+    assert history.epoch == [1, 2]
+
+    # A finished run has nothing left to train
+    fit_resumable(build_model(), make_input, 3, 4, checkpoint(), resume=True, verbose=0)
+    assert calls == [(0, 0), (1, 3), (2, 0)]
+
+
+def test_resume_rejects_a_checkpoint_from_other_run_settings(tmp_path):
+    x, y = np.zeros((8, 2), np.float32), np.zeros((8, 1), np.float32)
+
+    def make_input(epoch, step):
+        return tf.data.Dataset.from_tensor_slices((x, y)).batch(4).repeat()
+
+    fit_resumable(build_model(), make_input, 1, 2,
+                  TrainingCheckpoint(tmp_path / 'ckpt', monitor='loss', run_info={'steps': 2}), verbose=0)
+    with pytest.raises(ValueError, match="is from a run with"):
+        fit_resumable(build_model(), make_input, 1, 2,
+                      TrainingCheckpoint(tmp_path / 'ckpt', monitor='loss', run_info={'steps': 4}),
+                      resume=True, verbose=0)
@@ -0,0 +1,89 @@
+import json
+import time
+
+import numpy as np
+import pytest
+
+tf = pytest.importorskip('tensorflow')
+
+from src.Component.training_profiler import INPUT_BOUND_THRESHOLD, TrainingProfiler
+
+BATCH_SIZE = 4
+
+
+def build_model():
+    model = tf.keras.Sequential([tf.keras.Input((2,)), tf.keras.layers.Dense(1, activation='sigmoid')])
+    model.compile(optimizer='sgd', loss='binary_crossentropy')
+    return model
+
+
+def slow_dataset(delay):
+    """An endless input that takes `delay` seconds to produce every batch."""
+    def batches():
+        while True:
+            time.sleep(delay)
+            yield np.ones((BATCH_SIZE, 2), np.float32), np.ones((BATCH_SIZE, 1), np.float32)
+
+    signature = (tf.TensorSpec((None, 2), tf.float32), tf.TensorSpec((None, 1), tf.float32))
+    return tf.data.Dataset.from_generator(batches, output_signature=signature)
+
+
+def read_log(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_slow_input_is_reported_as_input_bound(tmp_path):
+    profiler = TrainingProfiler(tmp_path / 'profile.jsonl')
+    build_model().fit(profiler.wrap(slow_dataset(0.05)), epochs=2, steps_per_epoch=5, callbacks=[profiler],
+                      verbose=0)
+
+    records = read_log(tmp_path / 'profile.jsonl')
+    assert [r['event'] for r in records] == ['step'] * 5 + ['epoch'] + ['step'] * 5 + ['epoch', 'summary']
+    steps = [r for r in records if r['event'] == 'step']
+    assert [r['global_step'] for r in steps] == list(range(10))
+    # Every step sees exactly the batch it trained on
+    assert all(r['images'] == BATCH_SIZE for r in steps)
+
+    summary = records[-1]
+    assert summary == profiler.summary
+    assert summary['steps'] == 9 and summary['warmup_steps_excluded'] == 1
+    assert summary['verdict'] == 'input-bound'
+    assert summary['input_fraction'] > 0.5
+
+
+def test_keras_iterators_are_wrapped_too(tmp_path):
+    class Flow(tf.keras.utils.PyDataset):
+        def __len__(self):
+            return 3
+
+        def __getitem__(self, i):
+            return np.full((BATCH_SIZE, 2), i, np.float32), np.ones((BATCH_SIZE, 1), np.float32)
+
+    profiler = TrainingProfiler(tmp_path / 'profile.jsonl')
+    build_model().fit(profiler.wrap(Flow()), epochs=2, steps_per_epoch=3, callbacks=[profiler], verbose=0)
+    assert profiler.summary['steps'] == 5
+    assert [r['event'] for r in read_log(tmp_path / 'profile.jsonl')].count('step') == 6
+
+
+def test_repeated_fit_calls_extend_the_same_log(tmp_path):
+    profiler = TrainingProfiler(tmp_path / 'profile.jsonl', warmup_steps=0)
+    model = build_model()
+    data = profiler.wrap(slow_dataset(0))
+    model.fit(data, epochs=1, steps_per_epoch=2, callbacks=[profiler], verbose=0)
+    model.fit(data, initial_epoch=1, epochs=2, steps_per_epoch=3, callbacks=[profiler], verbose=0)
+
+    events = [r['event'] for r in read_log(tmp_path / 'profile.jsonl')]
+    assert events.count('step') == 5 and events.count('summary') == 2
+    assert profiler.summary['steps'] == 5
+
+
+def test_verdict_threshold():
+    def steps(wait_ms, compute_ms):
+        return [{'data_wait_ms': wait_ms, 'compute_ms': compute_ms, 'images': BATCH_SIZE}] * 4
+
+    below = TrainingProfiler._aggregate(steps(10, 90))
+    above = TrainingProfiler._aggregate(steps(30, 70))
+    assert below['input_fraction'] == pytest.approx(0.1) and below['verdict'] == 'compute-bound'
+    assert above['input_fraction'] > INPUT_BOUND_THRESHOLD and above['verdict'] == 'input-bound'
+    assert above['images_per_second'] == pytest.approx(4 * BATCH_SIZE / 0.4)
+    assert TrainingProfiler._aggregate([])['median_step_ms'] is None